@@ -3,22 +3,23 @@ from sqlalchemy.orm import Session
 from app.services.user_service import UserService
 from app.services.auth_service import create_access_token
 from app.core.database import get_db
+from app.services.cloud_client import cloud_client
 from datetime import timedelta
-import requests
+import logging
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-CLOUD_LOGIN_URL = "http://cloud:10000/auth/login"  # Reemplazar con la URL real de Cloud para levantar el entorno cloud
+router = APIRouter()
 
 @router.post("/login")
-def login(
+async def login(
     username: str = Form(...),
     password: str = Form(...),
     cloud: bool = Form(False),
     db: Session = Depends(get_db)
 ):
     user_service = UserService(db)
-    user = user_service.authenticate_user(username, password)
+    user = await user_service.authenticate_user(username, password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,14 +31,10 @@ def login(
     result = {"access_token": access_token, "token_type": "bearer"}
 
     if cloud:
-        # llamada a Cloud
-        cloud_response = requests.post(
-            CLOUD_LOGIN_URL,
-            data={"username": username, "password": password, "grant_type": "password"},
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
-        )
-        if cloud_response.ok:
-            result["cloud_access_token"] = cloud_response.json().get("access_token")
-        else:
+        # llamada a Cloud (CLOUD_URL), con el pool del cloud_client en vez de un requests bloqueante
+        try:
+            result["cloud_access_token"] = await cloud_client.login(username, password)
+        except Exception as e:
+            logger.warning("Error al autenticar en Cloud: %s", e)
             result["cloud_error"] = "Error al autenticar en Cloud"
     return result
\ No newline at end of file
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Query
+from app.core.metrics import metrics
+from app.core.tracing import tracer
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_model=list[dict])
+def get_metrics():
+    return metrics.snapshot()
+
+
+@router.get("/traces/recent", response_model=list[dict])
+def get_recent_traces(
+    limit: int = Query(10, ge=1, le=100),
+    min_duration_ms: float = Query(0, ge=0),
+    spans: bool = Query(True, description="Incluir la lista de spans además del desglose"),
+):
+    """Los traces más lentos de los últimos TRACE_RECENT_SIZE, con el tiempo por span"""
+    return tracer.slowest(limit, min_duration_ms, with_spans=spans)
@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.pagination import PageParams, page_params, page_response
 from app.services.ong_service import OngService
 from app.schemas.ong_schema import OngResponse, OngCreate
 
 router = APIRouter()
 
 @router.get("/", response_model=list[OngResponse])
-def get_ongs(db: Session = Depends(get_db)):
+def get_ongs(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
     service = OngService(db)
-    return service.get_ongs()
+    return page_response(response, service.get_ongs(page.limit, page.after))
 
 @router.post("/", response_model=OngResponse)
 def create_ong(ong_data: OngCreate, db: Session = Depends(get_db)):
@@ -1,30 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.pagination import PageParams, page_params, page_response
 from app.schemas.project_schema import ProjectCreate, ProjectResponse
 from app.services.project_service import ProjectService
+from app.services.idempotency_service import IDEMPOTENCY_KEY_HEADER, IDEMPOTENT_REPLAYED_HEADER
 from app.schemas.user_schema import UserResponse
 from app.services.auth_service import get_current_user
 
 router = APIRouter()
 
 
+# Con Idempotency-Key, un reintento del mismo request devuelve la respuesta original
+# sin crear otro proyecto ni otro caso en Bonita
 @router.post("/create", response_model=ProjectResponse)
-def create_project(project: ProjectCreate, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+def create_project(
+    project: ProjectCreate,
+    response: Response,
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_KEY_HEADER, max_length=255),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
     service = ProjectService(db)
-    return service.create_project(project)
+    if idempotency_key is None:
+        return service.create_project(project)
+    entry = service.idempotency_service.begin(current_user.id, "POST /projects/create", idempotency_key, project.model_dump(mode="json"))
+    if entry.status == "completed":
+        response.status_code = entry.response_status
+        response.headers[IDEMPOTENT_REPLAYED_HEADER] = "true"
+        return entry.response_body
+    return service.create_project(project, entry)
 
 
 @router.get("/my-projects/", response_model=list[ProjectResponse])
-def get_projects(db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+def get_projects(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     service = ProjectService(db)
-    return service.get_projects(user=current_user)
+    return page_response(response, service.get_projects(current_user, page.limit, page.after))
 
 
 @router.get("/projects_status/{status}", response_model=list[ProjectResponse])
-def get_projects_with_status(status: str, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+def get_projects_with_status(status: str, response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     service = ProjectService(db)
-    return service.get_projects_with_status(status)
+    return page_response(response, service.get_projects_with_status(status, page.limit, page.after))
 
 
 @router.get("/check_name/{name}")
@@ -1,46 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
 
-from app.core.database import get_db
-from app.schemas.stats_schema import StatsResponse
-from app.services.stats_service import StatsService
+from app.core.scheduler import computed_response
+from app.services.stats_service import (
+    ONGS_AND_TASKS,
+    PERCENT_NO_COLLABORATION_NEEDED,
+    SUCCESSFUL_ON_TIME_AVG,
+    stats_kpis,
+)
 from app.schemas.user_schema import UserResponse
 from app.services.auth_service import get_current_user
 
 router = APIRouter()
-    
+
+# Los indicadores salen de memoria (ver stats_service.stats_kpis); el header
+# X-Computed-At indica cuándo se calcularon.
+
 # Indicador de Promedio de proyectos exitosos y a tiempo
 @router.get("/successful-on-time-avg", response_model=float)
-def get_successful_on_time_avg(
-    db: Session = Depends(get_db),
+async def get_successful_on_time_avg(
+    response: Response,
+    fresh: bool = False,
     current_user: UserResponse = Depends(get_current_user)
 ):
     try:
-        service = StatsService(db)
-        return service.get_successful_on_time_avg()
+        return computed_response(response, await stats_kpis.get(SUCCESSFUL_ON_TIME_AVG, fresh=fresh))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
 
 # Indicador de Porcentaje de proyectos que no necesitaron colaboración de ONG
 @router.get("/percent-no-collaboration-needed", response_model=dict)
-def get_percent_no_collaboration_needed(
-    db: Session = Depends(get_db),
+async def get_percent_no_collaboration_needed(
+    response: Response,
+    fresh: bool = False,
     current_user: UserResponse = Depends(get_current_user)
 ):
     try:
-        service = StatsService(db)
-        return service.get_percent_no_collaboration_needed()
+        return computed_response(response, await stats_kpis.get(PERCENT_NO_COLLABORATION_NEEDED, fresh=fresh))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Indicador de ONGs y tareas resueltas por la misma ONG responsable
 @router.get("/ongs-and-tasks", response_model=list)
-def get_ongs_and_tasks(
-    db: Session = Depends(get_db),
+async def get_ongs_and_tasks(
+    response: Response,
+    fresh: bool = False,
     current_user: UserResponse = Depends(get_current_user)
 ):
     try:
-        service = StatsService(db)
-        return service.get_ongs_and_tasks_resolved()
+        return computed_response(response, await stats_kpis.get(ONGS_AND_TASKS, fresh=fresh))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
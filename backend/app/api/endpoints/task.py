@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from app.bonita_integration.bonita_api import bonita
 from app.core.database import get_db
 from app.schemas.task_schema import CommitRequest
 from app.schemas.user_schema import UserResponse
@@ -14,7 +15,9 @@ async def commit_task_to_ong(commit_data: CommitRequest, db: Session = Depends(g
     service = TaskService(db)
     print(commit_data)
     try:
-        return service.commit_task_to_ong(commit_data.task_id, commit_data.ong_id, commit_data.project_id)
+        # Las tareas de Bonita se asignan al usuario que hace el request
+        with bonita.acting_as(current_user.username):
+            return await service.commit_task_to_ong(commit_data.task_id, commit_data.ong_id, commit_data.project_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -25,7 +28,8 @@ async def commit_task_to_ong(commit_data: CommitRequest, db: Session = Depends(g
 async def select_ong_for_task(select_data: CommitRequest, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     service = TaskService(db)
     try:
-        return service.select_ong_for_task(select_data.task_id, select_data.ong_id, select_data.project_id)
+        with bonita.acting_as(current_user.username):
+            return await service.select_ong_for_task(select_data.task_id, select_data.ong_id, select_data.project_id)
     except HTTPException:
         raise
     except Exception as e:
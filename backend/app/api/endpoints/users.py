@@ -1,10 +1,11 @@
 from app.schemas.ong_schema import OngResponse
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import List
 from app.schemas.user_schema import UserCreate, UserResponse
 from sqlalchemy.orm import Session
 from app.services.auth_service import get_current_user, get_current_manager_user
 from app.core.database import get_db
+from app.core.pagination import PageParams, page_params, page_response
 from app.services.user_service import UserService
 
 router = APIRouter()
@@ -12,9 +13,9 @@ user_service = UserService(db=Depends(get_db))
 
 # Get all users
 @router.get("/", response_model=list[UserResponse])
-def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_users(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
     user_service = UserService(db)
-    return user_service.get_all_users(skip=skip, limit=limit)
+    return page_response(response, user_service.get_users_page(page.limit, page.after))
 
 
 # Get current user
@@ -29,8 +30,8 @@ def get_me_if_manager(current_user: UserResponse = Depends(get_current_manager_u
 
 # Create a new user
 @router.post("/create", response_model=UserResponse, status_code=201)
-def create_user(user_in: UserCreate, db: Session = Depends(get_db)):
-    return UserService(db).create_user(user_in)
+async def create_user(user_in: UserCreate, db: Session = Depends(get_db)):
+    return await UserService(db).create_user(user_in)
 
 # Delete a user
 @router.delete("/{user_id}", status_code=204)
@@ -1,3 +1,4 @@
+import os
 from fastapi import APIRouter
 from app.bonita_integration import bonita_api
 from app.api.endpoints import projects
@@ -7,6 +8,7 @@ from app.api.endpoints import auth
 from app.api.endpoints import task
 from app.api.endpoints import stats
 from app.api.endpoints import observations
+from app.api.endpoints import debug
 
 api_router = APIRouter()
 api_router.include_router(bonita_api.router, prefix="/bonita", tags=["bonita"])
@@ -17,6 +19,10 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
 api_router.include_router(observations.router, prefix="/observations", tags=["observations"])
+# /debug expone métricas, SQL y tiempos de cada request: solo se monta con
+# DEBUG_ENDPOINTS=true (desarrollo y benchmarks), nunca por defecto
+if os.getenv("DEBUG_ENDPOINTS", "false").lower() in ("1", "true", "yes"):
+    api_router.include_router(debug.router, prefix="/debug", tags=["debug"])
 
 
 
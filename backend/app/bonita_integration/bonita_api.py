@@ -1,15 +1,24 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from app.bonita_integration.bonita_client import BonitaClient
 from app.schemas.bonita_schema import BonitaUserModel
+from app.schemas.user_schema import UserResponse
+from app.services.auth_service import get_current_manager_user
 
 router = APIRouter()
 bonita = BonitaClient()
 
 
 @router.post("/login")
-def login(user_bonita: BonitaUserModel):
+async def login(user_bonita: BonitaUserModel):
     try:
-        session_info = bonita.login(user_bonita.username, user_bonita.password)
+        session_info = await bonita.login(user_bonita.username, user_bonita.password)
         return {"message": "Logeo exitoso", "session": session_info}
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"No se pudo logear: {str(e)}")
+
+
+@router.post("/process-cache/invalidate")
+def invalidate_process_cache(name: str | None = None, current_user: UserResponse = Depends(get_current_manager_user)):
+    # Pensado para llamarse después de desplegar un .bos nuevo; solo managers
+    removed = bonita.invalidate_process_cache(name=name)
+    return {"invalidated": removed}
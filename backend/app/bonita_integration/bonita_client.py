@@ -1,132 +1,336 @@
+import asyncio
 import os
-import requests
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import AsyncIterator
+import httpx
+from app.bonita_integration.readiness import wait_until
+from app.core.cache import TTLCache
+from app.core.exceptions import BonitaAPIError
+from app.core.http_client import build_async_client, request_with_retry
+from app.core.metrics import metrics
+from app.core.tracing import trace_methods
 
+logger = logging.getLogger(__name__)
 
+# Usuario de Bonita del request en curso (ver BonitaClient.acting_as); sin valor se usa la cuenta de servicio
+_acting_user: ContextVar[str | None] = ContextVar("bonita_acting_user", default=None)
+
+
+@dataclass
+class BonitaSession:
+    username: str
+    token: str
+    cookies: dict = field(default_factory=dict)
+    # Id del usuario en Bonita, leído una sola vez al loguear (ver assign_task)
+    user_id: str | None = None
+    logged_in_at: float = field(default_factory=time.monotonic)
+
+    def headers(self) -> dict:
+        cookie = "; ".join(f"{name}={value}" for name, value in self.cookies.items())
+        return {"X-Bonita-API-Token": self.token, "Cookie": cookie}
+
+
+# Un span por método público (y por login); get_session corre en cada request y no suma
+@trace_methods("bonita", include=("_login",), exclude=("get_session", "aclose"))
 class BonitaClient:
     def __init__(self):
         self.base_url = os.getenv("BONITA_URL")
-        self.session = requests.Session()
-        self.logged_in = False
+        self.max_retries = int(os.getenv("BONITA_MAX_RETRIES", "3"))
+        self.page_size = int(os.getenv("BONITA_PAGE_SIZE", "100"))
+        # El pool de conexiones es compartido, pero cada usuario tiene su sesión: el jar
+        # del cliente no guarda cookies y cada request lleva las de su BonitaSession
+        self.client = build_async_client(
+            max_connections=int(os.getenv("BONITA_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("BONITA_MAX_KEEPALIVE", "10")),
+            timeout=float(os.getenv("BONITA_TIMEOUT", "10")),
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+        self.user_password = os.getenv("BONITA_USER_PASSWORD", "bpm")
+        # Cuenta para el trabajo sin usuario (worker del outbox, KPIs)
+        self.service_username = os.getenv("BONITA_SERVICE_USERNAME", "walter.bates")
+        self.service_password = os.getenv("BONITA_SERVICE_PASSWORD", self.user_password)
+        self.max_sessions = int(os.getenv("BONITA_MAX_SESSIONS", "256"))
+        self.sessions: OrderedDict[str, BonitaSession] = OrderedDict()
+        self._login_locks: dict[str, asyncio.Lock] = {}
+        self.ready_timeout = float(os.getenv("BONITA_READY_TIMEOUT", "10"))
+        self.ready_initial_delay = float(os.getenv("BONITA_READY_INITIAL_DELAY", "0.005"))
+        self.ready_max_delay = float(os.getenv("BONITA_READY_MAX_DELAY", "0.5"))
+        # Las definiciones de proceso casi no cambian: se cachea nombre -> id
+        self.process_cache = TTLCache(maxsize=64, ttl=float(os.getenv("BONITA_PROCESS_CACHE_TTL", "300")))
+        self._deployed_process_ids = {}
+
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        return await request_with_retry(
+            self.client, method, f"{self.base_url}{path}", max_retries=self.max_retries, **kwargs
+        )
+
+    async def _request(self, method: str, path: str, headers: dict = None, **kwargs) -> httpx.Response:
+        """
+        Request con la sesión del usuario actual. Un 401/403 se toma como
+        sesión vencida: se vuelve a loguear y se reintenta una vez.
+        """
+        username = self._current_username()
+        session = await self.get_session(username)
+        response = await self._send(method, path, headers={**(headers or {}), **session.headers()}, **kwargs)
+        if response.status_code not in (401, 403):
+            return response
+        logger.info("Bonita respondió %s para %s: se renueva la sesión", response.status_code, username)
+        self.drop_session(username, session)
+        session = await self.get_session(username)
+        return await self._send(method, path, headers={**(headers or {}), **session.headers()}, **kwargs)
+
+    def _current_username(self) -> str:
+        return _acting_user.get() or self.service_username
+
+    @contextmanager
+    def acting_as(self, username: str):
+        """Las llamadas a Bonita dentro del bloque usan la sesión de `username`"""
+        token = _acting_user.set(username)
+        try:
+            yield
+        finally:
+            _acting_user.reset(token)
 
-    def login(self, username: str, password: str):
-        login_url = f"{self.base_url}/loginservice"
+    async def get_session(self, username: str) -> BonitaSession:
+        """Sesión cacheada del usuario; el login se hace recién en el primer uso"""
+        session = self.sessions.get(username)
+        if session is not None:
+            self.sessions.move_to_end(username)
+            return session
+        # Varios requests del mismo usuario sin sesión hacen un solo login
+        async with self._login_locks.setdefault(username, asyncio.Lock()):
+            session = self.sessions.get(username)
+            if session is None:
+                password = self.service_password if username == self.service_username else self.user_password
+                session = await self._login(username, password)
+            return session
+
+    def drop_session(self, username: str, session: BonitaSession = None) -> None:
+        """Olvida la sesión; con `session`, solo si sigue siendo la vigente (otro request pudo renovarla)"""
+        if session is None or self.sessions.get(username) is session:
+            self.sessions.pop(username, None)
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        if response.is_error:
+            raise BonitaAPIError(response.status_code, str(response.url), response.text, dict(response.headers))
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def login(self, username: str, password: str):
+        session = await self._login(username, password)
+        return {"X-Bonita-API-Token": session.token}
+
+    async def _login(self, username: str, password: str) -> BonitaSession:
         payload = {
             "username": username,
             "password": password,
             "redirect": "false"
         }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        response = self.session.post(login_url, data=payload, headers=headers)
+        response = await self._send("POST", "/loginservice", data=payload, headers=headers)
         if response.status_code not in (200, 204):
             raise Exception(f"Error {response.status_code}: {response.text}")
-        token = response.cookies.get("X-Bonita-API-Token")
-        print(f"Token de Bonita recibido: {token!r}")
-        if token:
-            self.session.headers.update({"X-Bonita-API-Token": token})
-            self.logged_in = True
-            return {"X-Bonita-API-Token": token}
-        raise Exception("No se obtuvo token de sesión de Bonita.")
-    
-    def get_all_processes(self):
-        url = f"{self.base_url}/API/bpm/process?p=0&c=100"
-        response = self.session.get(url)
-        response.raise_for_status()
-        return response.json()
+        cookies = dict(response.cookies)
+        token = cookies.get("X-Bonita-API-Token")
+        if not token:
+            raise Exception("No se obtuvo token de sesión de Bonita.")
+        metrics.counter("bonita_login").inc()
+        session = BonitaSession(username=username, token=token, cookies=cookies)
+        session.user_id = await self._fetch_user_id(session)
+        self.sessions[username] = session
+        self.sessions.move_to_end(username)
+        while len(self.sessions) > self.max_sessions:
+            evicted, _ = self.sessions.popitem(last=False)
+            self._login_locks.pop(evicted, None)
+        logger.info("Sesión de Bonita iniciada para %s", username)
+        return session
+
+    @staticmethod
+    def _list_params(page: int, page_size: int, filters: dict = None, order: str = None) -> list[tuple]:
+        params = [("p", page), ("c", page_size)]
+        params += [("f", f"{key}={value}") for key, value in (filters or {}).items()]
+        if order:
+            params.append(("o", order))
+        return params
+
+    async def iter_pages(self, path: str, filters: dict = None, order: str = None, page_size: int = None) -> AsyncIterator[list]:
+        """
+        Recorre un endpoint de listado de Bonita página por página (p, c),
+        enviando los filtros (f) y el orden (o) al servidor.
+        """
+        page_size = page_size or self.page_size
+        page = 0
+        while True:
+            params = self._list_params(page, page_size, filters, order)
+            response = await self._request("GET", path, params=params)
+            self._raise_for_status(response)
+            items = response.json()
+            if items:
+                yield items
+            if len(items) < page_size:
+                return
+            page += 1
 
-    def initiate_process(self, id):
-        url = f"{self.base_url}/API/bpm/process/{id}/instantiation"
-        response = self.session.post(url)
-        response.raise_for_status()
+    async def count(self, path: str, filters: dict = None) -> int:
+        """
+        Total de un listado sin traer las filas: pide una página de un ítem y
+        lee el total del header Content-Range ("0-1/42").
+        """
+        response = await self._request("GET", path, params=self._list_params(0, 1, filters))
+        self._raise_for_status(response)
+        _, _, total = response.headers.get("Content-Range", "").rpartition("/")
+        if total.isdigit():
+            return int(total)
+        # Sin el header (algún proxy lo saca) se cuentan las páginas
+        logger.warning("%s no devolvió Content-Range, se cuentan las páginas", path)
+        return sum([len(page) async for page in self.iter_pages(path, filters=filters)])
+
+    async def iter_items(self, path: str, **kwargs) -> AsyncIterator[dict]:
+        async for page in self.iter_pages(path, **kwargs):
+            for item in page:
+                yield item
+
+    async def _collect(self, path: str, **kwargs) -> list:
+        return [item async for item in self.iter_items(path, **kwargs)]
+
+    async def get_all_processes(self):
+        return await self._collect("/API/bpm/process")
+
+    async def initiate_process(self, id):
+        response = await self._request("POST", f"/API/bpm/process/{id}/instantiation")
+        if response.is_error:
+            # El proceso pudo haber sido re-desplegado o deshabilitado: el id cacheado ya no sirve
+            self.invalidate_process_cache(process_id=id)
+        self._raise_for_status(response)
         return response.json()
 
-    def get_process_id_by_name(self, name):
-        url = f"{self.base_url}/API/bpm/process?p=0&c=100&f=name={name}"
-        response = self.session.get(url)
-        response.raise_for_status()
+    async def get_process_id_by_name(self, name):
+        process_id = self.process_cache.get(name)
+        if process_id is not None:
+            metrics.counter("bonita_process_cache", result="hit").inc()
+            return process_id
+        metrics.counter("bonita_process_cache", result="miss").inc()
+        params = {"p": 0, "c": 100, "f": f"name={name}", "o": "deploymentDate DESC"}
+        response = await self._request("GET", "/API/bpm/process", params=params)
+        self._raise_for_status(response)
         processes = response.json()
-        if processes:
-            return processes[0].get("id")
-        return None
-
-    def start_human_tasks(self, case_id):
-        url = f"{self.base_url}/API/bpm/humanTask?f=caseId={case_id}"
-        response = self.session.get(url)
-        response.raise_for_status()
+        if not processes:
+            return None
+        process_id = processes[0].get("id")
+        previous_id = self._deployed_process_ids.get(name)
+        if previous_id is not None and previous_id != process_id:
+            logger.info("Nuevo despliegue detectado para '%s': %s -> %s", name, previous_id, process_id)
+        self._deployed_process_ids[name] = process_id
+        self.process_cache.set(name, process_id)
+        return process_id
+
+    def invalidate_process_cache(self, name: str = None, process_id=None) -> int:
+        """Invalida por nombre, por id, o todo el cache si no se pasa nada"""
+        if name is None and process_id is None:
+            count = len(self.process_cache)
+            self.process_cache.clear()
+            return count
+        return self.process_cache.invalidate_where(
+            lambda key, value: key == name or str(value) == str(process_id)
+        )
+
+    async def start_human_tasks(self, case_id):
+        response = await self._request("GET", "/API/bpm/humanTask", params={"f": f"caseId={case_id}"})
+        self._raise_for_status(response)
         return response.json()
 
-    def _get_current_user_id(self):
-        url = f"{self.base_url}/API/system/session/unusedId"
-        response = self.session.get(url)
-        session_info = response.json()
-        return session_info.get("user_id")
-
-    def assign_task(self, task_id):
-        url = f"{self.base_url}/API/bpm/userTask/{task_id}"
-        data = {"assigned_id": self._get_current_user_id()}
-        response = self.session.put(url, json=data)
-        response.raise_for_status()
+    async def wait_for_human_tasks(self, case_id, timeout: float = None):
+        """Espera hasta que el caso tenga al menos una tarea humana disponible"""
+        return await wait_until(
+            lambda: self.start_human_tasks(case_id),
+            name="human_tasks",
+            timeout=timeout or self.ready_timeout,
+            initial_delay=self.ready_initial_delay,
+            max_delay=self.ready_max_delay,
+            timeout_message=f"No hay tareas humanas disponibles para el caso {case_id}",
+        )
+
+    async def _fetch_user_id(self, session: BonitaSession) -> str | None:
+        response = await self._send("GET", "/API/system/session/unusedId", headers=session.headers())
+        self._raise_for_status(response)
+        return response.json().get("user_id")
+
+    async def _get_current_user_id(self):
+        """Sale de la sesión: el GET a session/unusedId se hace una vez por login, no por tarea"""
+        session = await self.get_session(self._current_username())
+        return session.user_id
+
+    async def assign_task(self, task_id):
+        data = {"assigned_id": await self._get_current_user_id()}
+        response = await self._request("PUT", f"/API/bpm/userTask/{task_id}", json=data)
+        self._raise_for_status(response)
         return {"success": True, "task_id": task_id}
 
-    def send_form_data(self, task_id, form_data):
-        url = f"{self.base_url}/API/bpm/userTask/{task_id}/execution"
-        response = self.session.post(url, json=form_data)
-        response.raise_for_status()
+    async def send_form_data(self, task_id, form_data):
+        response = await self._request("POST", f"/API/bpm/userTask/{task_id}/execution", json=form_data)
+        self._raise_for_status(response)
         return {"ok": "ok"}
 
-    def set_variable(self, case_id: int, variable_name: str, type: str, value: str):
-        url = f"{self.base_url}/API/bpm/caseVariable/{case_id}/{variable_name}"
+    async def set_variable(self, case_id: int, variable_name: str, type: str, value: str):
         payload = { "type": type, "value": value}
-        response = self.session.put(url, json=payload)
-        response.raise_for_status()
+        response = await self._request("PUT", f"/API/bpm/caseVariable/{case_id}/{variable_name}", json=payload)
+        self._raise_for_status(response)
         return "Variable set successfully"
 
     # Solo para variables de casos abiertos
-    def get_variable(self, case_id, variable_name):
-        url = f"{self.base_url}/API/bpm/caseVariable/{case_id}/{variable_name}"
-        response = self.session.get(url)
+    async def get_variable(self, case_id, variable_name):
+        response = await self._request("GET", f"/API/bpm/caseVariable/{case_id}/{variable_name}")
         if response.status_code == 404:
             return {"error": "Variable not found"}
-        response.raise_for_status()
+        self._raise_for_status(response)
         return response.json()
 
-    def get_business_variable(self, case_id, variable_name):
-        url = f"{self.base_url}/API/bdm/businessData/{variable_name}?c=caseId={case_id}"
-        response = self.session.get(url)
+    async def get_business_variable(self, case_id, variable_name):
+        response = await self._request("GET", f"/API/bdm/businessData/{variable_name}?c=caseId={case_id}")
         if response.status_code == 404:
             return {"error": "Variable not found"}
-        response.raise_for_status()
+        self._raise_for_status(response)
         return response.json()
 
     # Metodos para elaborar los indicadores para el dashboard de usuarios gerenciales
-    # Este no logré saber si anda o no
-    def ensure_logged(self):
-        """Intenta re-loguear si la sesión expiró"""
-        if not self.logged_in:
-            self.login()
-    
+    async def ensure_logged(self, username: str = None):
+        """Abre la sesión del usuario (o de la cuenta de servicio) si todavía no existe"""
+        await self.get_session(username or self._current_username())
+
 
     # anda, pero obtiene solo los abiertos
-    def get_cases_by_process_id(self, process_id):
-        url = f"{self.base_url}/API/bpm/case?p=0&c=1000&f=processId={process_id}"
-        response = self.session.get(url)
-        # debug
-        if not response.ok:
-            print("ERROR Bonita:", response.status_code, response.text)
-    
-        response.raise_for_status()
-        return response.json()
+    async def get_cases_by_process_id(self, process_id):
+        return await self._collect("/API/bpm/case", filters={"processId": process_id})
 
-    def get_archived_cases(self, process_id):
-        # 1) obtener todos los archivedCase (cerrados)
-        url = f"{self.base_url}/API/bpm/archivedCase?p=0&c=1000"
-        response = self.session.get(url)
-        response.raise_for_status()
-        return response.json()
+    @staticmethod
+    def _archived_case_filters(process_id, state: str = None) -> dict:
+        filters = {"processDefinitionId": process_id}
+        if state:
+            filters["state"] = state
+        return filters
+
+    def iter_archived_cases(self, process_id, state: str = "completed", order: str = None, page_size: int = None) -> AsyncIterator[list]:
+        """Páginas de archivedCase (cerrados) del proceso, filtradas en el servidor"""
+        filters = self._archived_case_filters(process_id, state)
+        return self.iter_pages("/API/bpm/archivedCase", filters=filters, order=order, page_size=page_size)
+
+    async def count_archived_cases(self, process_id, state: str = "completed") -> int:
+        return await self.count("/API/bpm/archivedCase", filters=self._archived_case_filters(process_id, state))
+
+    async def get_archived_cases(self, process_id, state: str = "completed"):
+        return [case async for page in self.iter_archived_cases(process_id, state) for case in page]
     # Sirve para obtener variables de casos archivados
-    def get_variable_from_archived_case(self, archived_case_id, variable_name):
-        url = f"{self.base_url}/API/bpm/archivedCaseVariable/{archived_case_id}/{variable_name}"
-        response = self.session.get(url)
+    async def get_variable_from_archived_case(self, archived_case_id, variable_name):
+        response = await self._request("GET", f"/API/bpm/archivedCaseVariable/{archived_case_id}/{variable_name}")
         if response.status_code == 404:
             return {"error": "Variable not found"}
-        response.raise_for_status()
-        return response.json()
\ No newline at end of file
+        self._raise_for_status(response)
+        return response.json()
@@ -0,0 +1,41 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, TypeVar
+from app.core.exceptions import ReadinessTimeout
+from app.core.metrics import metrics
+from app.core.tracing import tracer
+
+T = TypeVar("T")
+
+
+async def wait_until(
+    probe: Callable[[], Awaitable[T]],
+    name: str,
+    timeout: float = 10.0,
+    initial_delay: float = 0.005,
+    max_delay: float = 0.5,
+    timeout_message: str = None,
+) -> T:
+    """
+    Ejecuta `probe` hasta que devuelva un valor truthy, con backoff exponencial
+    entre intentos y un deadline. Reporta cantidad de polls y tiempo esperado.
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    delay = initial_delay
+    polls = 0
+    while True:
+        polls += 1
+        result = await probe()
+        now = time.perf_counter()
+        if result or now >= deadline:
+            metrics.histogram("bonita_readiness_polls", probe=name).observe(polls)
+            metrics.histogram("bonita_readiness_wait_seconds", probe=name).observe(now - start)
+        if result:
+            return result
+        if now >= deadline:
+            metrics.counter("bonita_readiness_timeouts", probe=name).inc()
+            raise ReadinessTimeout(timeout_message or f"Timeout esperando '{name}' tras {polls} intentos")
+        with tracer.span("readiness.sleep", probe=name, poll=polls):
+            await asyncio.sleep(min(delay, deadline - now))
+        delay = min(delay * 2, max_delay)
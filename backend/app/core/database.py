@@ -1,18 +1,195 @@
+import asyncio
+import logging
 import os
-from sqlalchemy import create_engine
+import time
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
-from typing import Annotated
+from sqlalchemy.pool import QueuePool
+from typing import Annotated, Callable, TypeVar
+from app.core.metrics import metrics
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+
+def _pool_options(url: str) -> dict:
+    # SQLite en memoria usa su propio pool de una conexión por thread
+    if make_url(url).get_backend_name() == "sqlite" and make_url(url).database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": QueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+        # Se recicla antes de que el servidor o un proxy corten las conexiones ociosas
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+
+
+engine = create_engine(DATABASE_URL, **_pool_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
-def get_db():
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info["checked_out_at"] = time.perf_counter()
+    metrics.gauge("db_pool_checked_out").inc()
+
+
+@event.listens_for(engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    checked_out_at = connection_record.info.pop("checked_out_at", None)
+    if checked_out_at is not None:
+        metrics.gauge("db_pool_checked_out").dec()
+        metrics.histogram("db_connection_held_seconds").observe(time.perf_counter() - checked_out_at)
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _on_before_execute(conn, cursor, statement, parameters, context, executemany):
+    # Un span por sentencia, hijo del span actual (solo dentro de un trace)
+    verb = statement.split(None, 1)[0].upper() if statement.strip() else "SQL"
+    span = tracer.start_child(f"SQL {verb}", kind="client", statement=statement[:500], executemany=executemany)
+    if span is not None and context is not None:
+        context._trace_span = span
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _on_after_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        context._trace_span = None
+        tracer.end_child(span)
+
+
+@event.listens_for(engine, "handle_error")
+def _on_execute_error(exception_context):
+    context = exception_context.execution_context
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        context._trace_span = None
+        tracer.end_child(span, error=str(exception_context.original_exception)[:500])
+
+
+# Flush y commit de la sesión: el COMMIT no pasa por cursor_execute
+@event.listens_for(SessionLocal, "before_flush")
+def _on_before_flush(session, flush_context, instances):
+    _start_session_span(session, "db.flush", objects=len(session.new) + len(session.dirty) + len(session.deleted))
+
+
+@event.listens_for(SessionLocal, "after_flush_postexec")
+def _on_after_flush(session, flush_context):
+    _end_session_span(session, "db.flush")
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _on_before_commit(session):
+    _start_session_span(session, "db.commit")
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _on_after_commit(session):
+    _end_session_span(session, "db.commit")
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _on_after_rollback(session):
+    # Un flush o commit que falló termina en rollback
+    _end_session_span(session, "db.flush", error="rollback")
+    _end_session_span(session, "db.commit", error="rollback")
+
+
+def _start_session_span(session, name: str, **attributes) -> None:
+    span = tracer.start_child(name, **attributes)
+    if span is not None:
+        session.info[f"trace_{name}"] = span
+
+
+def _end_session_span(session, name: str, error: str = None) -> None:
+    span = session.info.pop(f"trace_{name}", None)
+    if span is not None:
+        tracer.end_child(span, error=error)
+
+
+# Espera por una conexión libre, solo con eventos públicos de Session: se marca
+# cuando la sesión necesita conexión (primera consulta o flush) y se mide en
+# after_begin, que corre recién con la conexión del pool ya obtenida
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _on_orm_execute(orm_execute_state):
+    orm_execute_state.session.info.setdefault("checkout_started", time.perf_counter())
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _on_flush_checkout(session, flush_context, instances):
+    session.info.setdefault("checkout_started", time.perf_counter())
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _on_after_begin(session, transaction, connection):
+    started = session.info.pop("checkout_started", None)
+    if started is not None:
+        metrics.histogram("db_pool_checkout_wait_seconds").observe(time.perf_counter() - started)
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _on_transaction_end(session, transaction):
+    # Marca de una consulta que ya tenía conexión: no hubo checkout
+    session.info.pop("checkout_started", None)
+
+
+def _endpoint_name(request: Request) -> str:
+    endpoint = request.scope.get("endpoint")
+    if endpoint is None:
+        return "unknown"
+    return f"{endpoint.__module__.rsplit('.', 1)[-1]}.{endpoint.__name__}"
+
+
+def get_db(request: Request):
     db = SessionLocal()
+    start = time.perf_counter()
     try:
         yield db
+    except PoolTimeoutError:
+        metrics.counter("db_pool_checkout_timeouts").inc()
+        raise
     finally:
         db.close()
+        # Por endpoint (no por URL) para ver cuáles retienen la sesión
+        metrics.histogram("db_session_held_seconds", endpoint=_endpoint_name(request)).observe(time.perf_counter() - start)
+
+
+async def run_in_session(db: Session, fn: Callable[..., T], *args) -> T:
+    """
+    Corre trabajo sync de la sesión en un thread y termina la transacción antes
+    de volver, así un endpoint async no retiene la conexión del pool (ni bloquea
+    el loop en el checkout) mientras espera a Bonita. `fn` commitea lo que
+    escribe y devuelve valores planos: al terminar se expiran los objetos ORM.
+    """
+    def run() -> T:
+        try:
+            return fn(*args)
+        except PoolTimeoutError:
+            metrics.counter("db_pool_checkout_timeouts").inc()
+            raise
+        finally:
+            db.rollback()
+    return await asyncio.to_thread(run)
+
+
+def create_missing_indexes() -> None:
+    """create_all no agrega índices nuevos a tablas que ya existen: se crean acá"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                # Otro worker pudo crearlo al mismo tiempo
+                logger.warning("No se pudo crear el índice %s: %s", index.name, e)
@@ -14,3 +14,26 @@ class BonitaAPIError(Exception):
             "body": self.body,
             "headers": self.headers,
         }
+
+
+class CloudAPIError(Exception):
+    def __init__(self, status_code: int, url: str, body: str = None):
+        self.status_code = status_code
+        self.url = url
+        self.body = body
+        self.message = f"CloudAPIError {status_code} en {url}"
+        super().__init__(self.message)
+
+
+class ReadinessTimeout(Exception):
+    pass
+
+
+class PasswordHashingBusy(Exception):
+    """El pool de hashing de contraseñas está saturado"""
+    pass
+
+
+class InvalidCursor(ValueError):
+    """Cursor de paginación mal formado o que no corresponde al listado"""
+    pass
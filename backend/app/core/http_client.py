@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import random
+import httpx
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Errores donde el request nunca llegó al servidor: se pueden reintentar siempre
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Errores a mitad de camino: solo se reintentan si el método es idempotente
+TRANSPORT_ERRORS = (httpx.ReadError, httpx.ReadTimeout, httpx.WriteError, httpx.RemoteProtocolError)
+
+
+def build_async_client(
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry: float = 30.0,
+    timeout: float = 10.0,
+    **kwargs,
+) -> httpx.AsyncClient:
+    """Crea un AsyncClient con pool acotado y keep-alive."""
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    return httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(timeout), **kwargs)
+
+
+def _should_retry_status(method: str, status_code: int) -> bool:
+    if status_code not in RETRY_STATUS_CODES:
+        return False
+    # 503 indica que el servidor no procesó el request, así que es seguro incluso para POST
+    return method in IDEMPOTENT_METHODS or status_code == 503
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Backoff exponencial con full jitter."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def _traced_request(client: httpx.AsyncClient, method: str, url: str, attempt: int, headers: dict = None, **kwargs) -> httpx.Response:
+    """Un span por intento; el traceparent le pasa el trace id al servicio llamado"""
+    with tracer.span(f"HTTP {method}", kind="client", url=str(url), attempt=attempt + 1) as span:
+        response = await client.request(method, url, headers={**(headers or {}), **tracer.propagation_headers()}, **kwargs)
+        if span is not None:
+            span.attributes["status_code"] = response.status_code
+        return response
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    max_retries: int = 3,
+    backoff_base: float = 0.1,
+    backoff_max: float = 2.0,
+    **kwargs,
+) -> httpx.Response:
+    method = method.upper()
+    attempt = 0
+    while True:
+        try:
+            response = await _traced_request(client, method, url, attempt, **kwargs)
+        except CONNECT_ERRORS as e:
+            if attempt >= max_retries:
+                raise
+            logger.warning("Error de conexión en %s %s (intento %s): %s", method, url, attempt + 1, e)
+        except TRANSPORT_ERRORS as e:
+            if method not in IDEMPOTENT_METHODS or attempt >= max_retries:
+                raise
+            logger.warning("Error de transporte en %s %s (intento %s): %s", method, url, attempt + 1, e)
+        else:
+            if not _should_retry_status(method, response.status_code) or attempt >= max_retries:
+                return response
+            logger.warning("%s %s respondió %s (intento %s)", method, url, response.status_code, attempt + 1)
+        with tracer.span("http.backoff", attempt=attempt + 1):
+            await asyncio.sleep(backoff_delay(attempt, backoff_base, backoff_max))
+        attempt += 1
@@ -0,0 +1,318 @@
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import wraps
+import httpx
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+TRACE_ID_HEADER = "X-Trace-Id"
+TRACEPARENT_HEADER = "traceparent"
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# Kinds de OTLP
+_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    kind: str = "internal"
+    attributes: dict = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+class Trace:
+    """Spans de un trace en este proceso; se publica cuando termina la raíz"""
+
+    def __init__(self, trace_id: str, max_spans: int):
+        self.trace_id = trace_id
+        self.max_spans = max_spans
+        self.spans: list[Span] = []
+        self.dropped = 0
+
+    def add(self, span: Span) -> None:
+        # Un polling largo no debe crecer sin límite
+        if len(self.spans) < self.max_spans:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+
+# Marca un request no muestreado, para que sus hijos tampoco se registren
+_NOT_SAMPLED = object()
+_current: ContextVar = ContextVar("trace_current", default=None)
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str] | None:
+    """(trace_id, parent span_id) de un header W3C traceparent"""
+    match = _TRACEPARENT.match((value or "").strip().lower())
+    return (match.group(1), match.group(2)) if match else None
+
+
+class Tracer:
+    """
+    Tracing en proceso: un span raíz por request (ver main.tracing_middleware),
+    hijos por sentencia SQL, método de BonitaClient y request HTTP saliente.
+    Los traces terminados quedan en memoria (/debug/traces/recent) y se
+    exportan en segundo plano a un archivo JSONL y/o a un collector OTLP/HTTP.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.sample_rate = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+        self.max_spans = int(os.getenv("TRACE_MAX_SPANS", "2000"))
+        self.recent: deque = deque(maxlen=int(os.getenv("TRACE_RECENT_SIZE", "200")))
+        self.exporter = _ExportWorker.from_env()
+
+    def current_span(self) -> Span | None:
+        current = _current.get()
+        return None if current is None or current is _NOT_SAMPLED else current[1]
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", parent: tuple[str, str] | None = None, **attributes):
+        """Span hijo del actual; sin span actual abre un trace nuevo (o continúa `parent`)"""
+        current = _current.get()
+        if current is _NOT_SAMPLED or (current is None and not self.enabled):
+            yield None
+            return
+        if current is None:
+            if random.random() >= self.sample_rate:
+                token = _current.set(_NOT_SAMPLED)
+                try:
+                    yield None
+                finally:
+                    _current.reset(token)
+                return
+            trace_id, parent_id = parent or (secrets.token_hex(16), None)
+            trace = Trace(trace_id, self.max_spans)
+        else:
+            trace, parent_span = current
+            parent_id = parent_span.span_id
+        span = Span(trace.trace_id, secrets.token_hex(8), parent_id, name, kind, attributes)
+        token = _current.set((trace, span))
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"[:500]
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current.reset(token)
+            trace.add(span)
+            if current is None:
+                self._finish(trace, span)
+
+    def start_child(self, name: str, kind: str = "internal", **attributes) -> Span | None:
+        """Span hijo que no pasa a ser el actual, para hooks con inicio y fin separados (eventos SQL)"""
+        current = _current.get()
+        if current is None or current is _NOT_SAMPLED:
+            return None
+        trace, parent = current
+        span = Span(trace.trace_id, secrets.token_hex(8), parent.span_id, name, kind, attributes)
+        span.attributes["_trace"] = trace
+        return span
+
+    def end_child(self, span: Span, error: str = None) -> None:
+        span.end_ns = time.time_ns()
+        span.error = error
+        span.attributes.pop("_trace").add(span)
+
+    def propagation_headers(self) -> dict:
+        span = self.current_span()
+        if span is None:
+            return {}
+        return {TRACEPARENT_HEADER: f"00-{span.trace_id}-{span.span_id}-01"}
+
+    def _finish(self, trace: Trace, root: Span) -> None:
+        record = {
+            "trace_id": trace.trace_id,
+            "name": root.name,
+            "start": datetime.fromtimestamp(root.start_ns / 1e9, timezone.utc).isoformat(),
+            "duration_ms": root.duration_ms,
+            "error": root.error,
+            "dropped_spans": trace.dropped,
+            # Copia: una tarea que siguiera con el contexto del trace no debe modificar el registro
+            "spans": list(trace.spans),
+        }
+        self.recent.append(record)
+        metrics.counter("traces_finished").inc()
+        if self.exporter is not None:
+            self.exporter.submit(record)
+
+    def slowest(self, limit: int, min_duration_ms: float = 0, with_spans: bool = True) -> list[dict]:
+        records = sorted(
+            (record for record in list(self.recent) if record["duration_ms"] >= min_duration_ms),
+            key=lambda record: record["duration_ms"],
+            reverse=True,
+        )
+        return [_describe(record, with_spans) for record in records[:limit]]
+
+
+def _describe(record: dict, with_spans: bool) -> dict:
+    """Trace con el tiempo sumado por nombre de span (los anidados se cuentan en cada nivel)"""
+    spans = record["spans"]
+    start_ns = min((span.start_ns for span in spans), default=0)
+    breakdown = {}
+    for span in spans:
+        entry = breakdown.setdefault(span.name, {"name": span.name, "count": 0, "total_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += span.duration_ms
+    described = {
+        **{key: value for key, value in record.items() if key != "spans"},
+        "span_count": len(spans),
+        "breakdown": sorted(breakdown.values(), key=lambda entry: entry["total_ms"], reverse=True),
+    }
+    if with_spans:
+        described["spans"] = [
+            {
+                "name": span.name,
+                "kind": span.kind,
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                "offset_ms": (span.start_ns - start_ns) / 1e6,
+                "duration_ms": span.duration_ms,
+                "attributes": span.attributes,
+                "error": span.error,
+            }
+            for span in sorted(spans, key=lambda span: span.start_ns)
+        ]
+    return described
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(span: Span) -> dict:
+    otlp = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": _SPAN_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+class _ExportWorker:
+    """Thread que exporta los traces en lotes, para no escribir ni hacer HTTP en el request"""
+
+    def __init__(self, file_path: str | None, otlp_endpoint: str | None, service_name: str):
+        self.file_path = file_path
+        self.otlp_endpoint = otlp_endpoint
+        self.service_name = service_name
+        self.queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("TRACE_EXPORT_QUEUE", "1000")))
+        self.thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def from_env(cls) -> "_ExportWorker | None":
+        file_path = os.getenv("TRACE_EXPORT_FILE")
+        otlp_endpoint = os.getenv("TRACE_OTLP_ENDPOINT")  # p. ej. http://localhost:4318/v1/traces
+        if not file_path and not otlp_endpoint:
+            return None
+        return cls(file_path, otlp_endpoint, os.getenv("TRACE_SERVICE_NAME", "local-api"))
+
+    def submit(self, record: dict) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.counter("trace_export_dropped").inc()
+
+    def _run(self) -> None:
+        client = httpx.Client(timeout=5.0) if self.otlp_endpoint else None
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < 100:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if self.file_path:
+                    self._write_file(batch)
+                if client is not None:
+                    self._post_otlp(client, batch)
+                metrics.counter("traces_exported").inc(len(batch))
+            except Exception as e:
+                metrics.counter("trace_export_errors").inc()
+                logger.warning("No se pudieron exportar %s traces: %s", len(batch), e)
+
+    def _write_file(self, batch: list[dict]) -> None:
+        with open(self.file_path, "a", encoding="utf-8") as file:
+            for record in batch:
+                line = {**record, "spans": [_otlp_span(span) for span in record["spans"]]}
+                file.write(json.dumps(line, default=str) + "\n")
+
+    def _post_otlp(self, client: httpx.Client, batch: list[dict]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [_otlp_span(span) for record in batch for span in record["spans"]],
+                }],
+            }]
+        }
+        response = client.post(self.otlp_endpoint, json=payload)
+        response.raise_for_status()
+
+
+tracer = Tracer()
+
+
+def traced(name: str, kind: str = "internal"):
+    """Decorador para funciones async: un span por llamada"""
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with tracer.span(name, kind):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_methods(prefix: str, include: tuple = (), exclude: tuple = ()):
+    """Decorador de clase: un span por cada método async público (más `include`)"""
+    def decorator(cls):
+        for name, attribute in list(vars(cls).items()):
+            public = not name.startswith("_") or name in include
+            if public and name not in exclude and inspect.iscoroutinefunction(attribute):
+                setattr(cls, name, traced(f"{prefix}.{name}")(attribute))
+        return cls
+    return decorator
+
@@ -1,12 +1,77 @@
-from fastapi import FastAPI
-from app.core.database import Base, engine
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app.core.database import Base, create_missing_indexes, engine
+from app.core.exceptions import InvalidCursor, PasswordHashingBusy
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.scheduler import COMPUTED_AT_HEADER
+from app.core.tracing import TRACE_ID_HEADER, TRACEPARENT_HEADER, parse_traceparent, tracer
+from app.services.idempotency_service import IDEMPOTENT_REPLAYED_HEADER
+from app.core.security import shutdown_password_pool
 from app.api.router import api_router
+from app.bonita_integration.bonita_api import bonita
+from app.services.cloud_client import cloud_client
+from app.services.stats_service import stats_kpis
+from app.services.bonita_outbox_service import run_outbox_worker
 from fastapi.middleware.cors import CORSMiddleware
 from app.models import *
 
 Base.metadata.create_all(bind=engine)
+create_missing_indexes()
 
-app = FastAPI(title="Local API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    refresh_interval = float(os.getenv("KPI_REFRESH_INTERVAL", "300"))
+    refresher = asyncio.create_task(stats_kpis.run(refresh_interval)) if refresh_interval > 0 else None
+    outbox_worker = asyncio.create_task(run_outbox_worker(float(os.getenv("BONITA_OUTBOX_POLL_INTERVAL", "5"))))
+    yield
+    if refresher:
+        refresher.cancel()
+    outbox_worker.cancel()
+    await bonita.aclose()
+    await cloud_client.aclose()
+    shutdown_password_pool()
+
+
+app = FastAPI(title="Local API", lifespan=lifespan)
+
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    # Un pico de logins se rechaza rápido en vez de encolar sin límite
+    return JSONResponse(status_code=503, content={"detail": "Servidor ocupado, reintente en unos segundos."}, headers={"Retry-After": "1"})
+
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+def _route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    if route is None:
+        return request.url.path
+    # Con routers incluidos route.path puede venir sin el prefijo: se toma de la URL
+    segments = request.url.path.rstrip("/").split("/")
+    prefix = "/".join(segments[:len(segments) - len(route.path.rstrip("/").split("/")) + 1])
+    return prefix + route.path
+
+
+@app.middleware("http")
+async def tracing_middleware(request: Request, call_next):
+    # Span raíz del request; si el llamador manda traceparent se continúa su trace
+    parent = parse_traceparent(request.headers.get(TRACEPARENT_HEADER))
+    with tracer.span(f"{request.method} {request.url.path}", kind="server", parent=parent) as span:
+        response = await call_next(request)
+        if span is not None:
+            # Nombre por ruta y no por URL, para agrupar /projects/{id} en el desglose
+            span.name = f"{request.method} {_route_template(request)}"
+            span.attributes["status_code"] = response.status_code
+            response.headers[TRACE_ID_HEADER] = span.trace_id
+        return response
 
 origins = [
     "http://localhost:5173",  #  frontend vite
@@ -19,6 +84,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, COMPUTED_AT_HEADER, IDEMPOTENT_REPLAYED_HEADER, TRACE_ID_HEADER],
 )
 
 app.include_router(api_router)
@@ -1,3 +1,6 @@
 from .project import Project
 from .task import Task
-from .observation import Observation
\ No newline at end of file
+from .observation import Observation
+from .kpi_snapshot import KpiCaseSnapshot
+from .bonita_outbox import BonitaOutbox
+from .idempotency_key import IdempotencyKey
\ No newline at end of file
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+
+class BonitaOutbox(Base):
+    """Envíos pendientes a Bonita, guardados en la misma transacción que el proyecto"""
+    __tablename__ = "bonita_outbox"
+    # claim_due: status = 'pending' AND next_attempt_at <= now ORDER BY next_attempt_at
+    __table_args__ = (
+        Index("ix_bonita_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
+    process_name = Column(String(255), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending | delivered | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    # Avance de la entrega, para que un reintento no instancie ni envíe dos veces
+    case_id = Column(String(100), nullable=True)
+    task_id = Column(String(100), nullable=True)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    delivered_at = Column(DateTime, nullable=True)
+
+    project = relationship("Project")
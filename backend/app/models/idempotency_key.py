@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from datetime import datetime
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """Idempotency-Key recibidas y la respuesta guardada, para devolverla en los reintentos"""
+    __tablename__ = "idempotency_keys"
+    # La key es del cliente: se acota por usuario y endpoint
+    __table_args__ = (
+        UniqueConstraint("user_id", "endpoint", "key", name="uq_idempotency_keys_user_endpoint_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    endpoint = Column(String(100), nullable=False)
+    key = Column(String(255), nullable=False)
+    # sha256 del cuerpo: la misma key con otro cuerpo es un error del cliente
+    request_hash = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default="processing")  # processing | completed
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+    # Mientras está en processing: si vence, se asume que el request murió y otro lo retoma
+    locked_until = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, Date, Boolean
+from datetime import datetime
+from app.core.database import Base
+
+
+class KpiCaseSnapshot(Base):
+    __tablename__ = "kpi_case_snapshots"
+
+    id = Column(String(100), primary_key=True)  # id del archivedCase en Bonita
+    process_id = Column(String(100), nullable=False, index=True)
+    source_case_id = Column(String(100), nullable=True)
+    end_date = Column(DateTime, nullable=True, index=True)
+    project_end_date = Column(Date, nullable=True)
+    on_time = Column(Boolean, nullable=True)  # None: no se pudo leer la variable, se reintenta
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
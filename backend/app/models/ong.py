@@ -7,7 +7,7 @@ class Ong(Base):
     __tablename__ = "ongs"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False, index=True)
 
     project_ong = relationship("Project", back_populates="ong_responsable", cascade="all, delete-orphan")
     users = relationship("User", secondary="user_ongs", back_populates="ongs")
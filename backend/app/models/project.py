@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 
 class Project(Base):
     __tablename__ = "projects"
+    # Los listados filtran por dueño o estado y paginan por id
+    __table_args__ = (
+        Index("ix_projects_owner_id_id", "owner_id", "id"),
+        Index("ix_projects_status_id", "status", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), index=True, nullable=False)
@@ -14,7 +14,7 @@ class Task(Base):
     quantity = Column(String(100), nullable=False)
     resolves_by_itself = Column(Boolean, nullable=False)
     status = Column(String(50), nullable=False, default="pending")
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
 
     project = relationship("Project", back_populates="tasks")
     ong_associations = relationship("TaskOngAssociation", back_populates="task")
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 
 class TaskOngAssociation(Base):
     __tablename__ = "task_ongs"
+    # La clave primaria (task_id, ong_id) ya cubre las búsquedas por tarea
+    __table_args__ = (
+        Index("ix_task_ongs_ong_id_status", "ong_id", "status"),
+        Index("ix_task_ongs_status_task_id", "status", "task_id"),
+    )
 
     task_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
     ong_id = Column(Integer, ForeignKey("ongs.id"), primary_key=True)
@@ -1,9 +1,11 @@
-from sqlalchemy import Table, Column, ForeignKey, Integer
+from sqlalchemy import Table, Column, ForeignKey, Integer, Index
 from app.core.database import Base
 
 user_ongs = Table(
     'user_ongs',
     Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
-    Column('ong_id', Integer, ForeignKey('ongs.id'), primary_key=True)
+    Column('ong_id', Integer, ForeignKey('ongs.id'), primary_key=True),
+    # La clave primaria empieza por user_id: los usuarios de una ONG necesitan su propio índice
+    Index('ix_user_ongs_ong_id', 'ong_id'),
 )
\ No newline at end of file
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, List, Optional
-from sqlalchemy.orm import Session
+from typing import Generic, TypeVar, List, Optional, Sequence
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query, Session
+from app.core.exceptions import InvalidCursor
+from app.core.pagination import Page
 
 T = TypeVar('T')
 
@@ -16,6 +19,29 @@ class BaseRepository(Generic[T], ABC):
     def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         return self.db.query(self.model).offset(skip).limit(limit).all()
 
+    def paginate(self, query: Query, limit: int, after: Optional[tuple] = None, keys: Optional[Sequence] = None, descending: bool = False) -> Page[T]:
+        """
+        Paginación por clave (keyset): filtra por las claves de orden del último
+        ítem visto en vez de usar OFFSET, así cada página cuesta lo mismo.
+        Las claves tienen que identificar la fila de forma única (terminar en el id).
+        """
+        keys = list(keys) if keys is not None else [self.model.id]
+        if after is not None:
+            if len(after) != len(keys):
+                raise InvalidCursor("El cursor no corresponde a este listado")
+            position = keys[0] if len(keys) == 1 else tuple_(*keys)
+            bound = after[0] if len(keys) == 1 else tuple_(*after)
+            query = query.filter(position < bound if descending else position > bound)
+        order = [key.desc() if descending else key.asc() for key in keys]
+        # Se pide uno de más para saber si hay página siguiente
+        rows = query.order_by(None).order_by(*order).limit(limit + 1).all()
+        items = rows[:limit]
+        next_after = tuple(getattr(items[-1], key.key) for key in keys) if len(rows) > limit else None
+        return Page(items=items, next_after=next_after)
+
+    def get_page(self, limit: int, after: Optional[tuple] = None) -> Page[T]:
+        return self.paginate(self.db.query(self.model), limit, after)
+
     def create(self, obj_data: dict) -> T:
         db_obj = self.model(**obj_data)
         self.db.add(db_obj)
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from app.models.bonita_outbox import BonitaOutbox
+from app.models.project import Project
+from app.repositories.base_repository import BaseRepository
+
+
+class BonitaOutboxRepository(BaseRepository):
+    def __init__(self, db):
+        super().__init__(db, BonitaOutbox)
+
+    def add(self, project_id: int, process_name: str, payload: dict) -> BonitaOutbox:
+        """Agrega el envío a la transacción en curso, sin commitear"""
+        entry = BonitaOutbox(project_id=project_id, process_name=process_name, payload=payload)
+        self.db.add(entry)
+        return entry
+
+    def claim_due(self, limit: int, lease_seconds: float) -> list[BonitaOutbox]:
+        """
+        Toma los envíos vencidos y corre su next_attempt_at hacia adelante
+        (lease): si el worker muere a mitad de la entrega, se retoman al vencer.
+        """
+        now = datetime.utcnow()
+        entries = (
+            self.db.query(BonitaOutbox)
+            .filter(BonitaOutbox.status == "pending", BonitaOutbox.next_attempt_at <= now)
+            .order_by(BonitaOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for entry in entries:
+            entry.attempts += 1
+            entry.next_attempt_at = now + timedelta(seconds=lease_seconds)
+        self.db.commit()
+        return entries
+
+    def save(self, entry_id: int, fields: dict) -> None:
+        """Actualiza y commitea campos del envío sin cargarlo"""
+        self.db.query(BonitaOutbox).filter(BonitaOutbox.id == entry_id).update(fields, synchronize_session=False)
+        self.db.commit()
+
+    def mark_delivered(self, entry_id: int, project_id: int, case_id: str, delivered_at: datetime) -> None:
+        """Marca el envío entregado y guarda el case id en el proyecto, en la misma transacción"""
+        self.db.query(Project).filter(Project.id == project_id).update({"bonita_case_id": case_id}, synchronize_session=False)
+        self.db.query(BonitaOutbox).filter(BonitaOutbox.id == entry_id).update(
+            {"status": "delivered", "delivered_at": delivered_at, "last_error": None, "case_id": case_id},
+            synchronize_session=False,
+        )
+        self.db.commit()
+
+    def get_pending_for_project(self, project_id: int) -> BonitaOutbox | None:
+        return (
+            self.db.query(BonitaOutbox)
+            .filter(BonitaOutbox.project_id == project_id, BonitaOutbox.status != "delivered")
+            .first()
+        )
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from app.models.idempotency_key import IdempotencyKey
+from app.repositories.base_repository import BaseRepository
+
+
+class IdempotencyKeyRepository(BaseRepository):
+    def __init__(self, db):
+        super().__init__(db, IdempotencyKey)
+
+    def get(self, user_id: int, endpoint: str, key: str) -> IdempotencyKey | None:
+        return (
+            self.db.query(IdempotencyKey)
+            .filter(IdempotencyKey.user_id == user_id, IdempotencyKey.endpoint == endpoint, IdempotencyKey.key == key)
+            .one_or_none()
+        )
+
+    def reserve(self, user_id: int, endpoint: str, key: str, request_hash: str, lock_seconds: float, ttl_seconds: float) -> IdempotencyKey:
+        """Inserta la key en processing y commitea; el índice único frena a un request concurrente"""
+        now = datetime.utcnow()
+        entry = IdempotencyKey(
+            user_id=user_id, endpoint=endpoint, key=key, request_hash=request_hash, status="processing",
+            locked_until=now + timedelta(seconds=lock_seconds), expires_at=now + timedelta(seconds=ttl_seconds),
+        )
+        self.db.add(entry)
+        self.db.commit()
+        return entry
+
+    def complete(self, entry: IdempotencyKey, response_status: int, response_body) -> None:
+        """Guarda la respuesta en la transacción en curso, sin commitear: queda junto con el resultado"""
+        entry.status = "completed"
+        entry.response_status = response_status
+        entry.response_body = response_body
+
+    def delete_expired(self, entry_id: int, now: datetime) -> bool:
+        """Borra la key vencida; False si otro request ya la borró (DELETE condicional)"""
+        deleted = (
+            self.db.query(IdempotencyKey)
+            .filter(IdempotencyKey.id == entry_id, IdempotencyKey.expires_at <= now)
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted == 1
+
+    def take_over(self, entry_id: int, now: datetime, locked_until: datetime) -> bool:
+        """Retoma una reserva con el lock vencido; False si otro request la tomó antes (UPDATE condicional)"""
+        updated = (
+            self.db.query(IdempotencyKey)
+            .filter(IdempotencyKey.id == entry_id, IdempotencyKey.status == "processing", IdempotencyKey.locked_until <= now)
+            .update({"locked_until": locked_until}, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated == 1
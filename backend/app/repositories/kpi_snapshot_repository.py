@@ -0,0 +1,46 @@
+from datetime import datetime
+from sqlalchemy import func, case
+from app.models.kpi_snapshot import KpiCaseSnapshot
+from app.repositories.base_repository import BaseRepository
+
+
+class KpiSnapshotRepository(BaseRepository):
+    def __init__(self, db):
+        super().__init__(db, KpiCaseSnapshot)
+
+    def get_watermark(self, process_id: str) -> datetime | None:
+        return (
+            self.db.query(func.max(KpiCaseSnapshot.end_date))
+            .filter(KpiCaseSnapshot.process_id == process_id)
+            .scalar()
+        )
+
+    def get_known_ids(self, ids: list[str]) -> set[str]:
+        if not ids:
+            return set()
+        rows = self.db.query(KpiCaseSnapshot.id).filter(KpiCaseSnapshot.id.in_(ids)).all()
+        return {row.id for row in rows}
+
+    def get_undetermined(self, process_id: str) -> list[KpiCaseSnapshot]:
+        return (
+            self.db.query(KpiCaseSnapshot)
+            .filter(KpiCaseSnapshot.process_id == process_id, KpiCaseSnapshot.on_time.is_(None))
+            .all()
+        )
+
+    def save_all(self, rows: list[dict]) -> None:
+        for row in rows:
+            self.db.merge(KpiCaseSnapshot(**row))
+        self.db.commit()
+
+    def get_on_time_summary(self, process_id: str) -> tuple[int, int]:
+        """Devuelve (casos completados, casos terminados a tiempo) de la versión del proceso"""
+        total, on_time = (
+            self.db.query(
+                func.count(KpiCaseSnapshot.id),
+                func.sum(case((KpiCaseSnapshot.on_time == True, 1), else_=0)),
+            )
+            .filter(KpiCaseSnapshot.process_id == process_id)
+            .one()
+        )
+        return int(total or 0), int(on_time or 0)
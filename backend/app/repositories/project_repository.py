@@ -1,53 +1,48 @@
 from app.models.project import Project
+from app.core.pagination import Page
 from app.repositories.base_repository import BaseRepository
 from app.models.task import Task
-from typing import List
-from sqlalchemy import func, case 
+from typing import List, Optional
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import selectinload
 
 
 class ProjectRepository(BaseRepository):
     def __init__(self, db):
         super().__init__(db, Project)
 
-    def get_by_status(self, status: str) -> list[Project]:
-        return self.db.query(self.model).filter(self.model.status == status).all()
+    def _with_tasks(self):
+        # Los listados serializan ProjectResponse con sus tareas: se traen
+        # todas en una segunda consulta (IN) en vez de una por proyecto
+        return self.db.query(self.model).options(selectinload(self.model.tasks))
 
-    def get_projects_by_owner_ids(self, owner_ids: List[int]) -> list[Project]:
+    def get_by_status(self, status: str, limit: int, after: Optional[tuple] = None) -> Page[Project]:
+        return self.paginate(self._with_tasks().filter(self.model.status == status), limit, after)
+
+    def get_projects_by_owner_ids(self, owner_ids: List[int], limit: int, after: Optional[tuple] = None) -> Page[Project]:
         if not owner_ids:
-            return []
-        return self.db.query(self.model).filter(self.model.owner_id.in_(owner_ids)).all()
+            return Page(items=[])
+        return self.paginate(self._with_tasks().filter(self.model.owner_id.in_(owner_ids)), limit, after)
 
     def get_project_by_name(self, name: str) -> Project | None:
         return self.db.query(self.model).filter(self.model.name == name).first()
 
-    def get_projects_with_tasks_by_owner_ids(self, owner_ids: List[int]) -> list[Project]:
+    def get_projects_with_tasks_by_owner_ids(self, owner_ids: List[int], limit: int, after: Optional[tuple] = None) -> Page[Project]:
         if not owner_ids:
-            return []
-        return (
-            self.db.query(self.model)
-            .filter(self.model.owner_id.in_(owner_ids))
-            .join(Task)
-            .distinct()
-            .all()
-        )
-
-    def get_projects_solved_without_collaboration(self) -> list[Project]:
-        # Proyectos donde:
-        # - status == 'execution'
-        # - todas sus tasks tienen resolves_by_itself = True
-
-        return (
-            self.db.query(self.model)
-            .join(Task)
-            .filter(self.model.status == "execution")   # <-- FILTRO NUEVO
-            .group_by(self.model.id)
-            .having(
-                func.sum(
-                    case(
-                        (Task.resolves_by_itself == True, 1),
-                        else_=0
-                    )
-                ) == func.count(Task.id)
-            )
-            .all()
+            return Page(items=[])
+        query = self._with_tasks().filter(self.model.owner_id.in_(owner_ids), self.model.tasks.any())
+        return self.paginate(query, limit, after)
+
+    def count_projects_solved_without_collaboration(self) -> int:
+        """
+        Proyectos en execution con al menos una tarea y todas resueltas por la
+        propia ONG. Solo el número: se cuenta en la base, sin traer filas.
+        """
+        has_tasks = exists().where(Task.project_id == self.model.id)
+        needs_collaboration = exists().where(Task.project_id == self.model.id, Task.resolves_by_itself == False)
+        query = (
+            select(func.count())
+            .select_from(self.model)
+            .where(self.model.status == "execution", has_tasks, ~needs_collaboration)
         )
+        return self.db.scalar(query)
@@ -1,6 +1,6 @@
+from sqlalchemy import insert
 from app.models.task import Task
 from app.repositories.base_repository import BaseRepository
-from app.schemas.task_schema import TaskCreate
 from app.models.task_ong import TaskOngAssociation
 
 
@@ -8,35 +8,30 @@ class TaskRepository(BaseRepository):
     def __init__(self, db):
         super().__init__(db, Task)
 
-    def create_multiple_tasks(self, tasks_data):
-        tasks = [Task(**data) for data in tasks_data]
-        self.db.add_all(tasks)
+    def _insert_tasks(self, tasks_data: list[dict]) -> list[int]:
+        """
+        INSERT ... RETURNING en bloque en vez de un refresh por tarea. Sin
+        sort_by_parameter_order los ids no siguen el orden de tasks_data, pero
+        así SQLAlchemy agrupa las filas en pocas sentencias.
+        """
+        if not tasks_data:
+            return []
+        return self.db.scalars(insert(Task).returning(Task.id), tasks_data).all()
+
+    def create_multiple_tasks(self, tasks_data: list[dict]) -> list[int]:
+        task_ids = self._insert_tasks(tasks_data)
         self.db.commit()
-        for task in tasks:
-            self.db.refresh(task)
-        return tasks
+        return task_ids
 
-    def save_tasks_with_ong(self, tasks: list, ong_id: int):
+    def save_tasks_with_ong(self, tasks: list[dict], ong_id: int) -> list[int]:
         """
         Crea múltiples tareas y las asocia a una misma ONG con status 'owner'.
+        Los dicts ya vienen validados con el ProjectCreate del request.
+        No commitea: es parte de la transacción del proyecto.
         """
-        new_tasks = []
-        for task_dict in tasks:
-            task_data = TaskCreate(**task_dict)
-            new_task = Task(
-                title=task_data.title,
-                necessity=task_data.necessity,
-                quantity=task_data.quantity,
-                start_date=task_data.start_date,
-                end_date=task_data.end_date,
-                resolves_by_itself=task_data.resolves_by_itself,
-                project_id=task_data.project_id,
-                status="resolved"
-            )
-            self.db.add(new_task)
-            new_tasks.append(new_task)
-
-        self.db.flush() 
-        associations = [TaskOngAssociation(task_id=task.id, ong_id=ong_id, status="owner") for task in new_tasks]
-        self.db.add_all(associations)
-        return new_tasks
+        task_ids = self._insert_tasks([{**task, "status": "resolved"} for task in tasks])
+        if task_ids:
+            self.db.execute(insert(TaskOngAssociation), [
+                {"task_id": task_id, "ong_id": ong_id, "status": "owner"} for task_id in task_ids
+            ])
+        return task_ids
@@ -59,6 +59,7 @@ class ProjectCreate(ProjectBase):
 class ProjectResponse(ProjectBase):
     id: int
     tasks: List[TaskResponse]
+    bonita_case_id: Optional[str] = None  # None hasta que el outbox entrega el proyecto a Bonita
 
 
 class CompleteProject(ProjectBase):
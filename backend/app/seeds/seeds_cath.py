@@ -32,27 +32,29 @@ def seed_users(db: Session):
     from passlib.context import CryptContext
     
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    
+    # Todos comparten contraseña: se hashea una sola vez
+    hashed_password = pwd_context.hash("password123")
+
     users_data = [
         {
             "username": "juan_admin",
             "email": "juan@example.com",
-            "hashed_password": pwd_context.hash("password123")
+            "hashed_password": hashed_password
         },
         {
             "username": "maria_user",
             "email": "maria@example.com",
-            "hashed_password": pwd_context.hash("password123")
+            "hashed_password": hashed_password
         },
         {
             "username": "carlos_dev",
             "email": "carlos@example.com",
-            "hashed_password": pwd_context.hash("password123")
+            "hashed_password": hashed_password
         },
         {
             "username": "ana_volunteer",
             "email": "ana@example.com",
-            "hashed_password": pwd_context.hash("password123")
+            "hashed_password": hashed_password
         },
     ]
     
@@ -3,9 +3,11 @@ from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from app.services.user_service import UserService
+from app.services.user_service import UserService, current_user_cache
+from app.schemas.user_schema import UserResponse
 from app.core.database import get_db
 import os
+import time
 
 
 SECRET_KEY = os.getenv("SECRET_KEY_LOCAL", "default_secret_if_missing")
@@ -21,15 +23,36 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str, credentials_exception):
+def decode_token(token: str, credentials_exception) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        return username
     except JWTError:
         raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+def verify_token(token: str, credentials_exception):
+    return decode_token(token, credentials_exception)["sub"]
+
+def _get_user_from_token(token: str, db: Session, credentials_exception) -> UserResponse:
+    """Evita las consultas de usuario y ONGs mientras el token siga en el cache"""
+    payload = decode_token(token, credentials_exception)
+    key = (payload["sub"], payload.get("exp"))
+    user = current_user_cache.get(key)
+    if user is None:
+        user = UserService(db).get_user_by_username(payload["sub"])
+        # Se cierra la transacción de lectura: un endpoint async no retiene la
+        # conexión mientras espera a Bonita (el user ya es un UserResponse)
+        db.rollback()
+        if user is None:
+            raise credentials_exception
+        # No se cachea más allá del vencimiento del token
+        ttl = current_user_cache.ttl
+        if payload.get("exp"):
+            ttl = min(ttl, payload["exp"] - time.time())
+        current_user_cache.set(key, user, ttl=ttl)
+    return user
     
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
@@ -37,11 +60,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     ) 
-    username = verify_token(token, credentials_exception)
-    user_service = UserService(db)
-    user = user_service.get_user_by_username(username)
-    if user is None:
-        raise credentials_exception
+    user = _get_user_from_token(token, db, credentials_exception)
     return user
 
 def get_current_manager_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
@@ -54,11 +73,7 @@ def get_current_manager_user(token: str = Depends(oauth2_scheme), db: Session =
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Unauthorized, access denied",
     ) 
-    username = verify_token(token, credentials_exception)
-    user_service = UserService(db)
-    user = user_service.get_user_by_username(username)
-    if user is None:
-        raise credentials_exception
+    user = _get_user_from_token(token, db, credentials_exception)
     if not user.is_manager:
         raise rol_exception
     return user 
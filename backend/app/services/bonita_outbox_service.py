@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.bonita_integration.bonita_api import bonita
+from app.core.database import SessionLocal
+from app.core.http_client import backoff_delay
+from app.core.metrics import metrics
+from app.core.tracing import tracer
+from app.models.bonita_outbox import BonitaOutbox
+from app.repositories.bonita_outbox_repository import BonitaOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+# Despierta al worker apenas se commitea un envío nuevo, sin esperar al próximo poll
+_outbox_wakeup = asyncio.Event()
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+def notify_outbox() -> None:
+    """Se puede llamar desde endpoints sync (threadpool) o async"""
+    if _worker_loop is not None:
+        _worker_loop.call_soon_threadsafe(_outbox_wakeup.set)
+
+
+@dataclass
+class OutboxDelivery:
+    """Copia plana de un envío tomado: la entrega no retiene sesión ni conexión mientras espera a Bonita"""
+    id: int
+    project_id: int
+    process_name: str
+    payload: dict
+    attempts: int
+    case_id: str | None
+    task_id: str | None
+    created_at: datetime
+
+    @classmethod
+    def from_entry(cls, entry: BonitaOutbox) -> "OutboxDelivery":
+        return cls(
+            entry.id, entry.project_id, entry.process_name, entry.payload,
+            entry.attempts, entry.case_id, entry.task_id, entry.created_at,
+        )
+
+
+class BonitaOutboxService:
+    """
+    Entrega a Bonita los envíos del outbox: instancia el proceso, asigna la
+    primera tarea humana, envía el formulario y escribe el case id en el proyecto.
+    """
+
+    def __init__(self, db: Session = None):
+        self.bonita = bonita
+        # La sesión del request solo se usa para enqueue; las entregas abren las suyas
+        self.outbox_repo = BonitaOutboxRepository(db)
+        self.batch_size = int(os.getenv("BONITA_OUTBOX_BATCH", "20"))
+        self.concurrency = int(os.getenv("BONITA_OUTBOX_CONCURRENCY", "4"))
+        self.max_attempts = int(os.getenv("BONITA_OUTBOX_MAX_ATTEMPTS", "10"))
+        self.lease_seconds = float(os.getenv("BONITA_OUTBOX_LEASE", "120"))
+
+    def enqueue(self, project_id: int, process_name: str, payload: dict) -> BonitaOutbox:
+        return self.outbox_repo.add(project_id, process_name, payload)
+
+    @staticmethod
+    async def _in_session(fn, *args):
+        """Corre `fn(repo, *args)` en un thread, con una sesión corta propia de esa escritura"""
+        def run():
+            with SessionLocal(expire_on_commit=False) as db:
+                return fn(BonitaOutboxRepository(db), *args)
+        return await asyncio.to_thread(run)
+
+    def _claim(self, repo: BonitaOutboxRepository) -> list[OutboxDelivery]:
+        return [OutboxDelivery.from_entry(entry) for entry in repo.claim_due(self.batch_size, self.lease_seconds)]
+
+    async def process_due(self) -> int:
+        """Entrega los envíos vencidos. Devuelve cuántos tomó."""
+        deliveries = await self._in_session(self._claim)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def deliver(delivery: OutboxDelivery) -> None:
+            # Cada entrega es su propio trace (corre fuera del request que la encoló)
+            async with semaphore:
+                with tracer.span("outbox.deliver", outbox_id=delivery.id, project_id=delivery.project_id):
+                    await self._deliver(delivery)
+
+        await asyncio.gather(*(deliver(delivery) for delivery in deliveries))
+        return len(deliveries)
+
+    async def _deliver(self, delivery: OutboxDelivery) -> None:
+        try:
+            if not delivery.case_id:
+                process_id = await self.bonita.get_process_id_by_name(delivery.process_name)
+                delivery.case_id = str((await self.bonita.initiate_process(process_id)).get("caseId"))
+                await self._in_session(BonitaOutboxRepository.save, delivery.id, {"case_id": delivery.case_id})
+
+            if delivery.task_id:
+                # Reintento después de enviar el formulario: si la tarea ya no está
+                # disponible es que Bonita la completó y no hay que reenviarla
+                ready_ids = {str(task["id"]) for task in await self.bonita.start_human_tasks(delivery.case_id)}
+                already_sent = delivery.task_id not in ready_ids
+            else:
+                delivery.task_id = str((await self.bonita.wait_for_human_tasks(delivery.case_id))[0].get("id"))
+                await self._in_session(BonitaOutboxRepository.save, delivery.id, {"task_id": delivery.task_id})
+                already_sent = False
+
+            if not already_sent:
+                await self.bonita.assign_task(delivery.task_id)
+                await self.bonita.send_form_data(delivery.task_id, delivery.payload)
+
+            delivered_at = datetime.utcnow()
+            await self._in_session(
+                BonitaOutboxRepository.mark_delivered, delivery.id, delivery.project_id, delivery.case_id, delivered_at
+            )
+            metrics.counter("bonita_outbox_delivered").inc()
+            metrics.histogram("bonita_outbox_delivery_seconds").observe((delivered_at - delivery.created_at).total_seconds())
+        except Exception as e:
+            await self._record_failure(delivery, e)
+
+    async def _record_failure(self, delivery: OutboxDelivery, error: Exception) -> None:
+        # Se guarda también el avance: si falló el commit del case_id, el reintento no instancia otro caso
+        fields = {"case_id": delivery.case_id, "task_id": delivery.task_id, "last_error": str(error)[:2000]}
+        if delivery.attempts >= self.max_attempts:
+            fields["status"] = "failed"
+            metrics.counter("bonita_outbox_failed").inc()
+            logger.error("Envío %s del proyecto %s descartado tras %s intentos: %s", delivery.id, delivery.project_id, delivery.attempts, error)
+        else:
+            fields["next_attempt_at"] = datetime.utcnow() + timedelta(seconds=backoff_delay(delivery.attempts, 1.0, 300.0))
+            metrics.counter("bonita_outbox_retries").inc()
+            logger.warning("Envío %s del proyecto %s falló (intento %s): %s", delivery.id, delivery.project_id, delivery.attempts, error)
+        try:
+            await self._in_session(BonitaOutboxRepository.save, delivery.id, fields)
+        except Exception as e:
+            # Sin base no se puede registrar: el envío se retoma cuando vence el lease
+            logger.error("No se pudo registrar la falla del envío %s: %s", delivery.id, e)
+
+
+async def run_outbox_worker(poll_interval: float) -> None:
+    """Loop de fondo que vacía el outbox; se despierta con notify_outbox() o cada poll_interval"""
+    global _worker_loop
+    _worker_loop = asyncio.get_running_loop()
+    while True:
+        # Se limpia antes de procesar para no perder avisos que lleguen durante el lote
+        _outbox_wakeup.clear()
+        full_batch = False
+        try:
+            service = BonitaOutboxService()
+            full_batch = await service.process_due() >= service.batch_size
+        except Exception as e:
+            logger.error("Error procesando el outbox de Bonita: %s", e)
+        # Si se llenó el lote puede haber más vencidos: se sigue sin esperar
+        if full_batch:
+            continue
+        try:
+            await asyncio.wait_for(_outbox_wakeup.wait(), timeout=poll_interval)
+        except asyncio.TimeoutError:
+            pass
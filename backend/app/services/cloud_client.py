@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import os
+import time
+import httpx
+from jose import jwt
+from app.core.exceptions import CloudAPIError
+from app.core.http_client import build_async_client, request_with_retry
+
+logger = logging.getLogger(__name__)
+
+
+class CloudClient:
+    """
+    Cliente HTTP del backend hacia la API cloud: un solo AsyncClient con
+    keep-alive para todo el proceso y el token de la cuenta de servicio
+    (CLOUD_USERNAME / CLOUD_PASSWORD) cacheado hasta poco antes de vencer.
+    """
+
+    def __init__(self):
+        self.base_url = os.getenv("CLOUD_URL", "http://cloud:10000")
+        self.username = os.getenv("CLOUD_USERNAME")
+        self.password = os.getenv("CLOUD_PASSWORD")
+        self.max_retries = int(os.getenv("CLOUD_MAX_RETRIES", "3"))
+        # Se renueva el token este margen antes del exp, para no mandarlo vencido
+        self.token_margin = float(os.getenv("CLOUD_TOKEN_MARGIN", "60"))
+        self.client = build_async_client(
+            max_connections=int(os.getenv("CLOUD_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("CLOUD_MAX_KEEPALIVE", "10")),
+            timeout=float(os.getenv("CLOUD_TIMEOUT", "10")),
+        )
+        self._token = None
+        self._token_expires_at = 0.0
+        self._login_lock = asyncio.Lock()
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        return await request_with_retry(
+            self.client, method, f"{self.base_url}{path}", max_retries=self.max_retries, **kwargs
+        )
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        if response.is_error:
+            raise CloudAPIError(response.status_code, str(response.url), response.text)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def login(self, username: str, password: str) -> str:
+        """Login OAuth2 (form) contra /auth/login; devuelve el access_token"""
+        response = await self._request(
+            "POST", "/auth/login", data={"username": username, "password": password, "grant_type": "password"}
+        )
+        self._raise_for_status(response)
+        return response.json()["access_token"]
+
+    async def _service_token(self) -> str:
+        if self._token and time.time() < self._token_expires_at - self.token_margin:
+            return self._token
+        # Varios requests con el token vencido hacen un solo login
+        async with self._login_lock:
+            if self._token and time.time() < self._token_expires_at - self.token_margin:
+                return self._token
+            if not self.username or not self.password:
+                raise CloudAPIError(401, f"{self.base_url}/auth/login", "Faltan CLOUD_USERNAME / CLOUD_PASSWORD")
+            token = await self.login(self.username, self.password)
+            # Solo se lee el exp; la firma la valida el cloud
+            self._token_expires_at = float(jwt.get_unverified_claims(token).get("exp", 0))
+            self._token = token
+            logger.info("Token de cloud renovado, vence en %.0fs", self._token_expires_at - time.time())
+            return token
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Request autenticado con la cuenta de servicio; ante un 401 renueva el token y reintenta una vez"""
+        token = await self._service_token()
+        response = await self._request(method, path, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+        if response.status_code == 401:
+            if self._token == token:
+                self._token = None
+            token = await self._service_token()
+            response = await self._request(method, path, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+        self._raise_for_status(response)
+        return response
+
+    async def store_project(self, project: dict) -> dict:
+        response = await self.request("POST", "/api/projects/store_projects", json=project)
+        return response.json()
+
+    async def store_projects(self, projects: list[dict]) -> list[int]:
+        """Guarda el lote completo en una sola transacción del cloud; devuelve los ids en el mismo orden"""
+        response = await self.request("POST", "/api/projects/store_projects_batch", json={"projects": projects})
+        return response.json()["project_ids"]
+
+    async def get_ongs_and_collaborations(self) -> list:
+        response = await self.request("GET", "/api/stats/ongs-and-collaborations")
+        return response.json()
+
+
+cloud_client = CloudClient()
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.idempotency_key import IdempotencyKey
+from app.repositories.idempotency_key_repository import IdempotencyKeyRepository
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(body) -> str:
+    return hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class IdempotencyService:
+    """
+    Idempotency-Key para POST que no deben repetirse. `begin` reserva la key
+    antes de hacer el trabajo; el servicio que hace el trabajo llama a
+    `complete` en su misma transacción, y a `release` si falla, para que el
+    cliente pueda reintentar.
+    """
+
+    def __init__(self, db: Session):
+        self.repo = IdempotencyKeyRepository(db)
+        self.lock_seconds = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+        self.ttl_seconds = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+
+    def begin(self, user_id: int, endpoint: str, key: str, body) -> IdempotencyKey:
+        """
+        Devuelve la key reservada (status processing) para hacer el trabajo,
+        o la ya completada (status completed) para devolver su respuesta.
+        """
+        request_hash = request_fingerprint(body)
+        entry = self.repo.get(user_id, endpoint, key)
+        now = datetime.utcnow()
+        if entry is not None and entry.expires_at <= now:
+            if not self.repo.delete_expired(entry.id, now):
+                # Otro request la borró primero y la está reservando
+                raise self._in_progress()
+            entry = None
+        if entry is None:
+            try:
+                return self.repo.reserve(user_id, endpoint, key, request_hash, self.lock_seconds, self.ttl_seconds)
+            except IntegrityError:
+                # Otro request con la misma key la reservó entre el get y el insert
+                self.repo.db.rollback()
+                raise self._in_progress()
+        if entry.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=f"La {IDEMPOTENCY_KEY_HEADER} ya se usó con otro cuerpo de request.",
+            )
+        if entry.status == "completed":
+            return entry
+        if entry.locked_until > now:
+            raise self._in_progress()
+        # El request que la reservó murió sin completarla: se retoma, pero solo
+        # uno de los reintentos que llegan juntos gana el UPDATE condicional
+        if not self.repo.take_over(entry.id, now, now + timedelta(seconds=self.lock_seconds)):
+            raise self._in_progress()
+        return entry
+
+    def complete(self, entry: IdempotencyKey, response_body, response_status: int = 200) -> None:
+        self.repo.complete(entry, response_status, response_body)
+
+    def release(self, entry: IdempotencyKey) -> None:
+        """El trabajo falló (ya con rollback): se borra la reserva para permitir el reintento"""
+        self.repo.delete(entry)
+
+    @staticmethod
+    def _in_progress() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Hay un request en curso con esta {IDEMPOTENCY_KEY_HEADER}.",
+            headers={"Retry-After": "1"},
+        )
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.bonita_integration.bonita_api import bonita
+from app.core.database import run_in_session
+from app.repositories.kpi_snapshot_repository import KpiSnapshotRepository
+
+logger = logging.getLogger(__name__)
+
+# Evita que el refresher de fondo y un ?fresh=true procesen los mismos casos a la vez
+_refresh_lock = asyncio.Lock()
+
+
+def _parse_end_date(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S.%f")
+    except ValueError:
+        logger.warning("Formato inválido de end_date: %s", value)
+        return None
+
+
+class KpiSnapshotService:
+    """
+    Mantiene la tabla kpi_case_snapshots con un registro por caso archivado
+    del proceso de gestión, para no recalcular el indicador contra Bonita
+    en cada request. Las consultas corren en un thread y no retienen la
+    conexión mientras se espera a Bonita.
+    """
+
+    def __init__(self, db: Session):
+        self.bonita = bonita
+        self.snapshot_repo = KpiSnapshotRepository(db)
+        self.process_name = "Proceso de gestion de proyecto"
+        self.concurrency = int(os.getenv("BONITA_FANOUT_CONCURRENCY", "8"))
+
+    async def refresh(self) -> int:
+        """Procesa solo los casos archivados posteriores al watermark. Devuelve cuántos guardó."""
+        async with _refresh_lock:
+            process_id = await self.bonita.get_process_id_by_name(self.process_name)
+            if not process_id:
+                logger.warning("No process_id disponible — no se actualiza el snapshot.")
+                return 0
+            process_id = str(process_id)
+            db = self.snapshot_repo.db
+            watermark = await run_in_session(db, self.snapshot_repo.get_watermark, process_id)
+
+            # Del más nuevo al más viejo: se corta al llegar al watermark
+            rows = []
+            async for page in self.bonita.iter_archived_cases(process_id, order="end_date DESC"):
+                candidates = []
+                reached_watermark = False
+                for case in page:
+                    end_date = _parse_end_date(case.get("end_date"))
+                    # Se incluye el propio watermark por si hay casos con el mismo end_date
+                    if watermark and end_date and end_date < watermark:
+                        reached_watermark = True
+                        break
+                    candidates.append((case, end_date))
+
+                known_ids = await run_in_session(db, self.snapshot_repo.get_known_ids, [str(case.get("id")) for case, _ in candidates])
+                rows += await self._evaluate_many(process_id, [
+                    (str(case.get("id")), case.get("sourceObjectId"), end_date)
+                    for case, end_date in candidates
+                    if str(case.get("id")) not in known_ids
+                ])
+                if reached_watermark:
+                    break
+
+            # Reintenta los casos cuya variable no se pudo leer en refrescos anteriores
+            rows += await self._evaluate_many(process_id, await run_in_session(db, self._undetermined_cases, process_id))
+
+            try:
+                await run_in_session(db, self.snapshot_repo.save_all, rows)
+            except IntegrityError:
+                # Otro worker guardó los mismos casos: se toman en el próximo refresco
+                logger.warning("Conflicto guardando snapshot de KPIs, se reintenta en el próximo ciclo.")
+                return 0
+            logger.info("Snapshot de KPIs actualizado: %s casos", len(rows))
+            return len(rows)
+
+    def _undetermined_cases(self, process_id: str) -> list[tuple]:
+        return [
+            (snapshot.id, snapshot.source_case_id, snapshot.end_date)
+            for snapshot in self.snapshot_repo.get_undetermined(process_id)
+        ]
+
+    async def _evaluate_many(self, process_id: str, cases: list[tuple]) -> list[dict]:
+        """Lee las variables de varios casos en paralelo, con a lo sumo `concurrency` requests a la vez"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def evaluate(case: tuple) -> dict:
+            async with semaphore:
+                return await self._evaluate_case(process_id, *case)
+
+        return await asyncio.gather(*(evaluate(case) for case in cases))
+
+    async def _evaluate_case(self, process_id: str, archived_id: str, source_case_id, end_date: datetime | None) -> dict:
+        row = {
+            "id": archived_id,
+            "process_id": process_id,
+            "source_case_id": str(source_case_id) if source_case_id else None,
+            "end_date": end_date,
+            "project_end_date": None,
+            "on_time": False,
+            "refreshed_at": datetime.utcnow(),
+        }
+        if not end_date or not source_case_id:
+            logger.warning("ArchivedCase sin end_date o sourceObjectId, id=%s", archived_id)
+            return row
+
+        # Leer variable project_end_date del case original
+        try:
+            var = await self.bonita.get_variable_from_archived_case(source_case_id, "project_end_date")
+        except Exception as e:
+            logger.error("Error leyendo variable project_end_date del caso %s: %s", source_case_id, e)
+            row["on_time"] = None
+            return row
+
+        project_end_date_str = var.get("value")
+        if not project_end_date_str:
+            return row
+        try:
+            project_end_date = datetime.strptime(project_end_date_str, "%Y-%m-%d").date()
+        except ValueError:
+            logger.warning("Formato inválido de project_end_date: %s", project_end_date_str)
+            return row
+        row["project_end_date"] = project_end_date
+        # Caso exitoso si se completó antes o en la fecha límite
+        row["on_time"] = end_date.date() <= project_end_date
+        return row
+
+    async def get_successful_on_time_avg(self) -> float:
+        # Solo los casos de la definición actual, como el cálculo contra Bonita
+        process_id = await self.bonita.get_process_id_by_name(self.process_name)
+        if not process_id:
+            return 0.0
+        total_cases, successful_cases = await run_in_session(
+            self.snapshot_repo.db, self.snapshot_repo.get_on_time_summary, str(process_id)
+        )
+        if total_cases == 0:
+            return 0.0
+        return (successful_cases / total_cases) * 100
+
@@ -1,10 +1,10 @@
 from app.services.project_service import ProjectService
 from sqlalchemy.orm import Session
 from app.bonita_integration.bonita_api import bonita
+from app.core.database import run_in_session
 from app.schemas.observation_schema import ObservationBase, ObservationResponse
 from app.repositories.observation_repository import ObservationRepository
-from datetime import date
-import time
+from datetime import date, datetime
 
 
 class ObservationService:
@@ -14,47 +14,42 @@ class ObservationService:
         self.project_service = ProjectService(db)
         self.process_name = "Proceso de control sobre proyecto"
 
-    def send_observation_to_bonita(self, observation: ObservationBase, current_user) -> dict:
-        try:
-            process_id = self.bonita.get_process_id_by_name(self.process_name)
-            time.sleep(1)
-            case_id = self.bonita.initiate_process(process_id).get("caseId")
-            time.sleep(1)
-            task_id = self.bonita.start_human_tasks(case_id)[0].get("id")
-            self.bonita.assign_task(task_id)
-            self.bonita.send_form_data(task_id, {
-                "inputObservations": {
-                    "observationContent": observation.content,
-                    "projectName": observation.project_name,
-                    "observationCreatedAt": date.today().strftime("%Y-%m-%d"),
-                    "userId": current_user.id,
-                    "ongId": observation.ong_id
-                }
-            })
-            project = self.project_service.get_project_by_name(observation.project_name)
-            obs = {
-                "content": observation.content,
-                "project_id": project.id,
-                "created_at": date.today().strftime("%Y-%m-%d"),
-                "user_id": current_user.id,
-                "case_id": case_id
+    async def send_observation_to_bonita(self, observation: ObservationBase, current_user) -> dict:
+        process_id = await self.bonita.get_process_id_by_name(self.process_name)
+        case_id = (await self.bonita.initiate_process(process_id)).get("caseId")
+        task_id = (await self.bonita.wait_for_human_tasks(case_id))[0].get("id")
+        await self.bonita.assign_task(task_id)
+        await self.bonita.send_form_data(task_id, {
+            "inputObservations": {
+                "observationContent": observation.content,
+                "projectName": observation.project_name,
+                "observationCreatedAt": date.today().strftime("%Y-%m-%d"),
+                "userId": current_user.id,
+                "ongId": observation.ong_id
             }
-            self.obs_repo.create(obs)
-            return {"case_id": case_id}
-        except Exception:
-            self.obs_repo.db.rollback()
-            raise
+        })
+        await run_in_session(self.obs_repo.db, self._save_observation, observation, current_user.id, case_id)
+        return {"case_id": case_id}
+
+    def _save_observation(self, observation: ObservationBase, user_id: int, case_id) -> None:
+        project = self.project_service.get_project_by_name(observation.project_name)
+        self.obs_repo.create({
+            "content": observation.content,
+            "project_id": project.id,
+            "created_at": datetime.combine(date.today(), datetime.min.time()),
+            "user_id": user_id,
+            "case_id": case_id
+        })
+
+    def _get_case_id(self, observation_id: int):
+        return self.obs_repo.get_by_id(observation_id).case_id
 
-    def accept_observation(self, observation_id: int, current_user) -> dict:
-        case_id = self.obs_repo.get_by_id(observation_id).case_id
-        tasks = self.bonita.start_human_tasks(case_id)
-        time.sleep(1)
-        if not tasks:
-            raise Exception(f"No hay tareas humanas disponibles para el caso {case_id}")
+    async def accept_observation(self, observation_id: int, current_user) -> dict:
+        case_id = await run_in_session(self.obs_repo.db, self._get_case_id, observation_id)
+        tasks = await self.bonita.wait_for_human_tasks(case_id)
         next_task_id = tasks[0]["id"]
-        time.sleep(1)
-        self.bonita.assign_task(next_task_id)
-        self.bonita.send_form_data(next_task_id, {
+        await self.bonita.assign_task(next_task_id)
+        await self.bonita.send_form_data(next_task_id, {
             "acceptObservationInput": {
                 "acceptObservationId": observation_id,
                 "acceptObservationDate": date.today().strftime("%Y-%m-%d"),
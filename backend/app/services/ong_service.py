@@ -1,4 +1,6 @@
+from typing import Optional
 from sqlalchemy.orm import Session
+from app.core.pagination import Page
 from fastapi import HTTPException, status
 from app.repositories.ong_repository import OngRepository
 from app.schemas.ong_schema import OngCreate, OngResponse
@@ -8,8 +10,8 @@ class OngService:
     def __init__(self, db: Session):
         self.ong_repo = OngRepository(db)
 
-    def get_ongs(self) -> list[OngResponse]:
-        return self.ong_repo.get_all()
+    def get_ongs(self, limit: int, after: Optional[tuple] = None) -> Page:
+        return self.ong_repo.get_page(limit, after)
 
     def create_ong(self, ong_data: OngCreate) -> OngResponse:
         ong_dict = ong_data.model_dump()
@@ -1,20 +1,23 @@
 from typing import Optional
 from urllib.parse import unquote_plus
 from sqlalchemy.orm import Session
+from app.core.pagination import Page
 from app.repositories.project_repository import ProjectRepository
 from app.schemas.project_schema import ProjectCreate, ProjectResponse
 from app.schemas.user_schema import UserResponse
 from app.services.task_service import TaskService
+from app.services.bonita_outbox_service import BonitaOutboxService, notify_outbox
+from app.services.idempotency_service import IdempotencyService
+from app.models.idempotency_key import IdempotencyKey
 from app.models.project import Project
-from app.bonita_integration.bonita_api import bonita
-import time
 
 
 class ProjectService:
     def __init__(self, db: Session):
         self.project_repo = ProjectRepository(db)
         self.task_service = TaskService(db)
-        self.bonita = bonita
+        self.outbox_service = BonitaOutboxService(db)
+        self.idempotency_service = IdempotencyService(db)
         self.process_name = "Proceso de gestion de proyecto"
 
     def get_project(self, project_id: int) -> ProjectResponse | None:
@@ -23,15 +26,15 @@ class ProjectService:
             raise Exception(f"No existe un proyecto con id={project_id}.")
         return project
 
-    def get_projects(self, user: Optional[UserResponse] = None) -> list[ProjectResponse]:
+    def get_projects(self, user: UserResponse, limit: int, after: Optional[tuple] = None) -> Page[ProjectResponse]:
         user_ong_ids = {ong.id for ong in user.ongs}
         if not user_ong_ids:
-            return []
-        projects = self.project_repo.get_projects_with_tasks_by_owner_ids(list(user_ong_ids))
-        return [ProjectResponse.model_validate(p) for p in projects]
+            return Page(items=[])
+        page = self.project_repo.get_projects_with_tasks_by_owner_ids(list(user_ong_ids), limit, after)
+        return Page(items=[ProjectResponse.model_validate(p) for p in page.items], next_after=page.next_after)
 
-    def get_projects_with_status(self, status: str) -> list[ProjectResponse]:
-        return self.project_repo.get_by_status(status)
+    def get_projects_with_status(self, status: str, limit: int, after: Optional[tuple] = None) -> Page:
+        return self.project_repo.get_by_status(status, limit, after)
 
     def get_project_by_name(self, name: str) -> Optional[ProjectResponse]:
         project = self.project_repo.get_project_by_name(name)
@@ -39,7 +42,12 @@ class ProjectService:
             return ProjectResponse.model_validate(project)
         return None
 
-    def create_project(self, project_data: ProjectCreate) -> ProjectResponse:
+    def create_project(self, project_data: ProjectCreate, idempotency_entry: IdempotencyKey | None = None) -> ProjectResponse:
+        """
+        Guarda el proyecto y su envío a Bonita en una sola transacción. La
+        entrega la hace el worker del outbox, que completa bonita_case_id.
+        Con idempotency_entry la respuesta se guarda en esa misma transacción.
+        """
         try:
             project_dict = project_data.model_dump(exclude={"tasks"})
             project = Project(**project_dict)
@@ -50,24 +58,22 @@ class ProjectService:
 
             if not cloud_tasks:
                 project.status = "execution"
-            case_id = self._send_to_bonita(project_data, cloud_tasks) 
+            self.outbox_service.enqueue(project.id, self.process_name, self._build_bonita_payload(project_data, cloud_tasks))
+            if idempotency_entry is not None:
+                self.idempotency_service.complete(idempotency_entry, ProjectResponse.model_validate(project).model_dump(mode="json"))
 
-            project.bonita_case_id = case_id
-            self.project_repo.db.commit() 
+            self.project_repo.db.commit()
             self.project_repo.db.refresh(project)
-
-            return project
         except Exception:
             self.project_repo.db.rollback()
+            if idempotency_entry is not None:
+                self.idempotency_service.release(idempotency_entry)
             raise
+        notify_outbox()
+        return project
 
-    def _send_to_bonita(self, project_data: ProjectCreate, cloud_tasks: list[dict]) -> str:
-        """Envía el proyecto y sus tareas a Bonita"""
-        process_id = self.bonita.get_process_id_by_name(self.process_name)
-        case_id = self.bonita.initiate_process(process_id).get("caseId")
-        time.sleep(1)
-        task_id = self.bonita.start_human_tasks(case_id)[0].get("id")
-        self.bonita.assign_task(task_id)
+    def _build_bonita_payload(self, project_data: ProjectCreate, cloud_tasks: list[dict]) -> dict:
+        """Formulario de la primera tarea humana del proceso de gestión"""
         tasks_bonita = [
             {
                 "task_title": task["title"],
@@ -80,8 +86,7 @@ class ProjectService:
             }
             for task in cloud_tasks
         ]
-
-        self.bonita.send_form_data(task_id, {
+        return {
             "projectDataInput": {
                 "project_name": project_data.name,
                 "project_description": project_data.description,
@@ -91,5 +96,4 @@ class ProjectService:
                 "project_status": project_data.status,
                 "project_owner_id": project_data.owner_id
             }
-        })
-        return case_id
+        }
@@ -1,29 +1,36 @@
 from app.bonita_integration.bonita_api import bonita
 from app.services.project_service import ProjectService
 from app.services.ong_service import OngService
+from app.services.kpi_snapshot_service import KpiSnapshotService
 from sqlalchemy.orm import Session
-# from app.services.cloud_client import cloud_client
-from datetime import datetime
+from app.services.cloud_client import cloud_client
 from app.schemas.stats_schema import StatsResponse
-import time
+from app.core.database import SessionLocal, run_in_session
+from app.core.scheduler import KpiScheduler
+import asyncio
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+SUCCESSFUL_ON_TIME_AVG = "successful_on_time_avg"
+PERCENT_NO_COLLABORATION_NEEDED = "percent_no_collaboration_needed"
+ONGS_AND_TASKS = "ongs_and_tasks"
+
 
 class StatsService:
 
     def __init__(self, db: Session):
         self.bonita = bonita
-        # cloud client has to get data from api and may be necessary to create new endpoints
-        # self.cloud_client = cloud_client
+        self.cloud_client = cloud_client
         self.project_service = ProjectService(db)
         self.ong_service = OngService(db)
+        self.kpi_snapshot_service = KpiSnapshotService(db)
         self.process_name = "Proceso de gestion de proyecto"
         self.process_id = None
 
     # este método pedorro no anda bien... 
-    def _ensure_process_id(self):
+    async def _ensure_process_id(self):
             """
             Obtiene y guarda el process_id.
             Si falla → log + mantiene process_id = None.
@@ -33,99 +40,31 @@ class StatsService:
 
             try:
                 logger.info("Buscando process_id para '%s'...", self.process_name)
-                self.process_id = self.bonita.get_process_id_by_name(self.process_name)
-                time.sleep(2)  # Le da tiempo a Bonita para actualizar
+                self.process_id = await self.bonita.get_process_id_by_name(self.process_name)
                 logger.info("process_id obtenido: %s", self.process_id)
             except Exception as e:
                 logger.error("Error obteniendo process_id de Bonita: %s", e)
                 self.process_id = None
 
-    # andando bien
-    def get_successful_on_time_avg(self) -> float:
-        # self._ensure_process_id()
-        self.process_id = self.bonita.get_process_id_by_name(self.process_name)
-        time.sleep(2)  # Le da tiempo a Bonita para actualizar
-        if not self.process_id:
-            logger.warning("No process_id disponible — retornando 0.")
-            return 0.0
-
-        try:
-            # Obtener todos los archivedCases del proceso ANDA
-            archived_cases = self.bonita.get_archived_cases(self.process_id)
-            time.sleep(1)
-            logger.info("Archived cases recuperados: %s", len(archived_cases))
-        except Exception as e:
-            logger.error("Error consultando archived_cases: %s", e)
-            raise
-
-        # Filtrar solo los casos archivados COMPLETADOS del proceso
-        completed_cases = [
-            c for c in archived_cases
-            if str(c.get("processDefinitionId")) == str(self.process_id)
-            and c.get("state") == "completed"
-        ]
-
-        total_cases = len(completed_cases)
-        logger.info("Total de casos completados: %s", total_cases)
-        if total_cases == 0:
-            return 0.0
-
-        successful_cases = 0
-
-        for case in completed_cases:
-            end_date_str = case.get("end_date")
-            if not end_date_str:
-                continue
-
-            # Parse end_date del archivedCase
-            try:
-                case_end_date = datetime.strptime(end_date_str, "%Y-%m-%d %H:%M:%S.%f")
-            except ValueError:
-                logger.warning("Formato inválido de end_date: %s", end_date_str)
-                continue
-
-            # Obtener sourceObjectId = ID ORIGINAL del caso en ejecución
-            original_case_id = case.get("sourceObjectId")
-            if not original_case_id:
-                logger.warning("ArchivedCase sin sourceObjectId, id=%s", case.get("id"))
-                continue
-
-            # Leer variable project_end_date del case original
-            try:
-                var = self.bonita.get_variable_from_archived_case(original_case_id, "project_end_date")
-                time.sleep(1)
-            except Exception as e:
-                logger.error("Error leyendo variable project_end_date del caso %s: %s",
-                            original_case_id, e)
-                continue
-
-            project_end_date_str = var.get("value")
-            if not project_end_date_str:
-                continue
-
-            project_end_date = datetime.strptime(project_end_date_str, "%Y-%m-%d")
-
-            # Caso exitoso si se completó antes o en la fecha límite
-            if case_end_date.date() <= project_end_date.date():
-                successful_cases += 1
-
-        result = (successful_cases / total_cases) * 100
+    # Lee el snapshot precalculado; con fresh=True primero procesa los casos nuevos
+    async def get_successful_on_time_avg(self, fresh: bool = False) -> float:
+        if fresh:
+            await self.kpi_snapshot_service.refresh()
+        result = await self.kpi_snapshot_service.get_successful_on_time_avg()
         logger.info("Promedio de casos exitosos (on time): %.2f%%", result)
         return result
 
 
-    def get_percent_no_collaboration_needed(self) -> float:
-        # Calcula el porcentaje de proyectos (casos) que no necesitaron colaboraciones de otras ONG
-        self.process_id = self.bonita.get_process_id_by_name(self.process_name)
-        time.sleep(2)  # Le da tiempo a Bonita para actualizar
+    async def get_percent_no_collaboration_needed(self) -> dict:
+        # Calcula el porcentaje de proyectos (casos) que no necesitaron colaboraciones de otras ONG.
+        # Los dos totales se cuentan del lado del servidor (Bonita y la base), sin traer filas.
+        self.process_id = await self.bonita.get_process_id_by_name(self.process_name)
         if not self.process_id:
             logger.warning("No process_id disponible — retornando 0.")
             return 0.0
         try:
-            # Total proyectos archivados/cerrados en estado completed
-            total_projects = self.bonita.get_archived_cases(self.process_id)
-            time.sleep(1)
-            total_projects = len([c for c in total_projects if c.get("state") == "completed"])
+            # Total proyectos archivados/cerrados en estado completed (filtrado en Bonita)
+            total_projects = await self.bonita.count_archived_cases(self.process_id, state="completed")
             logger.info("Total de proyectos cerrados: %s", total_projects)
         except Exception as e:
             logger.error("Error consultando count_closed_cases: %s", e)
@@ -137,7 +76,8 @@ class StatsService:
                 "percent": 0.0
             }
         try:
-            projects_no_collab = len(self.project_service.project_repo.get_projects_solved_without_collaboration())
+            project_repo = self.project_service.project_repo
+            projects_no_collab = await run_in_session(project_repo.db, project_repo.count_projects_solved_without_collaboration)
             logger.info("Proyectos sin colaboración: %s", projects_no_collab)
         except Exception as e:
             logger.error("Error obteniendo proyectos sin colaboración: %s", e)
@@ -150,3 +90,37 @@ class StatsService:
         # Retorna una lista de elementos con cada ong y la cantidad de tareas resueltas 
         return self.ong_service.get_ongs_with_self_resolved_tasks()
 
+
+# Indicadores del dashboard: se calculan en segundo plano (ver main.lifespan) y
+# los endpoints los sirven desde memoria. Cada cálculo abre su propia sesión.
+stats_kpis = KpiScheduler(max_age=float(os.getenv("KPI_MAX_AGE", "600")))
+
+
+async def _successful_on_time_avg() -> float:
+    db = SessionLocal()
+    try:
+        return await StatsService(db).get_successful_on_time_avg(fresh=True)
+    finally:
+        db.close()
+
+
+async def _percent_no_collaboration_needed() -> dict:
+    db = SessionLocal()
+    try:
+        return await StatsService(db).get_percent_no_collaboration_needed()
+    finally:
+        db.close()
+
+
+def _ongs_and_tasks() -> list:
+    db = SessionLocal()
+    try:
+        return StatsService(db).get_ongs_and_tasks_resolved()
+    finally:
+        db.close()
+
+
+stats_kpis.register(SUCCESSFUL_ON_TIME_AVG, _successful_on_time_avg)
+stats_kpis.register(PERCENT_NO_COLLABORATION_NEEDED, _percent_no_collaboration_needed)
+# Solo consulta la base: corre en un thread para no frenar el event loop
+stats_kpis.register(ONGS_AND_TASKS, lambda: asyncio.to_thread(_ongs_and_tasks))
@@ -4,7 +4,7 @@ from app.repositories.task_repository import TaskRepository
 from app.schemas.task_schema import TaskCreate
 from app.services.ong_service import OngService
 from app.bonita_integration.bonita_api import bonita
-import time
+from app.core.database import run_in_session
 
 
 class TaskService:
@@ -43,48 +43,41 @@ class TaskService:
         if not id_task:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No existe una tarea con id={task_id}.",)
 
-    def commit_task_to_ong(self, task_id: int, ong_id: int, project_id: int) -> None:
+    async def commit_task_to_ong(self, task_id: int, ong_id: int, project_id: int) -> None:
         # project_id: debe ser el project_id de local
         # task_id: corresponde a la task en cloud
         # ong_id: ongs iguales en cloud y local
-        from app.services.project_service import ProjectService
-        self.project_service = ProjectService(self.task_repo.db)
-        case_id = self.project_service.get_project(project_id).bonita_case_id
-        try:
-            self._send_to_bonita(case_id, {
-                "compromiseInput": {
-                    "compromise_task_id": task_id,
-                    "compromise_ong_id": ong_id,
-                }
-            })
-        except Exception:
-            self.task_repo.db.rollback()
-            raise
+        case_id = await run_in_session(self.task_repo.db, self._get_case_id, project_id)
+        await self._send_to_bonita(case_id, {
+            "compromiseInput": {
+                "compromise_task_id": task_id,
+                "compromise_ong_id": ong_id,
+            }
+        })
 
-    def select_ong_for_task(self, task_id: int, ong_id: int, project_id: int) -> None:
+    async def select_ong_for_task(self, task_id: int, ong_id: int, project_id: int) -> None:
         # project_id: debe ser el project_id de local
         # task_id: corresponde a la task en cloud
         # ong_id: ongs iguales en cloud y local
+        case_id = await run_in_session(self.task_repo.db, self._get_case_id, project_id)
+        await self._send_to_bonita(case_id, {
+            "selectCompromiseInput": {
+                "select_comp_task_id": task_id,
+                "select_comp_ong_id": ong_id,
+            }
+        })
+
+    def _get_case_id(self, project_id: int) -> str:
         from app.services.project_service import ProjectService
         self.project_service = ProjectService(self.task_repo.db)
         case_id = self.project_service.get_project(project_id).bonita_case_id
-        try:
-            self._send_to_bonita(case_id, {
-                "selectCompromiseInput": {
-                    "select_comp_task_id": task_id,
-                    "select_comp_ong_id": ong_id,
-                }
-            }) 
-        except Exception:
-            self.task_repo.db.rollback()
-            raise
+        if not case_id:
+            # El worker del outbox todavía no entregó el proyecto a Bonita
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"El proyecto {project_id} todavía no fue registrado en Bonita, reintente en unos segundos.")
+        return case_id
 
-    def _send_to_bonita(self, case_id: int, payload: dict) -> None:
-        tasks = self.bonita.start_human_tasks(case_id)
-        time.sleep(1)
-        if not tasks:
-            raise Exception(f"No hay tareas humanas disponibles para el caso {case_id}")
+    async def _send_to_bonita(self, case_id: int, payload: dict) -> None:
+        tasks = await self.bonita.wait_for_human_tasks(case_id)
         next_task_id = tasks[0]["id"]
-        time.sleep(1)
-        self.bonita.assign_task(next_task_id)
-        self.bonita.send_form_data(next_task_id, payload)
+        await self.bonita.assign_task(next_task_id)
+        await self.bonita.send_form_data(next_task_id, payload)
@@ -1,19 +1,30 @@
 import app.repositories.user_repository as user_repo
 from sqlalchemy.orm import Session
 from app.schemas.user_schema import UserCreate, UserResponse
-from passlib.context import CryptContext
 from typing import Optional
 from fastapi import HTTPException, status
 from app.schemas.ong_schema import OngResponse
 from sqlalchemy.exc import IntegrityError
 from app.repositories.ong_repository import OngRepository
 from app.repositories.user_ong_repository import UserOngRepository
+from app.core.cache import TTLCache
+from app.core.database import run_in_session
+from app.core.pagination import Page
+from app.core.security import hash_password, verify_password
 import logging
-from app.bonita_integration.bonita_api import bonita
 import os
 
 logger = logging.getLogger(__name__)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# UserResponse ya validados por get_current_user, por (sub, exp) del token
+current_user_cache = TTLCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "30")),
+)
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    current_user_cache.invalidate_where(lambda key, user: user.id == user_id)
 
 
 class UserService:
@@ -21,11 +32,10 @@ class UserService:
         self.user_repo = user_repo.UserRepository(db)
         self.ong_repo = OngRepository(db)
         self.user_ong_repo = UserOngRepository(db)
-        self.bonita = bonita
 
-    def get_all_users(self, skip: int = 0, limit: int = 100) -> list[UserResponse]:
-        users = self.user_repo.get_all(skip=skip, limit=limit)
-        return [UserResponse.model_validate(user) for user in users]
+    def get_users_page(self, limit: int, after: Optional[tuple] = None) -> Page[UserResponse]:
+        page = self.user_repo.get_page(limit, after)
+        return Page(items=[UserResponse.model_validate(user) for user in page.items], next_after=page.next_after)
 
     def get_user_by_id(self, user_id: int) -> Optional[UserResponse]:
         user = self.user_repo.get_by_id(user_id)
@@ -45,16 +55,16 @@ class UserService:
             return UserResponse.model_validate(user)
         return None
 
-    def create_user(self, user_data: UserCreate) -> UserResponse:
+    async def create_user(self, user_data: UserCreate) -> UserResponse:
         print(f"Contraseña recibida: {user_data.password!r} (tipo: {type(user_data.password)})")
-        hashed_password = pwd_context.hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         user_dict = user_data.model_dump()
         user_dict["hashed_password"] = hashed_password
         user_dict.pop("password", None) 
         try:
-            new_user = self.user_repo.create(user_dict)
+            new_user = await run_in_session(self.user_repo.db, self._insert_user, user_dict)
             logger.info(f"Usuario creado: {new_user.id}")
-            return UserResponse.model_validate(new_user)
+            return new_user
         except IntegrityError as e:
             if 'UNIQUE constraint failed: users.username' in str(e.orig):
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El nombre de usuario ya está en uso.")
@@ -63,12 +73,20 @@ class UserService:
             else:
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error al crear el usuario.")
 
-    def authenticate_user(self, username: str, password: str) -> Optional[UserResponse]:
+    def _insert_user(self, user_dict: dict) -> UserResponse:
+        return UserResponse.model_validate(self.user_repo.create(user_dict))
+
+    def _load_credentials(self, username: str) -> Optional[tuple[UserResponse, str]]:
         user = self.user_repo.get_by_username(username)
-        if user and pwd_context.verify(password, user.hashed_password):
-            user = UserResponse.model_validate(user)
-            self.bonita.login(username, "bpm")
-            return user
+        return (UserResponse.model_validate(user), user.hashed_password) if user else None
+
+    async def authenticate_user(self, username: str, password: str) -> Optional[UserResponse]:
+        # La conexión vuelve al pool antes de esperar al hash (~250 ms): un pico de
+        # logins no agota el pool ni bloquea el loop en el checkout
+        credentials = await run_in_session(self.user_repo.db, self._load_credentials, username)
+        if credentials and await verify_password(password, credentials[1]):
+            # La sesión de Bonita se abre recién cuando el usuario la necesita (BonitaClient.get_session)
+            return credentials[0]
         else:
             return None
 
@@ -83,6 +101,7 @@ class UserService:
         if association:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El usuario ya pertenece a esta ONG.")
         self.user_ong_repo.create_association(user_id, ong_id)
+        invalidate_cached_user(user_id)
 
     def get_ongs_for_user(self, user_id: int) -> list[OngResponse]:
         user = self.user_repo.get_by_id(user_id)
@@ -102,6 +121,7 @@ class UserService:
         if not association:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El usuario no pertenece a esta ONG.")
         self.user_ong_repo.delete_association(user_id, ong_id)
+        invalidate_cached_user(user_id)
 
     def delete_user(self, user_id: int) -> bool:
         user = self.user_repo.get_by_id(user_id)
@@ -109,6 +129,7 @@ class UserService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                 detail="Usuario no encontrado.")
         self.user_repo.delete(user)
+        invalidate_cached_user(user_id)
         return True
 
     def toggle_is_manager(self, user_id: int) -> UserResponse:
@@ -117,4 +138,5 @@ class UserService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                 detail="Usuario no encontrado.")
         self.user_repo.update(user, {"is_manager": not user.is_manager})
+        invalidate_cached_user(user_id)
         return user
@@ -0,0 +1,75 @@
+"""
+Costo de leer el user_id de la sesión de Bonita en cada assign_task (un GET
+a /API/system/session/unusedId por tarea, como antes) contra usar el que
+BonitaClient guarda en la sesión al loguear.
+
+Corre contra el Bonita falso el mismo recorrido que una observación o un
+compromiso: instanciar el caso, esperar la tarea humana, asignarla y enviar
+el formulario.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_bonita_assign.py --flows 200 --latency-ms 20 --concurrency 1 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+from common import print_table, run_load
+from fake_bonita import FakeBonitaServer, FakeBonitaState
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", type=int, default=200, help="recorridos por modo y nivel de concurrencia")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--port", type=int, default=8089)
+    return parser.parse_args()
+
+
+async def run(args, state: FakeBonitaState) -> None:
+    from app.bonita_integration.bonita_client import BonitaClient
+
+    class UserIdPerTask(BonitaClient):
+        async def _get_current_user_id(self):
+            # Implementación anterior: un GET por cada assign_task
+            response = await self._request("GET", "/API/system/session/unusedId")
+            return response.json().get("user_id")
+
+    results, counts = [], []
+    for name, client in (("user_id por tarea", UserIdPerTask()), ("user_id en sesión", BonitaClient())):
+        process_id = await client.get_process_id_by_name("Proceso de control sobre proyecto")
+        await client.ensure_logged()  # el login queda fuera de la medición
+
+        async def flow(_: int) -> None:
+            case_id = (await client.initiate_process(process_id)).get("caseId")
+            task_id = (await client.wait_for_human_tasks(case_id))[0].get("id")
+            await client.assign_task(task_id)
+            await client.send_form_data(task_id, {"inputObservations": {"observationContent": "Observación"}})
+
+        for level in args.concurrency:
+            state.request_counts.clear()
+            results.append(await run_load(name, flow, args.flows, level))
+            counts.append((name, level, dict(state.request_counts)))
+        await client.aclose()
+
+    print_table(results)
+    print(f"\n{'modo':<22} {'conc':>5} {'unusedId/flujo':>15} {'requests/flujo':>15}")
+    for name, level, count in counts:
+        session_gets = count.get("GET /API/system/session/unusedId", 0)
+        print(f"{name:<22} {level:>5} {session_gets / args.flows:>15.2f} {sum(count.values()) / args.flows:>15.2f}")
+
+
+def main():
+    args = parse_args()
+    state = FakeBonitaState(latency_ms=args.latency_ms)
+    with FakeBonitaServer(state, port=args.port) as server:
+        os.environ["BONITA_URL"] = server.url
+        sys.path.insert(0, BACKEND_DIR)
+        asyncio.run(run(args, state))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Latencia y throughput de los endpoints del cloud que pasaron a AsyncSession
+(observaciones, compromisos, usuarios) bajo concurrencia, junto con un
+listado de proyectos que sigue en el threadpool como referencia.
+
+Levanta el cloud con uvicorn sobre una base SQLite temporal (o --database-url)
+sembrada por el propio script. Con --cloud-dir se mide otro checkout, por
+ejemplo el anterior al cambio:
+    git worktree add /tmp/cloud-before <commit>
+    python benchmarks/bench_cloud_async.py --cloud-dir /tmp/cloud-before/cloud
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_cloud_async.py --requests 400 --concurrency 1 16 64
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+import httpx
+from bench_flows import _check, _wait_for_http, login
+from common import LoadResult, print_table, run_load
+
+CLOUD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cloud")
+ENDPOINTS = ("me", "observations", "compromises", "save_observation", "projects")
+BENCH_USER = "bench"
+BENCH_PASSWORD = "Bench123!"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=200, help="requests por endpoint y nivel de concurrencia")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--cloud-dir", default=CLOUD_DIR, help="checkout del cloud a medir")
+    parser.add_argument("--cloud-port", type=int, default=8766)
+    parser.add_argument("--database-url", help="base descartable (por defecto SQLite temporal)")
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def seed(args) -> None:
+    """Corre dentro del checkout del cloud (ver local_cloud)"""
+    sys.path.insert(0, os.getcwd())
+    import app.main  # noqa: F401  crea las tablas
+    from app.core.database import SessionLocal
+    from app.core.security import pwd_context
+    from app.models.observation import Observation
+    from app.models.ong import Ong
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.task_ong import TaskOngAssociation
+    from app.models.user import User
+
+    db = SessionLocal()
+    today = date.today()
+    ongs = [Ong(name="ONG bench"), Ong(name="ONG ajena")]
+    user = User(username=BENCH_USER, email="bench@example.com", hashed_password=pwd_context.hash(BENCH_PASSWORD), ongs=[ongs[0]])
+    db.add_all(ongs + [user])
+    db.flush()
+    for i in range(args.projects):
+        project = Project(
+            name=f"Proyecto bench {i}", description="Proyecto del benchmark async", start_date=today,
+            end_date=today, owner_id=ongs[i % 2].id, status="active",
+        )
+        project.tasks = [
+            Task(title=f"Tarea {j}", necessity="Necesidad", quantity="1", start_date=today, end_date=today, resolves_by_itself=False)
+            for j in range(2)
+        ]
+        db.add(project)
+        db.flush()
+        db.add(TaskOngAssociation(task_id=project.tasks[0].id, ong_id=ongs[1].id, status="interested"))
+        db.add(Observation(project_id=project.id, user_id=user.id, content="Observación", created_at=datetime(2025, 1, 1) + timedelta(minutes=i)))
+    db.commit()
+    db.close()
+
+
+@contextmanager
+def local_cloud(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DATABASE_CLOUD_URL": args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"}
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--seed", "--projects", str(args.projects)],
+            cwd=args.cloud_dir, env=env, check=True,
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.cloud_port), "--log-level", "warning"],
+            cwd=args.cloud_dir,
+            env=env,
+        )
+        try:
+            url = f"http://127.0.0.1:{args.cloud_port}"
+            _wait_for_http(url)
+            yield url
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                # Una versión bloqueada en el pool no termina sola
+                process.kill()
+                process.wait()
+
+
+async def run(args, cloud_url: str) -> list[LoadResult]:
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=cloud_url, timeout=args.timeout, limits=limits) as client:
+        await login(client, BENCH_USER, BENCH_PASSWORD)
+        page = {"limit": args.page_size}
+
+        async def me(_: int) -> None:
+            await _check(await client.get("/users/me"))
+
+        async def observations(_: int) -> None:
+            await _check(await client.get("/api/observations/my_observations_ong", params=page))
+
+        async def compromises(_: int) -> None:
+            await _check(await client.get("/api/tasks/view_compromises", params=page))
+
+        async def save_observation(i: int) -> None:
+            await _check(await client.post("/api/observations/save_observation", json={
+                "content": f"Observación de benchmark {i}", "user_id": 1,
+                "project_name": f"Proyecto bench {i % args.projects}", "created_at": datetime.now().isoformat(),
+            }))
+
+        async def projects(_: int) -> None:
+            await _check(await client.get("/api/projects/my_projects", params=page))
+
+        senders = {
+            "me": me,
+            "observations": observations,
+            "compromises": compromises,
+            "save_observation": save_observation,
+            "projects": projects,
+        }
+        results = []
+        for endpoint in args.endpoints:
+            for level in args.concurrency:
+                results.append(await run_load(endpoint, senders[endpoint], args.requests, level))
+        return results
+
+
+def main():
+    args = parse_args()
+    if args.seed:
+        seed(args)
+        return
+    with local_cloud(args) as url:
+        print_table(asyncio.run(run(args, url)))
+
+
+if __name__ == "__main__":
+    main()
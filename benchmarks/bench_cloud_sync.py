@@ -0,0 +1,88 @@
+"""
+Sincronización de proyectos del backend al cloud con el CloudClient: un
+POST /api/projects/store_projects por proyecto contra un único POST a
+/api/projects/store_projects_batch con todo el lote.
+
+Levanta el cloud con uvicorn (ver bench_cloud_async.local_cloud) y usa el
+CloudClient del backend en este proceso, con la cuenta sembrada.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_cloud_sync.py --batch-sizes 10 100 500 --tasks 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date
+from bench_cloud_async import BENCH_PASSWORD, BENCH_USER, CLOUD_DIR, local_cloud
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--tasks", type=int, default=5, help="tareas por proyecto")
+    parser.add_argument("--cloud-port", type=int, default=8766)
+    parser.add_argument("--database-url", help="base descartable (por defecto SQLite temporal)")
+    args = parser.parse_args()
+    # Lo que espera local_cloud: el cloud de este checkout sembrado con un solo proyecto
+    args.cloud_dir, args.projects = CLOUD_DIR, 1
+    return args
+
+
+def projects_data(prefix: str, count: int, tasks: int) -> list[dict]:
+    today = date.today().isoformat()
+    return [
+        {
+            "name": f"{prefix} {i}", "description": "Proyecto sincronizado desde el backend", "start_date": today,
+            "end_date": today, "owner_id": 1,
+            "tasks": [
+                {"title": f"Tarea {j}", "necessity": "Necesidad", "quantity": "1", "start_date": today, "end_date": today, "resolves_by_itself": False}
+                for j in range(tasks)
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+async def run(args) -> None:
+    from app.services.cloud_client import CloudClient
+
+    client = CloudClient()
+    requests = [0]
+
+    async def count_request(request):
+        requests[0] += 1
+    client.client.event_hooks["request"].append(count_request)
+
+    async def one_by_one(projects: list[dict]) -> list[int]:
+        return [(await client.store_project(project))["id"] for project in projects]
+
+    await client.request("GET", "/users/me")  # login de la cuenta de servicio fuera de la medición
+    print(f"{'método':<14} {'proyectos':>9} {'requests':>9} {'ms':>9} {'ms/proyecto':>12}")
+    try:
+        for size in args.batch_sizes:
+            for name, store in (("uno por uno", one_by_one), ("lote", client.store_projects)):
+                projects = projects_data(f"{name} {size}", size, args.tasks)
+                requests[0] = 0
+                start = time.perf_counter()
+                ids = await store(projects)
+                elapsed = (time.perf_counter() - start) * 1000
+                assert len(ids) == size
+                print(f"{name:<14} {size:>9} {requests[0]:>9} {elapsed:>9.1f} {elapsed / size:>12.2f}")
+    finally:
+        await client.aclose()
+
+
+def main():
+    args = parse_args()
+    with local_cloud(args) as url:
+        os.environ.update({"CLOUD_URL": url, "CLOUD_USERNAME": BENCH_USER, "CLOUD_PASSWORD": BENCH_PASSWORD})
+        sys.path.insert(0, BACKEND_DIR)
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Latencia de punta a punta de los flujos que pasan por Bonita:
+POST /projects/create, /tasks/task_compromise y /observations/send_observation.
+La entrega de proyectos a Bonita la hace el outbox en segundo plano: su
+demora se informa aparte (métricas bonita_outbox_* de /debug/metrics).
+
+Por defecto levanta todo localmente: el Bonita falso en un thread y el
+backend con uvicorn sobre una base SQLite temporal (o --database-url).
+SQLite serializa las escrituras, así que para medir concurrencia real
+conviene pasar una base Postgres descartable. Con --backend-url se mide un
+backend ya levantado (que debe apuntar a un Bonita, real o falso, y tener
+DEBUG_ENDPOINTS=true para las métricas del outbox).
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_flows.py --requests 200 --concurrency 1 8 32 --latency-ms 20 --task-delay-ms 100
+    python benchmarks/bench_flows.py --backend-url http://localhost:8000 --username bench --password 'Bench123!'
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from urllib.parse import quote
+from contextlib import contextmanager
+import httpx
+from common import LoadResult, print_table, run_load
+from fake_bonita import FakeBonitaServer, add_state_arguments, state_from_args
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+FLOWS = ("create_project", "task_compromise", "send_observation")
+BENCH_PASSWORD = "Bench123!"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", nargs="+", choices=FLOWS, default=list(FLOWS))
+    parser.add_argument("--requests", type=int, default=100, help="requests por flujo y nivel de concurrencia")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--backend-url", help="backend ya levantado; si no se pasa, se levanta uno local")
+    parser.add_argument("--backend-port", type=int, default=8765)
+    parser.add_argument("--bonita-port", type=int, default=8089)
+    parser.add_argument("--database-url", help="base del backend local (por defecto SQLite temporal)")
+    parser.add_argument("--username", default="bench")
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--json", dest="json_path", help="guarda los resultados en un archivo JSON")
+    parser.add_argument("--traces", type=int, default=0, help="muestra el desglose de los N requests más lentos")
+    add_state_arguments(parser)
+    return parser.parse_args()
+
+
+def _wait_for_http(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+
+@contextmanager
+def local_backend(port: int, bonita_url: str, database_url: str = None):
+    """Levanta el backend con uvicorn, por defecto sobre una base SQLite temporal"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            "BONITA_URL": bonita_url,
+            "KPI_REFRESH_INTERVAL": "0",
+            # Para leer /debug/metrics y /debug/traces/recent al final
+            "DEBUG_ENDPOINTS": "true",
+        }
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=env,
+        )
+        try:
+            url = f"http://127.0.0.1:{port}"
+            _wait_for_http(url)
+            yield url
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def _project_payload(owner_id: int) -> dict:
+    suffix = uuid.uuid4().hex[:10]
+    task = {
+        "necessity": "Materiales de construcción",
+        "quantity": "10",
+        "start_date": "2026-01-01",
+        "end_date": "2026-02-01",
+        "status": "pending",
+    }
+    return {
+        "name": f"Proyecto bench {suffix}",
+        "description": "Proyecto generado por el benchmark de flujos",
+        "start_date": "2026-01-01",
+        "end_date": "2026-06-30",
+        "owner_id": owner_id,
+        "tasks": [
+            {**task, "title": "Tarea local bench", "resolves_by_itself": True},
+            {**task, "title": "Tarea cloud bench", "resolves_by_itself": False},
+        ],
+    }
+
+
+async def _check(response: httpx.Response) -> dict:
+    response.raise_for_status()
+    return response.json()
+
+
+async def seed_user(client: httpx.AsyncClient, username: str, password: str) -> None:
+    """Crea ONG y usuario en un backend recién levantado"""
+    ong = await _check(await client.post("/ongs/", json={"name": f"ONG {username}"}))
+    user = await _check(await client.post("/users/create", json={
+        "username": username, "email": f"{username}@example.com", "password": password,
+    }))
+    await _check(await client.post(f"/users/{user['id']}/ongs/{ong['id']}"))
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> None:
+    token = (await _check(await client.post("/auth/login", data={"username": username, "password": password})))["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+
+
+async def wait_for_delivery(client: httpx.AsyncClient, project: dict, timeout: float = 60.0) -> dict:
+    """El worker del outbox entrega el proyecto a Bonita en segundo plano"""
+    deadline = time.monotonic() + timeout
+    while not project.get("bonita_case_id"):
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"El proyecto {project['id']} no llegó a Bonita")
+        await asyncio.sleep(0.05)
+        project = await _check(await client.get(f"/projects/search_name/{quote(project['name'])}"))
+    return project
+
+
+async def print_outbox_metrics(client: httpx.AsyncClient) -> None:
+    for metric in await _check(await client.get("/debug/metrics")):
+        if metric["name"].startswith("bonita_outbox"):
+            print(json.dumps(metric))
+
+
+async def print_slowest_traces(client: httpx.AsyncClient, limit: int) -> None:
+    traces = await _check(await client.get("/debug/traces/recent", params={"limit": limit, "spans": False}))
+    for trace in traces:
+        print(f"\n{trace['name']}  {trace['duration_ms']:.1f} ms  trace {trace['trace_id']}")
+        for entry in trace["breakdown"]:
+            print(f"    {entry['name']:<40} {entry['count']:>5} {entry['total_ms']:>10.1f} ms")
+
+
+async def run(args, backend_url: str) -> list[LoadResult]:
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=backend_url, timeout=args.timeout, limits=limits) as client:
+        if not args.backend_url:
+            await seed_user(client, args.username, args.password)
+        await login(client, args.username, args.password)
+        me = await _check(await client.get("/users/me"))
+        if not me["ongs"]:
+            raise SystemExit(f"El usuario {args.username} no pertenece a ninguna ONG")
+        ong_id = me["ongs"][0]["id"]
+        # Un proyecto por request en vuelo: dos compromisos sobre el mismo caso
+        # competirían por la misma tarea humana de Bonita
+        created = [
+            await _check(await client.post("/projects/create", json=_project_payload(ong_id)))
+            for _ in range(max(args.concurrency))
+        ]
+        created = [await wait_for_delivery(client, project) for project in created]
+        base_project = created[0]
+        projects = asyncio.Queue()
+        for project in created:
+            projects.put_nowait(project)
+
+        async def create_project(_: int) -> None:
+            await _check(await client.post("/projects/create", json=_project_payload(ong_id)))
+
+        async def task_compromise(i: int) -> None:
+            project = await projects.get()
+            try:
+                await _check(await client.post("/tasks/task_compromise", json={
+                    "project_id": project["id"], "task_id": i + 1, "ong_id": ong_id,
+                }))
+            finally:
+                projects.put_nowait(project)
+
+        async def send_observation(i: int) -> None:
+            await _check(await client.post("/observations/send_observation", json={
+                "content": f"Observación de benchmark número {i}",
+                "project_name": base_project["name"],
+                "ong_id": ong_id,
+            }))
+
+        senders = {
+            "create_project": create_project,
+            "task_compromise": task_compromise,
+            "send_observation": send_observation,
+        }
+        results = []
+        for flow in args.flows:
+            for level in args.concurrency:
+                results.append(await run_load(flow, senders[flow], args.requests, level))
+        await print_outbox_metrics(client)
+        if args.traces:
+            await print_slowest_traces(client, args.traces)
+        return results
+
+
+def main():
+    args = parse_args()
+    if args.backend_url:
+        results = asyncio.run(run(args, args.backend_url))
+    else:
+        with FakeBonitaServer(state_from_args(args), port=args.bonita_port) as bonita_server:
+            with local_backend(args.backend_port, bonita_server.url, args.database_url) as backend_url:
+                results = asyncio.run(run(args, backend_url))
+                print("Requests recibidos por Bonita:", json.dumps(bonita_server.state.request_counts, indent=2))
+
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([result.summary() for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
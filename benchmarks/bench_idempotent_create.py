@@ -0,0 +1,99 @@
+"""
+Tormenta de reintentos sobre POST /projects/create: cada proyecto se manda
+--retries veces (en paralelo o en serie, como un cliente que reintenta por
+timeout) con y sin Idempotency-Key. Cuenta proyectos y envíos a Bonita
+(filas del outbox) que quedan, las respuestas por status y las sentencias SQL.
+
+Corre el backend en este proceso (httpx + ASGITransport) sobre un SQLite
+temporal, con el worker del outbox detenido.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_idempotent_create.py --projects 50 --retries 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--retries", type=int, default=5, help="envíos del mismo request")
+    parser.add_argument("--tasks", type=int, default=5, help="tareas por proyecto")
+    return parser.parse_args()
+
+
+def project_body(name: str, tasks: int) -> dict:
+    task = {"necessity": "Materiales", "quantity": "10", "start_date": "2026-01-01", "end_date": "2026-02-01", "resolves_by_itself": False}
+    return {
+        "name": name, "description": "Proyecto del benchmark de reintentos", "start_date": "2026-01-01",
+        "end_date": "2026-06-30", "owner_id": 1, "tasks": [{**task, "title": f"Tarea {i}"} for i in range(tasks)],
+    }
+
+
+async def run(args) -> None:
+    import app.main as main
+    from sqlalchemy import event
+    from app.core.database import SessionLocal, engine
+    from app.models.bonita_outbox import BonitaOutbox
+    from app.models.ong import Ong
+    from app.models.project import Project
+    from app.services.auth_service import get_current_user
+
+    db = SessionLocal()
+    db.add(Ong(id=1, name="ONG bench"))
+    db.commit()
+    main.app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, ongs=[SimpleNamespace(id=1)])
+    statements = [0]
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.__setitem__(0, statements[0] + 1))
+
+    print(f"{'caso':<24} {'requests':>8} {'proyectos':>9} {'outbox':>7} {'sentencias':>10} {'ms':>8}  respuestas")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://backend") as client:
+        for mode in ("paralelo", "serie"):
+            for with_key in (False, True):
+                name = f"{mode} {'con key' if with_key else 'sin key'}"
+                projects_before, outbox_before = db.query(Project).count(), db.query(BonitaOutbox).count()
+                statuses = Counter()
+                statements[0] = 0
+                start = time.perf_counter()
+
+                async def send(i: int, attempt: int) -> None:
+                    headers = {"Idempotency-Key": f"{name}-{i}"} if with_key else {}
+                    response = await client.post("/projects/create", json=project_body(f"{name} {i}", args.tasks), headers=headers)
+                    statuses[response.status_code] += 1
+
+                for i in range(args.projects):
+                    if mode == "paralelo":
+                        await asyncio.gather(*(send(i, attempt) for attempt in range(args.retries)))
+                    else:
+                        for attempt in range(args.retries):
+                            await send(i, attempt)
+                elapsed = (time.perf_counter() - start) * 1000
+                created = db.query(Project).count() - projects_before
+                outbox = db.query(BonitaOutbox).count() - outbox_before
+                print(
+                    f"{name:<24} {args.projects * args.retries:>8} {created:>9} {outbox:>7} {statements[0]:>10} "
+                    f"{elapsed:>8.0f}  {dict(sorted(statuses.items()))}"
+                )
+    db.close()
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        os.environ.update({"BONITA_URL": "http://127.0.0.1:1", "KPI_REFRESH_INTERVAL": "0"})
+        sys.path.insert(0, BACKEND_DIR)
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Cantidad de consultas y tiempo de los listados de proyectos (con sus tareas)
+a medida que crece la cantidad de proyectos. Compara la carga perezosa
+(una consulta de tareas por proyecto) con los métodos del repositorio, que
+usan selectinload.
+
+Cada servicio corre en su propio proceso (ambos se llaman `app`).
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_project_listing.py --projects 10 100 1000 --tasks 5
+    python benchmarks/bench_project_listing.py --service cloud
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = {
+    "backend": ("DATABASE_URL", {"BONITA_URL": "http://127.0.0.1:1", "KPI_REFRESH_INTERVAL": "0"}),
+    "cloud": ("DATABASE_CLOUD_URL", {}),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service", choices=SERVICES, help="por defecto mide los dos")
+    parser.add_argument("--projects", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--tasks", type=int, default=5, help="tareas por proyecto")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def seed(db, projects: int, tasks: int) -> None:
+    from app.models.ong import Ong
+    from app.models.project import Project
+    from app.models.task import Task
+
+    db.add_all([Ong(id=1, name="ONG dueña"), Ong(id=2, name="ONG ajena")])
+    db.flush()
+    today = date.today()
+    for i in range(projects):
+        project = Project(name=f"Proyecto {i}", description="Proyecto de benchmark", start_date=today, end_date=today, owner_id=1, status="active")
+        project.tasks = [
+            Task(title=f"Tarea {j}", necessity="Necesidad", quantity="1", start_date=today, end_date=today, resolves_by_itself=False)
+            for j in range(tasks)
+        ]
+        db.add(project)
+    db.commit()
+
+
+def listings(db, count: int) -> dict:
+    from app.models.project import Project
+    from app.repositories.project_repository import ProjectRepository
+
+    repo = ProjectRepository(db)
+    # Una sola página con todos los proyectos, para comparar contra la carga perezosa
+    cases = {
+        "lazy (sin selectinload)": lambda: db.query(Project).filter(Project.status == "active").all(),
+        "get_by_status": lambda: repo.get_by_status("active", count).items,
+    }
+    if hasattr(repo, "get_projects_with_tasks_by_owner_ids"):
+        cases["get_projects_with_tasks_by_owner_ids"] = lambda: repo.get_projects_with_tasks_by_owner_ids([1], count).items
+    if hasattr(repo, "get_projects_by_owner_ids"):
+        cases["get_projects_by_owner_ids"] = lambda: repo.get_projects_by_owner_ids([1], count).items
+    if hasattr(repo, "get_projects_not_owned_by_and_active"):
+        cases["get_projects_not_owned_by_and_active"] = lambda: repo.get_projects_not_owned_by_and_active([2], count).items
+    return cases
+
+
+def run_service(service: str, project_counts: list[int], tasks: int) -> None:
+    sys.path.insert(0, os.path.join(ROOT_DIR, service))
+    import app.main  # noqa: F401  registra todos los modelos
+    from sqlalchemy import event
+    from app.core.database import Base, SessionLocal, engine
+    from app.schemas.project_schema import ProjectResponse
+
+    queries = [0]
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.__setitem__(0, queries[0] + 1))
+
+    print(f"\n== {service} ({tasks} tareas por proyecto)")
+    print(f"{'listado':<40} {'proyectos':>9} {'consultas':>9} {'ms':>9}")
+    for count in project_counts:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        db = SessionLocal()
+        seed(db, count, tasks)
+        db.close()
+
+        db = SessionLocal()
+        for name, fetch in listings(db, count).items():
+            db.expunge_all()
+            queries[0] = 0
+            start = time.perf_counter()
+            # Igual que el response_model del endpoint: valida cada proyecto con sus tareas
+            payload = [ProjectResponse.model_validate(project) for project in fetch()]
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{name:<40} {len(payload):>9} {queries[0]:>9} {elapsed:>9.1f}")
+        db.close()
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        run_service(args.service, args.projects, args.tasks)
+        return
+
+    for service in [args.service] if args.service else SERVICES:
+        url_var, extra_env = SERVICES[service]
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {**os.environ, **extra_env, url_var: f"sqlite:///{os.path.join(tmp, 'bench.db')}"}
+            command = [sys.executable, os.path.abspath(__file__), "--child", "--service", service, "--tasks", str(args.tasks), "--projects"]
+            subprocess.run(command + [str(count) for count in args.projects], env=env, check=True)
+
+
+if __name__ == "__main__":
+    main()
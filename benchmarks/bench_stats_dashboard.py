@@ -0,0 +1,92 @@
+"""
+Carga del dashboard de indicadores: cada "gerente" pide los tres KPIs del
+backend a la vez. Compara calcularlos en cada request (como antes) contra
+servirlos desde stats_kpis, con valores vigentes y con valores siempre
+vencidos (max_age=0, cada request dispara un recálculo que se unifica).
+También cuenta los requests que llegan al Bonita falso.
+
+"por request" llama a StatsService en cada request: las consultas van a un
+thread, así que con más concurrencia que el pool se encolan sin bloquear el loop.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_stats_dashboard.py --requests 200 --concurrency 1 8 --latency-ms 20
+    python benchmarks/bench_stats_dashboard.py --modes scheduler "scheduler vencido" --concurrency 64 256
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from common import print_table, run_load
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+MODES = ("por request", "scheduler", "scheduler vencido")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--requests", type=int, default=200, help="cargas del dashboard por modo y nivel de concurrencia")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--cases", type=int, default=200, help="casos archivados en el Bonita falso")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--port", type=int, default=8089)
+    return parser.parse_args()
+
+
+async def run(args, state) -> None:
+    from app.core.database import SessionLocal
+    from app.services.stats_service import (
+        ONGS_AND_TASKS, PERCENT_NO_COLLABORATION_NEEDED, SUCCESSFUL_ON_TIME_AVG, StatsService, stats_kpis,
+    )
+
+    async def per_request(_: int) -> None:
+        db = SessionLocal()
+        try:
+            service = StatsService(db)
+            await asyncio.gather(service.get_successful_on_time_avg(), service.get_percent_no_collaboration_needed())
+            service.get_ongs_and_tasks_resolved()
+        finally:
+            db.close()
+
+    async def scheduler(_: int) -> None:
+        await asyncio.gather(*(stats_kpis.get(name) for name in (SUCCESSFUL_ON_TIME_AVG, PERCENT_NO_COLLABORATION_NEEDED, ONGS_AND_TASKS)))
+
+    # Primer cálculo (incluye el snapshot de los casos archivados), fuera de la medición
+    await scheduler(0)
+    results, bonita_requests = [], []
+    modes = (("por request", per_request, None), ("scheduler", scheduler, 3600), ("scheduler vencido", scheduler, 0))
+    for mode, send, max_age in modes:
+        if mode not in args.modes:
+            continue
+        if max_age is not None:
+            stats_kpis.max_age = max_age
+        for level in args.concurrency:
+            state.request_counts.clear()
+            results.append(await run_load(mode, send, args.requests, level))
+            # Deja terminar los recálculos pendientes antes de contar
+            await asyncio.gather(*(stats_kpis.refresh(name) for name in list(stats_kpis._inflight)), return_exceptions=True)
+            bonita_requests.append((mode, level, sum(state.request_counts.values())))
+    print_table(results)
+    print(f"\n{'modo':<22} {'conc':>5} {'requests a Bonita':>18}")
+    for mode, level, count in bonita_requests:
+        print(f"{mode:<22} {level:>5} {count:>18}")
+
+
+def main():
+    args = parse_args()
+    from fake_bonita import FakeBonitaServer, FakeBonitaState
+
+    state = FakeBonitaState(latency_ms=args.latency_ms, require_token=False)
+    state.seed_archived_cases(args.cases)
+    with FakeBonitaServer(state, port=args.port) as server, tempfile.TemporaryDirectory() as tmp:
+        os.environ["BONITA_URL"] = server.url
+        os.environ["KPI_REFRESH_INTERVAL"] = "0"
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        sys.path.insert(0, BACKEND_DIR)
+        import app.main  # noqa: F401  registra todos los modelos
+        asyncio.run(run(args, state))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Mide el refresco del snapshot de KPIs (lectura de project_end_date por caso
+archivado) con distintos niveles de concurrencia contra el Bonita falso.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_stats_fanout.py --cases 200 --latency-ms 20 --concurrency 1 4 8 16
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    return parser.parse_args()
+
+
+async def run_level(concurrency: int) -> tuple[float, int, float]:
+    from app.core.database import Base, engine, SessionLocal
+    from app.services.kpi_snapshot_service import KpiSnapshotService
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        service = KpiSnapshotService(db)
+        service.concurrency = concurrency
+        start = time.perf_counter()
+        processed = await service.refresh()
+        elapsed = time.perf_counter() - start
+        return elapsed, processed, await service.get_successful_on_time_avg()
+    finally:
+        db.close()
+
+
+async def run(args) -> None:
+    results = []
+    for level in args.concurrency:
+        elapsed, processed, avg = await run_level(level)
+        results.append((level, elapsed, processed, avg))
+
+    baseline = results[0][1]
+    print(f"{'concurrencia':>12} {'casos':>6} {'segundos':>9} {'speedup':>8} {'on-time %':>10}")
+    for level, elapsed, processed, avg in results:
+        print(f"{level:>12} {processed:>6} {elapsed:>9.3f} {baseline / elapsed:>7.1f}x {avg:>10.2f}")
+
+
+def main():
+    args = parse_args()
+    from fake_bonita import FakeBonitaServer, FakeBonitaState
+
+    state = FakeBonitaState(latency_ms=args.latency_ms, require_token=False)
+    state.seed_archived_cases(args.cases)
+    with FakeBonitaServer(state, port=args.port) as server, tempfile.TemporaryDirectory() as tmp:
+        os.environ["BONITA_URL"] = server.url
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        sys.path.insert(0, BACKEND_DIR)
+        import app.main  # noqa: F401  registra todos los modelos
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Utilidades compartidas por los benchmarks: carga concurrente y percentiles."""
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Percentil por rango más cercano, q entre 0 y 100"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class LoadResult:
+    name: str
+    concurrency: int
+    latencies: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def failed(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.ok / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "ok": self.ok,
+            "failed": self.failed,
+            "errors": self.errors,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_rps": round(self.throughput, 2),
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 1),
+        }
+
+
+async def run_load(name: str, send: Callable[[int], Awaitable[None]], total: int, concurrency: int) -> LoadResult:
+    """
+    Ejecuta `send(i)` `total` veces con a lo sumo `concurrency` en vuelo.
+    Solo se miden las latencias de las llamadas exitosas; las excepciones
+    se cuentan por tipo.
+    """
+    result = LoadResult(name=name, concurrency=concurrency)
+    queue = iter(range(total))
+
+    async def worker():
+        for i in queue:
+            start = time.perf_counter()
+            try:
+                await send(i)
+            except Exception as e:
+                response = getattr(e, "response", None)
+                key = f"HTTP {response.status_code}" if response is not None else type(e).__name__
+                result.errors[key] = result.errors.get(key, 0) + 1
+            else:
+                result.latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def print_table(results: list[LoadResult]) -> None:
+    print(f"{'flujo':<22} {'conc':>5} {'ok':>6} {'fallas':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for result in results:
+        s = result.summary()
+        print(
+            f"{s['name']:<22} {s['concurrency']:>5} {s['ok']:>6} {s['failed']:>7} {s['throughput_rps']:>8.1f} "
+            f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f}"
+        )
+        if s["errors"]:
+            print(f"{'':<22} errores: {s['errors']}")
@@ -0,0 +1,301 @@
+"""
+Servidor falso de Bonita para medir el backend sin un Bonita real.
+
+Implementa los endpoints que usa BonitaClient (loginservice, process,
+instantiation, humanTask, userTask, caseVariable, archivedCase,
+archivedCaseVariable y session/unusedId) con latencia configurable e
+inyección de fallas. Al instanciar un caso o ejecutar una tarea, la
+siguiente tarea humana del caso aparece recién después de --task-delay-ms.
+
+Uso:
+    python benchmarks/fake_bonita.py --port 8089 --latency-ms 20 --failure-rate 0.01 --task-delay-ms 150
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from starlette.routing import Match
+import uvicorn
+
+PROJECT_PROCESS = "Proceso de gestion de proyecto"
+CONTROL_PROCESS = "Proceso de control sobre proyecto"
+
+
+class FakeBonitaState:
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        failure_rate: float = 0.0,
+        failure_status: int = 503,
+        task_delay_ms: float = 0,
+        require_token: bool = True,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.task_delay_ms = task_delay_ms
+        self.require_token = require_token
+        self.processes = {
+            "1": {"id": "1", "name": PROJECT_PROCESS, "version": "1.0", "deploymentDate": "2025-11-26 10:00:00.000"},
+            "2": {"id": "2", "name": CONTROL_PROCESS, "version": "1.0", "deploymentDate": "2025-11-26 10:00:00.000"},
+        }
+        self.sessions: dict[str, dict] = {}
+        self.user_ids: dict[str, str] = {}
+        self.cases: dict[str, dict] = {}
+        self.human_tasks: dict[str, dict] = {}
+        self.case_variables: dict[tuple[str, str], dict] = {}
+        self.archived_cases: list[dict] = []
+        self.archived_variables: dict[tuple[str, str], dict] = {}
+        self.request_counts: dict[str, int] = {}
+        self._ids = itertools.count(1000)
+
+    def next_id(self) -> str:
+        return str(next(self._ids))
+
+    def seed_archived_cases(self, count: int, process_id: str = "1", on_time_ratio: float = 0.5) -> None:
+        base = datetime(2025, 1, 1)
+        for _ in range(count):
+            case_id = str(10_000 + len(self.archived_cases))
+            end_date = base + timedelta(hours=len(self.archived_cases))
+            deadline = end_date + timedelta(days=1 if random.random() < on_time_ratio else -1)
+            self.archived_cases.append({
+                "id": str(len(self.archived_cases) + 1),
+                "sourceObjectId": case_id,
+                "processDefinitionId": process_id,
+                "state": "completed",
+                "end_date": end_date.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+            })
+            self.archived_variables[(case_id, "project_end_date")] = {
+                "name": "project_end_date", "value": deadline.strftime("%Y-%m-%d"),
+            }
+
+    def open_human_task(self, case_id: str) -> None:
+        """Crea la próxima tarea humana del caso, visible después de task_delay_ms"""
+        task_id = self.next_id()
+        self.human_tasks[task_id] = {
+            "id": task_id,
+            "caseId": case_id,
+            "rootCaseId": case_id,
+            "name": "Tarea humana",
+            "state": "ready",
+            "assigned_id": "",
+            "ready_at": time.monotonic() + self.task_delay_ms / 1000,
+        }
+
+    def ready_tasks(self, case_id: str) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {key: value for key, value in task.items() if key != "ready_at"}
+            for task in self.human_tasks.values()
+            if task["caseId"] == case_id and task["state"] == "ready" and task["ready_at"] <= now
+        ]
+
+    async def simulate_latency(self) -> None:
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+    def should_fail(self) -> bool:
+        return self.failure_rate > 0 and random.random() < self.failure_rate
+
+
+def _paginate(request: Request, items: list[dict]) -> JSONResponse:
+    """Aplica p, c, f y o como lo hace la API REST de Bonita"""
+    params = request.query_params
+    for raw_filter in params.getlist("f"):
+        key, _, value = raw_filter.partition("=")
+        items = [item for item in items if str(item.get(key)) == value]
+    order = params.get("o")
+    if order:
+        field, _, direction = order.partition(" ")
+        items = sorted(items, key=lambda item: str(item.get(field, "")), reverse=direction.upper() == "DESC")
+    page, count = int(params.get("p", 0)), int(params.get("c", 10))
+    chunk = items[page * count:(page + 1) * count]
+    return JSONResponse(chunk, headers={"Content-Range": f"{page}-{count}/{len(items)}"})
+
+
+def _not_found() -> JSONResponse:
+    return JSONResponse({"message": "not found"}, status_code=404)
+
+
+def create_app(state: FakeBonitaState) -> FastAPI:
+    app = FastAPI(title="Fake Bonita")
+
+    def _route_path(request: Request) -> str:
+        for route in app.router.routes:
+            if route.matches(request.scope)[0] == Match.FULL:
+                return route.path
+        return request.url.path
+
+    @app.middleware("http")
+    async def bonita_middleware(request: Request, call_next):
+        path = request.url.path
+        # Endpoints de control del benchmark: sin latencia, fallas ni conteo
+        if path.startswith("/__"):
+            return await call_next(request)
+        # Se cuenta por ruta (/API/bpm/userTask/{task_id}) y no por URL
+        key = f"{request.method} {_route_path(request)}"
+        state.request_counts[key] = state.request_counts.get(key, 0) + 1
+        await state.simulate_latency()
+        if state.should_fail():
+            return JSONResponse({"message": "falla inyectada"}, status_code=state.failure_status)
+        if path.startswith("/API/"):
+            session = state.sessions.get(request.headers.get("X-Bonita-API-Token", ""))
+            if state.require_token and session is None:
+                return JSONResponse({"message": "unauthorized"}, status_code=401)
+            request.state.session = session
+        return await call_next(request)
+
+    @app.post("/loginservice")
+    async def login(request: Request):
+        form = await request.form()
+        username = form.get("username")
+        if not username:
+            return Response(status_code=401)
+        token = uuid.uuid4().hex
+        user_id = state.user_ids.setdefault(username, state.next_id())
+        state.sessions[token] = {"user_id": user_id, "user_name": username}
+        response = Response(status_code=204)
+        response.set_cookie("JSESSIONID", uuid.uuid4().hex)
+        response.set_cookie("X-Bonita-API-Token", token)
+        return response
+
+    @app.get("/API/system/session/unusedId")
+    def get_session(request: Request):
+        session = request.state.session or {"user_id": "-1", "user_name": "anonymous"}
+        return {"user_id": session["user_id"], "user_name": session["user_name"]}
+
+    @app.get("/API/bpm/process")
+    def search_processes(request: Request):
+        return _paginate(request, list(state.processes.values()))
+
+    @app.post("/API/bpm/process/{process_id}/instantiation")
+    def instantiate(process_id: str):
+        if process_id not in state.processes:
+            return _not_found()
+        case_id = state.next_id()
+        state.cases[case_id] = {"id": case_id, "processDefinitionId": process_id, "state": "started"}
+        state.open_human_task(case_id)
+        return {"caseId": int(case_id)}
+
+    @app.get("/API/bpm/case")
+    def search_cases(request: Request):
+        return _paginate(request, [
+            {**case, "processId": case["processDefinitionId"]} for case in state.cases.values()
+        ])
+
+    @app.get("/API/bpm/humanTask")
+    def search_human_tasks(request: Request):
+        case_ids = [f.partition("=")[2] for f in request.query_params.getlist("f") if f.startswith("caseId=")]
+        return JSONResponse(state.ready_tasks(case_ids[0]) if case_ids else [])
+
+    @app.put("/API/bpm/userTask/{task_id}")
+    async def assign_task(task_id: str, request: Request):
+        task = state.human_tasks.get(task_id)
+        if not task:
+            return _not_found()
+        task["assigned_id"] = str((await request.json()).get("assigned_id", ""))
+        return Response(status_code=200)
+
+    @app.post("/API/bpm/userTask/{task_id}/execution")
+    async def execute_task(task_id: str, request: Request):
+        task = state.human_tasks.get(task_id)
+        if not task or task["state"] != "ready":
+            return _not_found()
+        await request.json()
+        task["state"] = "completed"
+        # El caso queda esperando el próximo paso humano
+        state.open_human_task(task["caseId"])
+        return Response(status_code=204)
+
+    @app.get("/API/bpm/caseVariable/{case_id}/{name}")
+    def get_case_variable(case_id: str, name: str):
+        return state.case_variables.get((case_id, name)) or _not_found()
+
+    @app.put("/API/bpm/caseVariable/{case_id}/{name}")
+    async def set_case_variable(case_id: str, name: str, request: Request):
+        state.case_variables[(case_id, name)] = {"name": name, "case_id": case_id, **(await request.json())}
+        return Response(status_code=200)
+
+    @app.get("/API/bpm/archivedCase")
+    def search_archived_cases(request: Request):
+        return _paginate(request, state.archived_cases)
+
+    @app.get("/API/bpm/archivedCaseVariable/{case_id}/{name}")
+    def get_archived_variable(case_id: str, name: str):
+        return state.archived_variables.get((case_id, name)) or _not_found()
+
+    @app.get("/__stats")
+    def get_stats():
+        return state.request_counts
+
+    @app.post("/__reset")
+    def reset_stats():
+        state.request_counts.clear()
+        return {"ok": True}
+
+    return app
+
+
+class FakeBonitaServer:
+    """Levanta el servidor falso en un thread, para usar dentro de un benchmark"""
+
+    def __init__(self, state: FakeBonitaState, host: str = "127.0.0.1", port: int = 8089):
+        self.state = state
+        self.url = f"http://{host}:{port}"
+        config = uvicorn.Config(create_app(state), host=host, port=port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def add_state_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=0, help="latencia fija por request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="latencia aleatoria extra por request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="proporción de requests que fallan")
+    parser.add_argument("--failure-status", type=int, default=503, help="status de las fallas inyectadas")
+    parser.add_argument("--task-delay-ms", type=float, default=0, help="demora hasta que aparece la tarea humana")
+
+
+def state_from_args(args: argparse.Namespace) -> FakeBonitaState:
+    return FakeBonitaState(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        failure_status=args.failure_status,
+        task_delay_ms=args.task_delay_ms,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor falso de Bonita")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--archived-cases", type=int, default=0)
+    add_state_arguments(parser)
+    args = parser.parse_args()
+
+    state = state_from_args(args)
+    state.seed_archived_cases(args.archived_cases)
+    uvicorn.run(create_app(state), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Collector OTLP falso: recibe POST /v1/traces (OTLP/HTTP con JSON, lo que
+manda el backend con TRACE_OTLP_ENDPOINT) y guarda los spans en memoria.
+GET /traces devuelve, por trace, los spans recibidos; GET /summary el
+tiempo total por nombre de span.
+
+Uso (desde la raíz del repo):
+    python benchmarks/fake_otlp_collector.py --port 4318
+    TRACE_OTLP_ENDPOINT=http://127.0.0.1:4318/v1/traces python benchmarks/bench_flows.py --requests 20
+"""
+import argparse
+import threading
+import time
+from collections import defaultdict
+import uvicorn
+from fastapi import FastAPI, Request
+
+
+class CollectorState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.traces: dict[str, list[dict]] = defaultdict(list)
+        self.batches = 0
+
+    def add(self, payload: dict) -> int:
+        received = 0
+        with self.lock:
+            self.batches += 1
+            for resource in payload.get("resourceSpans", []):
+                for scope in resource.get("scopeSpans", []):
+                    for span in scope.get("spans", []):
+                        self.traces[span["traceId"]].append(span)
+                        received += 1
+        return received
+
+    def summary(self) -> list[dict]:
+        totals = {}
+        with self.lock:
+            for spans in self.traces.values():
+                for span in spans:
+                    entry = totals.setdefault(span["name"], {"name": span["name"], "count": 0, "total_ms": 0.0})
+                    entry["count"] += 1
+                    entry["total_ms"] += (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+        return sorted(totals.values(), key=lambda entry: entry["total_ms"], reverse=True)
+
+
+def create_app(state: CollectorState) -> FastAPI:
+    app = FastAPI(title="Collector OTLP falso")
+
+    @app.post("/v1/traces")
+    async def export_traces(request: Request):
+        state.add(await request.json())
+        return {"partialSuccess": {}}
+
+    @app.get("/traces")
+    def get_traces():
+        with state.lock:
+            return {trace_id: list(spans) for trace_id, spans in state.traces.items()}
+
+    @app.get("/summary")
+    def get_summary():
+        return {"batches": state.batches, "traces": len(state.traces), "spans": state.summary()}
+
+    return app
+
+
+class FakeOtlpCollector:
+    """Levanta el collector en un thread, para usar dentro de un benchmark"""
+
+    def __init__(self, state: CollectorState, host: str = "127.0.0.1", port: int = 4318):
+        self.state = state
+        self.url = f"http://{host}:{port}"
+        self.endpoint = f"{self.url}/v1/traces"
+        config = uvicorn.Config(create_app(state), host=host, port=port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    args = parser.parse_args()
+    uvicorn.run(create_app(CollectorState()), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_model=list[dict])
+def get_metrics():
+    return metrics.snapshot()
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.pagination import PageParams, page_params, page_response
 from app.schemas.observation_schema import ObservationBase 
 from app.schemas.user_schema import UserResponse
 from app.services.auth_service import get_current_user
@@ -11,23 +12,23 @@ router = APIRouter()
 
 
 @router.post("/save_observation", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def save_observation(observation: ObservationBase, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+async def save_observation(observation: ObservationBase, db: AsyncSession = Depends(get_async_db), current_user: UserResponse = Depends(get_current_user)):
     observation_service = ObservationService(db)
-    return observation_service.save_observation_to_db(observation)
+    return await observation_service.save_observation_to_db(observation)
 
 
 @router.get("/my_observations_ong", response_model=list[dict], status_code=status.HTTP_200_OK)
-async def get_my_observations(db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+async def get_my_observations(response: Response, page: PageParams = Depends(page_params), db: AsyncSession = Depends(get_async_db), current_user: UserResponse = Depends(get_current_user)):
     observation_service = ObservationService(db)
-    return observation_service.get_my_observations(current_user)
+    return page_response(response, await observation_service.get_my_observations(current_user, page.limit, page.after))
 
 
 @router.post("/accept_observation", response_model=dict, status_code=status.HTTP_200_OK)
-async def accept_observation(observation_id: int = Body(..., embed=True), db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+async def accept_observation(observation_id: int = Body(..., embed=True), db: AsyncSession = Depends(get_async_db), current_user: UserResponse = Depends(get_current_user)):
     observation_service = ObservationService(db)
-    return observation_service.accept_observation(observation_id)
+    return await observation_service.accept_observation(observation_id)
 
 @router.get("/my_observations_manager", response_model=list[dict], status_code=status.HTTP_200_OK)
-async def my_obserbations_manager(db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+async def my_obserbations_manager(response: Response, page: PageParams = Depends(page_params), db: AsyncSession = Depends(get_async_db), current_user: UserResponse = Depends(get_current_user)):
     observation_service = ObservationService(db)
-    return observation_service.get_user_sent_observations(current_user.id)
\ No newline at end of file
+    return page_response(response, await observation_service.get_user_sent_observations(current_user.id, page.limit, page.after))
\ No newline at end of file
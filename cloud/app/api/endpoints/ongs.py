@@ -1,8 +1,9 @@
 from app.services.auth_service import get_current_user
 from app.schemas.user_schema import UserResponse
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.pagination import PageParams, page_params, page_response
 from app.services.ong_service import OngService
 from app.schemas.ong_schema import OngResponse, OngCreate
 
@@ -10,9 +11,9 @@ router = APIRouter()
 
 
 @router.get("/", response_model=list[OngResponse])
-def get_ongs(db: Session = Depends(get_db)):
+def get_ongs(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
     service = OngService(db)
-    return service.get_ongs()
+    return page_response(response, service.get_ongs(page.limit, page.after))
 
 
 @router.post("/", response_model=OngResponse)
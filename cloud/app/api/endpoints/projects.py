@@ -1,26 +1,27 @@
 from http.client import HTTPException
 from app.schemas.user_schema import UserResponse
 from app.services.auth_service import get_current_user
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.pagination import PageParams, page_params, page_response
 from app.services.project_service import ProjectService
 from app.schemas.project_schema import ProjectResponse
-from app.schemas.project_schema import ProjectCreate
+from app.schemas.project_schema import ProjectBatchCreate, ProjectBatchResponse, ProjectCreate
 
 router = APIRouter()
 
 
 @router.get("/my_projects", response_model=list[ProjectResponse])
-def get_my_projects(db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+def get_my_projects(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     service = ProjectService(db)
-    return service.get_my_projects(user=current_user)
+    return page_response(response, service.get_my_projects(current_user, page.limit, page.after))
 
 
 @router.get("/get_projects_not_owned_by_and_active", response_model=list[ProjectResponse])
-def get_projects(db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+def get_projects(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     service = ProjectService(db)
-    return service.get_projects_not_owned_by_and_active(user=current_user)
+    return page_response(response, service.get_projects_not_owned_by_and_active(current_user, page.limit, page.after))
 
 
 @router.post("/store_projects", response_model=ProjectResponse)
@@ -29,6 +30,13 @@ def store_projects(project: ProjectCreate, db: Session = Depends(get_db), curren
     return service.store_projects(project)
 
 
+# Lote de proyectos con sus tareas en una sola transacción (lo usa el CloudClient del backend)
+@router.post("/store_projects_batch", response_model=ProjectBatchResponse)
+def store_projects_batch(batch: ProjectBatchCreate, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+    service = ProjectService(db)
+    return {"project_ids": service.store_projects_batch(batch.projects)}
+
+
 @router.get("/search_with_name/{name}", response_model=ProjectResponse)
 def get_project_by_name(name: str, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     service = ProjectService(db)
@@ -62,12 +70,12 @@ def check_all_tasks_are_covers(project_name: str, db: Session = Depends(get_db),
 
 
 @router.get("/projects_status/{status}", response_model=list[ProjectResponse])
-def get_projects_with_status(status: str, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+def get_projects_with_status(status: str, response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     service = ProjectService(db)
-    return service.get_projects_with_status(status)
+    return page_response(response, service.get_projects_with_status(status, page.limit, page.after))
 
 
 @router.get("/projects_with_requests/{owner_id}", response_model=list[ProjectResponse])
-def get_projects_with_requests(owner_id: int, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+def get_projects_with_requests(owner_id: int, response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     service = ProjectService(db)
-    return service.get_projects_with_requests(owner_id)
\ No newline at end of file
+    return page_response(response, service.get_projects_with_requests(owner_id, page.limit, page.after))
\ No newline at end of file
@@ -1,17 +1,17 @@
 from app.services.auth_service import get_current_user
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.services.ong_service import OngService
+from fastapi import APIRouter, Depends, Response
+from app.core.scheduler import computed_response
+from app.services.stats_service import ONGS_AND_COLLABORATIONS, stats_kpis
 from app.schemas.user_schema import UserResponse
 
 
 router = APIRouter()
 
+# Sale de memoria (ver stats_service.stats_kpis); X-Computed-At indica cuándo se calculó
 @router.get("/ongs-and-collaborations", response_model=list)
-def get_ongs_and_collaborations(
-    db: Session = Depends(get_db),
+async def get_ongs_and_collaborations(
+    response: Response,
+    fresh: bool = False,
     current_user: UserResponse = Depends(get_current_user)
 ):
-    ong_service = OngService(db)
-    return ong_service.get_ongs_and_collaborations()
\ No newline at end of file
+    return computed_response(response, await stats_kpis.get(ONGS_AND_COLLABORATIONS, fresh=fresh))
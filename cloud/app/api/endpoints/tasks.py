@@ -1,7 +1,8 @@
 # app/routers/task_router.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.pagination import PageParams, page_params, page_response
 from app.schemas.task_schema import CommitRequest
 from app.schemas.user_schema import UserResponse
 from app.services.task_service import TaskService
@@ -11,10 +12,10 @@ from app.services.task_ong_association_service import TaskOngAssociationService
 router = APIRouter()
 
 @router.post("/task_compromise")
-async def commit_task_to_ong(commit_data: CommitRequest, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+async def commit_task_to_ong(commit_data: CommitRequest, db: AsyncSession = Depends(get_async_db), current_user: UserResponse = Depends(get_current_user)):
     service = TaskService(db)
     try:
-        return service.commit_task_to_ong(commit_data.task_id, commit_data.ong_id)
+        return await service.commit_task_to_ong(commit_data.task_id, commit_data.ong_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -22,10 +23,10 @@ async def commit_task_to_ong(commit_data: CommitRequest, db: Session = Depends(g
 
 
 @router.post("/select_ong_for_task")
-async def select_ong_for_task(commit_data: CommitRequest, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+async def select_ong_for_task(commit_data: CommitRequest, db: AsyncSession = Depends(get_async_db), current_user: UserResponse = Depends(get_current_user)):
     service = TaskService(db)
     try:
-        return service.select_ong_for_task(commit_data.task_id, commit_data.ong_id)
+        return await service.select_ong_for_task(commit_data.task_id, commit_data.ong_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -33,10 +34,10 @@ async def select_ong_for_task(commit_data: CommitRequest, db: Session = Depends(
 
 
 @router.get("/view_compromises")
-async def view_compromises(db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+async def view_compromises(response: Response, page: PageParams = Depends(page_params), db: AsyncSession = Depends(get_async_db), current_user: UserResponse = Depends(get_current_user)):
     service = TaskOngAssociationService(db)
     try:
-        return service.get_all()
+        return page_response(response, await service.get_page(page.limit, page.after))
     except HTTPException:
         raise
     except Exception as e:
@@ -1,3 +1,4 @@
+import os
 from fastapi import APIRouter
 from app.api.endpoints import ongs
 from app.api.endpoints import projects
@@ -6,6 +7,7 @@ from app.api.endpoints import users
 from app.api.endpoints import auth
 from app.api.endpoints import stats
 from app.api.endpoints import observations
+from app.api.endpoints import debug
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -15,6 +17,10 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(ongs.router, prefix="/api/ongs", tags=["ongs"])
 api_router.include_router(stats.router, prefix="/api/stats", tags=["stats"])
 api_router.include_router(observations.router, prefix="/api/observations", tags=["observations"])
+# /debug expone métricas, SQL y tiempos de cada request: solo se monta con
+# DEBUG_ENDPOINTS=true (desarrollo y benchmarks), nunca por defecto
+if os.getenv("DEBUG_ENDPOINTS", "false").lower() in ("1", "true", "yes"):
+    api_router.include_router(debug.router, prefix="/debug", tags=["debug"])
 
 
 @api_router.get("/")
@@ -1,18 +1,146 @@
+import logging
 import os
-from sqlalchemy import create_engine
+import time
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from typing import Annotated
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_CLOUD_URL")
 
-engine = create_engine(DATABASE_URL)
+# Drivers async equivalentes a los sync de DATABASE_CLOUD_URL
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def _async_url(url: str) -> str:
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("DATABASE_CLOUD_ASYNC_URL") or _async_url(DATABASE_URL)
+
+
+def _pool_options(url: str, poolclass: type) -> dict:
+    # SQLite en memoria usa su propio pool de una conexión por thread
+    if make_url(url).get_backend_name() == "sqlite" and make_url(url).database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+        # Se recicla antes de que el servidor o un proxy corten las conexiones ociosas
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+
+
+# El engine sync queda para create_all, los seeds y los endpoints def (threadpool);
+# los endpoints async usan async_engine para no bloquear el event loop
+engine = create_engine(DATABASE_URL, **_pool_options(DATABASE_URL, QueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_pool_options(ASYNC_DATABASE_URL, AsyncAdaptedQueuePool))
+# expire_on_commit=False: con AsyncSession no se puede recargar un atributo de forma implícita
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
-def get_db():
+def _instrument(target: Engine, label: str) -> None:
+    @event.listens_for(target, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        metrics.gauge("db_pool_checked_out", engine=label).inc()
+
+    @event.listens_for(target, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.gauge("db_pool_checked_out", engine=label).dec()
+            metrics.histogram("db_connection_held_seconds", engine=label).observe(time.perf_counter() - checked_out_at)
+
+
+_instrument(engine, "sync")
+_instrument(async_engine.sync_engine, "async")
+
+
+def _engine_label(connection) -> str:
+    return "async" if connection.engine is async_engine.sync_engine else "sync"
+
+
+# Espera por una conexión libre, solo con eventos públicos de Session: se marca
+# cuando la sesión necesita conexión (primera consulta o flush) y se mide en
+# after_begin, que corre recién con la conexión del pool ya obtenida. Se escucha
+# la clase Session para cubrir también la sesión sync interna de AsyncSession
+@event.listens_for(Session, "do_orm_execute")
+def _on_orm_execute(orm_execute_state):
+    orm_execute_state.session.info.setdefault("checkout_started", time.perf_counter())
+
+
+@event.listens_for(Session, "before_flush")
+def _on_flush_checkout(session, flush_context, instances):
+    session.info.setdefault("checkout_started", time.perf_counter())
+
+
+@event.listens_for(Session, "after_begin")
+def _on_after_begin(session, transaction, connection):
+    started = session.info.pop("checkout_started", None)
+    if started is not None:
+        metrics.histogram("db_pool_checkout_wait_seconds", engine=_engine_label(connection)).observe(time.perf_counter() - started)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _on_transaction_end(session, transaction):
+    # Marca de una consulta que ya tenía conexión: no hubo checkout
+    session.info.pop("checkout_started", None)
+
+
+def _endpoint_name(request: Request) -> str:
+    endpoint = request.scope.get("endpoint")
+    if endpoint is None:
+        return "unknown"
+    return f"{endpoint.__module__.rsplit('.', 1)[-1]}.{endpoint.__name__}"
+
+
+def get_db(request: Request):
     db = SessionLocal()
+    start = time.perf_counter()
     try:
         yield db
+    except PoolTimeoutError:
+        metrics.counter("db_pool_checkout_timeouts", engine="sync").inc()
+        raise
     finally:
         db.close()
+        # Por endpoint (no por URL) para ver cuáles retienen la sesión
+        metrics.histogram("db_session_held_seconds", endpoint=_endpoint_name(request)).observe(time.perf_counter() - start)
+
+
+async def get_async_db(request: Request):
+    db = AsyncSessionLocal()
+    start = time.perf_counter()
+    try:
+        yield db
+    except PoolTimeoutError:
+        metrics.counter("db_pool_checkout_timeouts", engine="async").inc()
+        raise
+    finally:
+        await db.close()
+        metrics.histogram("db_session_held_seconds", endpoint=_endpoint_name(request)).observe(time.perf_counter() - start)
+
+
+def create_missing_indexes() -> None:
+    """create_all no agrega índices nuevos a tablas que ya existen: se crean acá"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                # Otro worker pudo crearlo al mismo tiempo
+                logger.warning("No se pudo crear el índice %s: %s", index.name, e)
@@ -14,3 +14,13 @@ class BonitaAPIError(Exception):
             "body": self.body,
             "headers": self.headers,
         }
+
+
+class PasswordHashingBusy(Exception):
+    """El pool de hashing de contraseñas está saturado"""
+    pass
+
+
+class InvalidCursor(ValueError):
+    """Cursor de paginación mal formado o que no corresponde al listado"""
+    pass
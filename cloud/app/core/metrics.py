@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class Counter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self) -> dict:
+        return {"type": "counter", "value": self.value}
+
+
+class Gauge:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def snapshot(self) -> dict:
+        return {"type": "gauge", "value": self.value}
+
+
+class Histogram:
+    """Guarda las últimas observaciones para calcular percentiles aproximados."""
+
+    def __init__(self, max_samples: int = 2048):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._samples.append(value)
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total, maximum = self.count, self.total, self.max
+
+        def percentile(q: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+        return {
+            "type": "histogram",
+            "count": count,
+            "sum": total,
+            "avg": total / count if count else 0.0,
+            "max": maximum,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get(self, kind: type, name: str, labels: dict):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = self._metrics[key] = kind()
+            return metric
+
+    def counter(self, name: str, **labels) -> Counter:
+        return self._get(Counter, name, labels)
+
+    def gauge(self, name: str, **labels) -> Gauge:
+        return self._get(Gauge, name, labels)
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        return self._get(Histogram, name, labels)
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            items = list(self._metrics.items())
+        return [
+            {"name": name, "labels": dict(labels), **metric.snapshot()}
+            for (name, labels), metric in sorted(items, key=lambda item: item[0])
+        ]
+
+
+metrics = MetricsRegistry()
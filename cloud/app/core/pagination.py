@@ -0,0 +1,75 @@
+import base64
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Generic, Optional, Sequence, TypeVar
+from fastapi import Query, Response
+from app.core.exceptions import InvalidCursor
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    # Claves de orden del último ítem; None si no hay más páginas
+    next_after: Optional[tuple] = None
+
+
+@dataclass
+class PageParams:
+    limit: int
+    after: Optional[tuple] = None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("valor de cursor desconocido")
+    return value
+
+
+def encode_cursor(after: Sequence) -> str:
+    raw = json.dumps([_encode_value(value) for value in after], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or not values:
+            raise ValueError("cursor vacío")
+        return tuple(_decode_value(value) for value in values)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Cursor inválido: {cursor}") from e
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description=f"Valor del header {NEXT_CURSOR_HEADER} de la página anterior"),
+) -> PageParams:
+    return PageParams(limit=limit, after=decode_cursor(cursor) if cursor else None)
+
+
+def page_response(response: Response, page: Page) -> list:
+    """El cuerpo sigue siendo la lista; el cursor de la página siguiente va en un header"""
+    if page.next_after is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page.next_after)
+    return page.items
@@ -0,0 +1,99 @@
+import asyncio
+import contextvars
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+from fastapi import Response
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+COMPUTED_AT_HEADER = "X-Computed-At"
+
+
+@dataclass
+class Computed:
+    value: Any
+    computed_at: datetime
+    # Reloj monotónico del cálculo, para medir la edad sin depender de la hora del sistema
+    computed_monotonic: float
+
+
+class KpiScheduler:
+    """
+    Indicadores precalculados en memoria con stale-while-revalidate.
+    `run` los recalcula cada `interval` segundos; un request con un valor más
+    viejo que `max_age` recibe ese valor y dispara un recálculo en segundo
+    plano, y solo espera si todavía no hay ninguno. Los cálculos simultáneos
+    del mismo indicador se unifican en una sola tarea.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._compute: dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._values: dict[str, Computed] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def register(self, name: str, compute: Callable[[], Awaitable[Any]]) -> None:
+        self._compute[name] = compute
+
+    def refresh(self, name: str) -> asyncio.Task:
+        """Tarea de recálculo del indicador; si ya hay una en curso se reutiliza"""
+        task = self._inflight.get(name)
+        if task is None:
+            # Contexto vacío: la tarea sobrevive al request que la dispara y no
+            # debe heredar su trace (ni nada de su contexto)
+            task = asyncio.create_task(self._run(name), context=contextvars.Context())
+            self._inflight[name] = task
+            task.add_done_callback(lambda done: self._finished(name, done))
+        return task
+
+    def _finished(self, name: str, task: asyncio.Task) -> None:
+        self._inflight.pop(name, None)
+        # Un recálculo disparado por un valor vencido no lo espera nadie: el error se loguea acá
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Error recalculando el indicador %s: %s", name, task.exception())
+
+    async def _run(self, name: str) -> Computed:
+        start = time.perf_counter()
+        try:
+            value = await self._compute[name]()
+        except Exception:
+            metrics.counter("kpi_compute_errors", kpi=name).inc()
+            raise
+        finally:
+            metrics.histogram("kpi_compute_seconds", kpi=name).observe(time.perf_counter() - start)
+        computed = Computed(value=value, computed_at=datetime.now(timezone.utc), computed_monotonic=time.monotonic())
+        self._values[name] = computed
+        return computed
+
+    async def get(self, name: str, fresh: bool = False) -> Computed:
+        current = self._values.get(name)
+        if current is not None and not fresh:
+            if time.monotonic() - current.computed_monotonic < self.max_age:
+                metrics.counter("kpi_cache", kpi=name, result="fresh").inc()
+            else:
+                metrics.counter("kpi_cache", kpi=name, result="stale").inc()
+                self.refresh(name)
+            return current
+        metrics.counter("kpi_cache", kpi=name, result="forced" if fresh else "miss").inc()
+        # shield: si el cliente corta, el cálculo sigue para los demás requests que lo esperan
+        return await asyncio.shield(self.refresh(name))
+
+    async def run(self, interval: float) -> None:
+        """Loop de fondo que mantiene todos los indicadores al día"""
+        while True:
+            for name in list(self._compute):
+                try:
+                    await self.refresh(name)
+                except Exception:
+                    pass  # ya logueado en _finished; se mantiene el valor anterior
+            await asyncio.sleep(interval)
+
+
+def computed_response(response: Response, computed: Computed) -> Any:
+    """El cuerpo sigue siendo el valor; el momento del cálculo va en un header"""
+    response.headers[COMPUTED_AT_HEADER] = computed.computed_at.isoformat()
+    return computed.value
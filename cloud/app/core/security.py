@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from passlib.context import CryptContext
+from app.core.exceptions import PasswordHashingBusy
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt es CPU puro: corre en un pool de procesos propio para no bloquear
+# el event loop ni ocupar los threads de los endpoints sync
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Más allá de este número de operaciones en curso o en cola se rechaza con 503
+HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+_executor: Executor | None = None
+_pending = 0
+
+
+def _hash(password: str) -> tuple[str, float]:
+    return pwd_context.hash(password), time.time()
+
+
+def _verify(password: str, hashed_password: str) -> tuple[bool, float]:
+    return pwd_context.verify(password, hashed_password), time.time()
+
+
+def _get_executor() -> Executor | None:
+    global _executor
+    if _executor is None and HASH_WORKERS > 0:
+        _executor = ProcessPoolExecutor(max_workers=HASH_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+async def _run(operation: str, fn, *args):
+    global _pending
+    if _pending >= HASH_MAX_PENDING:
+        metrics.counter("password_hash_rejected", operation=operation).inc()
+        raise PasswordHashingBusy(f"Demasiadas operaciones de contraseña en curso ({_pending})")
+    _pending += 1
+    metrics.gauge("password_hash_queue_depth").set(_pending)
+    submitted = time.time()
+    try:
+        # Con PASSWORD_HASH_WORKERS=0 se usa el threadpool por defecto del loop
+        result, started = await asyncio.get_running_loop().run_in_executor(_get_executor(), fn, *args)
+        metrics.histogram("password_hash_queue_wait_seconds", operation=operation).observe(max(0.0, started - submitted))
+        metrics.histogram("password_hash_seconds", operation=operation).observe(time.time() - submitted)
+        return result
+    finally:
+        _pending -= 1
+        metrics.gauge("password_hash_queue_depth").set(_pending)
+
+
+async def hash_password(password: str) -> str:
+    return await _run("hash", _hash, password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await _run("verify", _verify, password, hashed_password)
+
+
+def shutdown_password_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
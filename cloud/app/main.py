@@ -1,12 +1,46 @@
-from fastapi import FastAPI
-from app.core.database import Base, engine
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app.core.database import Base, async_engine, create_missing_indexes, engine
+from app.core.exceptions import InvalidCursor, PasswordHashingBusy
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.scheduler import COMPUTED_AT_HEADER
+from app.core.security import shutdown_password_pool
 from app.api.router import api_router
+from app.services.stats_service import stats_kpis
 from fastapi.middleware.cors import CORSMiddleware
 from app.models import *
 
 Base.metadata.create_all(bind=engine)
+create_missing_indexes()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    refresh_interval = float(os.getenv("KPI_REFRESH_INTERVAL", "300"))
+    refresher = asyncio.create_task(stats_kpis.run(refresh_interval)) if refresh_interval > 0 else None
+    yield
+    if refresher:
+        refresher.cancel()
+    shutdown_password_pool()
+    await async_engine.dispose()
+
+
+app = FastAPI(title="Cloud API", lifespan=lifespan)
+
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    # Un pico de logins se rechaza rápido en vez de encolar sin límite
+    return JSONResponse(status_code=503, content={"detail": "Servidor ocupado, reintente en unos segundos."}, headers={"Retry-After": "1"})
+
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
 
-app = FastAPI(title="Cloud API")
 
 origins = [
     "http://localhost:5173",
@@ -19,6 +53,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, COMPUTED_AT_HEADER],
 )
 
 app.include_router(api_router)
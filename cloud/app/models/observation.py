@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -6,6 +6,11 @@ from app.core.database import Base
 
 class Observation(Base):
     __tablename__ = "observations"
+    # Listados por autor o por proyecto, de la más nueva a la más vieja
+    __table_args__ = (
+        Index("ix_observations_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_observations_project_id_created_at", "project_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -1,10 +1,22 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, List, Optional
-from sqlalchemy.orm import Session
+from typing import Generic, TypeVar, List, Optional, Sequence
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
+from app.core.exceptions import InvalidCursor
+from app.core.pagination import Page
 
 T = TypeVar('T')
 
 
+def _keyset_filter(keys: list, after: Optional[tuple], descending: bool):
+    if len(after) != len(keys):
+        raise InvalidCursor("El cursor no corresponde a este listado")
+    position = keys[0] if len(keys) == 1 else tuple_(*keys)
+    bound = after[0] if len(keys) == 1 else tuple_(*after)
+    return position < bound if descending else position > bound
+
+
 class BaseRepository(Generic[T], ABC):
     def __init__(self, db: Session, model: type):
         self.db = db
@@ -16,6 +28,25 @@ class BaseRepository(Generic[T], ABC):
     def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         return self.db.query(self.model).offset(skip).limit(limit).all()
 
+    def paginate(self, query: Query, limit: int, after: Optional[tuple] = None, keys: Optional[Sequence] = None, descending: bool = False) -> Page[T]:
+        """
+        Paginación por clave (keyset): filtra por las claves de orden del último
+        ítem visto en vez de usar OFFSET, así cada página cuesta lo mismo.
+        Las claves tienen que identificar la fila de forma única (terminar en el id).
+        """
+        keys = list(keys) if keys is not None else [self.model.id]
+        if after is not None:
+            query = query.filter(_keyset_filter(keys, after, descending))
+        order = [key.desc() if descending else key.asc() for key in keys]
+        # Se pide uno de más para saber si hay página siguiente
+        rows = query.order_by(None).order_by(*order).limit(limit + 1).all()
+        items = rows[:limit]
+        next_after = tuple(getattr(items[-1], key.key) for key in keys) if len(rows) > limit else None
+        return Page(items=items, next_after=next_after)
+
+    def get_page(self, limit: int, after: Optional[tuple] = None) -> Page[T]:
+        return self.paginate(self.db.query(self.model), limit, after)
+
     def create(self, obj_data: dict) -> T:
         db_obj = self.model(**obj_data)
         self.db.add(db_obj)
@@ -34,3 +65,47 @@ class BaseRepository(Generic[T], ABC):
         self.db.delete(db_obj)
         self.db.commit()
         return True
+
+
+class AsyncBaseRepository(Generic[T], ABC):
+    """Igual que BaseRepository pero sobre AsyncSession, para los endpoints async"""
+
+    def __init__(self, db: AsyncSession, model: type):
+        self.db = db
+        self.model = model
+
+    async def get_by_id(self, id: int, *options) -> Optional[T]:
+        return await self.db.get(self.model, id, options=options)
+
+    async def create(self, obj_data: dict) -> T:
+        db_obj = self.model(**obj_data)
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def update(self, db_obj: T, update_data: dict) -> T:
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, db_obj: T) -> bool:
+        await self.db.delete(db_obj)
+        await self.db.commit()
+        return True
+
+    async def paginate(self, statement: Select, limit: int, after: Optional[tuple] = None, keys: Optional[Sequence] = None, descending: bool = False) -> Page[T]:
+        """Paginación por clave, como BaseRepository.paginate"""
+        keys = list(keys) if keys is not None else [self.model.id]
+        if after is not None:
+            statement = statement.where(_keyset_filter(keys, after, descending))
+        order = [key.desc() if descending else key.asc() for key in keys]
+        rows = (await self.db.scalars(statement.order_by(None).order_by(*order).limit(limit + 1))).all()
+        items = list(rows[:limit])
+        next_after = tuple(getattr(items[-1], key.key) for key in keys) if len(rows) > limit else None
+        return Page(items=items, next_after=next_after)
+
+    async def get_page(self, limit: int, after: Optional[tuple] = None) -> Page[T]:
+        return await self.paginate(select(self.model), limit, after)
@@ -1,28 +1,35 @@
-from app.repositories.base_repository import BaseRepository
-from typing import List
+from app.repositories.base_repository import AsyncBaseRepository
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.core.pagination import Page
 from app.models.observation import Observation
 from app.models.project import Project
 
 
-class ObservationRepository(BaseRepository):
+class AsyncObservationRepository(AsyncBaseRepository):
     def __init__(self, db):
         super().__init__(db, Observation)
 
-    def get_by_ong_ids(self, ong_ids: List[int]) -> List[Observation]:
+    @staticmethod
+    def _with_project_and_user():
+        # Con AsyncSession no hay carga perezosa: el proyecto y el autor se traen antes
+        return select(Observation).options(selectinload(Observation.project), selectinload(Observation.user))
+
+    async def _newest_first(self, statement, limit: int, after: Optional[tuple]) -> Page[Observation]:
+        # El id desempata observaciones con el mismo created_at
+        return await self.paginate(statement, limit, after, keys=[Observation.created_at, Observation.id], descending=True)
+
+    async def get_by_ong_ids(self, ong_ids: List[int], limit: int, after: Optional[tuple] = None) -> Page[Observation]:
         if not ong_ids:
-            return []
-        return (
-            self.db.query(Observation)
+            return Page(items=[])
+        statement = (
+            self._with_project_and_user()
             .join(Project, Observation.project_id == Project.id)
-            .filter(Project.owner_id.in_(ong_ids))
-            .order_by(Observation.created_at.desc())
-            .all()
+            .where(Project.owner_id.in_(ong_ids))
         )
+        return await self._newest_first(statement, limit, after)
 
-    def get_by_user_id(self, user_id: int) -> List[Observation]:
-        return (
-            self.db.query(Observation)
-            .filter(Observation.user_id == user_id)
-            .order_by(Observation.created_at.desc())
-            .all()
-        )
+    async def get_by_user_id(self, user_id: int, limit: int, after: Optional[tuple] = None) -> Page[Observation]:
+        statement = self._with_project_and_user().where(Observation.user_id == user_id)
+        return await self._newest_first(statement, limit, after)
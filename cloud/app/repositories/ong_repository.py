@@ -1,7 +1,7 @@
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import AsyncBaseRepository, BaseRepository
 from app.models.ong import Ong
 from app.models.task_ong import TaskOngAssociation
-from sqlalchemy import func
+from sqlalchemy import func, select
 from app.models.task import Task
 from app.models.project import Project
 
@@ -13,6 +13,9 @@ class OngRepository(BaseRepository):
     def get_by_name(self, name: str) -> Ong | None:
         return self.db.query(Ong).filter(Ong.name == name).one_or_none()
 
+    def get_existing_ids(self, ong_ids: set[int]) -> set[int]:
+        return set(self.db.scalars(select(Ong.id).where(Ong.id.in_(ong_ids))))
+
     def get_ongs_with_collaborations(self): 
         result = (
             self.db.query(
@@ -34,3 +37,8 @@ class OngRepository(BaseRepository):
             }
             for row in result
         ]
+
+
+class AsyncOngRepository(AsyncBaseRepository):
+    def __init__(self, db):
+        super().__init__(db, Ong)
@@ -1,10 +1,21 @@
-from typing import List
-from app.repositories.base_repository import BaseRepository
+from typing import List, Optional
+from sqlalchemy import exists, func, case, insert, select
+from sqlalchemy.orm import selectinload
+from app.core.pagination import Page
+from app.repositories.base_repository import AsyncBaseRepository, BaseRepository
 from app.models.task import Task
 from app.models.project import Project
 from app.models.task_ong import TaskOngAssociation
 
 
+def _task_without_ong(project_id: int):
+    """Tareas del proyecto sin ninguna fila en task_ongs (anti-join)"""
+    return select(Task.id).where(
+        Task.project_id == project_id,
+        ~exists().where(TaskOngAssociation.task_id == Task.id),
+    )
+
+
 class ProjectRepository(BaseRepository):
     def __init__(self, db):
         super().__init__(db, Project)
@@ -12,18 +23,34 @@ class ProjectRepository(BaseRepository):
     def get_project_by_name(self, name: str):
         return self.db.query(Project).filter(Project.name == name).first()
 
-    def get_by_status(self, status: str) -> list[Project]:
-        return self.db.query(self.model).filter(self.model.status == status).all()
+    def insert_many(self, projects_data: list[dict]) -> list[int]:
+        """
+        INSERT ... RETURNING en bloque, sin commit. sort_by_parameter_order
+        garantiza que los ids vuelvan en el orden de projects_data.
+        """
+        if not projects_data:
+            return []
+        statement = insert(Project).returning(Project.id, sort_by_parameter_order=True)
+        return self.db.scalars(statement, projects_data).all()
+
+    def _with_tasks(self):
+        # Los listados serializan ProjectResponse con sus tareas: se traen
+        # todas en una segunda consulta (IN) en vez de una por proyecto
+        return self.db.query(self.model).options(selectinload(self.model.tasks))
 
-    def get_projects_not_owned_by_and_active(self, owner_ids: List[int]) -> list[Project]:
-        return self.db.query(self.model).filter(
+    def get_by_status(self, status: str, limit: int, after: Optional[tuple] = None) -> Page[Project]:
+        return self.paginate(self._with_tasks().filter(self.model.status == status), limit, after)
+
+    def get_projects_not_owned_by_and_active(self, owner_ids: List[int], limit: int, after: Optional[tuple] = None) -> Page[Project]:
+        query = self._with_tasks().filter(
             self.model.owner_id.notin_(owner_ids),
             self.model.status == "active"
-        ).all()
+        )
+        return self.paginate(query, limit, after)
 
-    def get_projects_with_requests(self, owner_id: int) -> list[Project]:
-        return (
-            self.db.query(Project)
+    def get_projects_with_requests(self, owner_id: int, limit: int, after: Optional[tuple] = None) -> Page[Project]:
+        query = (
+            self._with_tasks()
             .join(Task, Task.project_id == Project.id)
             .join(TaskOngAssociation, TaskOngAssociation.task_id == Task.id)
             .filter(
@@ -31,10 +58,63 @@ class ProjectRepository(BaseRepository):
                 TaskOngAssociation.status == "interested"
             )
             .distinct()
-            .all()
         )
-    
-    def get_projects_by_owner_ids(self, owner_ids: List[int]) -> list[Project]:
+        return self.paginate(query, limit, after)
+
+    def get_projects_by_owner_ids(self, owner_ids: List[int], limit: int, after: Optional[tuple] = None) -> Page[Project]:
         if not owner_ids:
-            return []
-        return self.db.query(self.model).filter(self.model.owner_id.in_(owner_ids)).all()
\ No newline at end of file
+            return Page(items=[])
+        return self.paginate(self._with_tasks().filter(self.model.owner_id.in_(owner_ids)), limit, after)
+
+    def all_tasks_have_ong(self, project_id: int) -> bool:
+        """Una sola consulta: no existe tarea del proyecto sin fila en task_ongs"""
+        return not self.db.scalar(select(_task_without_ong(project_id).exists()))
+
+    @staticmethod
+    def _task_without_selected_ong(project_id):
+        return exists().where(
+            Task.project_id == project_id,
+            ~exists().where(TaskOngAssociation.task_id == Task.id, TaskOngAssociation.status == "selected"),
+        )
+
+    def get_cover_summary(self, name: str):
+        """(id, status, tareas, tareas con ONG seleccionada) del proyecto, en una consulta agrupada"""
+        selected = exists().where(TaskOngAssociation.task_id == Task.id, TaskOngAssociation.status == "selected")
+        return (
+            self.db.query(
+                Project.id,
+                Project.status,
+                func.count(Task.id),
+                func.count(case((selected, Task.id))),
+            )
+            .outerjoin(Task, Task.project_id == Project.id)
+            .filter(Project.name == name)
+            .group_by(Project.id, Project.status)
+            .order_by(Project.id)
+            .first()
+        )
+
+    def mark_execution_if_covered(self, project_id: int) -> bool:
+        """UPDATE condicional: el chequeo y el cambio de estado son atómicos"""
+        updated = (
+            self.db.query(Project)
+            .filter(
+                Project.id == project_id,
+                Project.status != "execution",
+                ~self._task_without_selected_ong(Project.id),
+            )
+            .update({"status": "execution"}, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated == 1
+
+
+class AsyncProjectRepository(AsyncBaseRepository):
+    def __init__(self, db):
+        super().__init__(db, Project)
+
+    async def get_project_by_name(self, name: str) -> Project | None:
+        return await self.db.scalar(select(Project).where(Project.name == name).limit(1))
+
+    async def all_tasks_have_ong(self, project_id: int) -> bool:
+        return not await self.db.scalar(select(_task_without_ong(project_id).exists()))
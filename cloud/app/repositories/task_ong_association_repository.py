@@ -1,10 +1,16 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Page
 from app.models.task_ong import TaskOngAssociation
-from sqlalchemy.orm import Session
+from app.repositories.base_repository import AsyncBaseRepository
 
 
-class TaskOngAssociationRepository:
-    def __init__(self, db: Session):
-        self.db = db
+class AsyncTaskOngAssociationRepository(AsyncBaseRepository):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, TaskOngAssociation)
 
-    def get_all(self):
-        return self.db.query(TaskOngAssociation).all()
+    async def get_page(self, limit: int, after: Optional[tuple] = None) -> Page[TaskOngAssociation]:
+        # Clave primaria compuesta: no hay id, se ordena por (task_id, ong_id)
+        keys = [TaskOngAssociation.task_id, TaskOngAssociation.ong_id]
+        return await self.paginate(select(TaskOngAssociation), limit, after, keys=keys)
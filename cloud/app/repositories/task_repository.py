@@ -1,4 +1,5 @@
-from app.repositories.base_repository import BaseRepository
+from sqlalchemy import insert, select
+from app.repositories.base_repository import AsyncBaseRepository, BaseRepository
 from app.models.task import Task
 from app.models.task_ong import TaskOngAssociation
 from datetime import datetime       
@@ -8,33 +9,49 @@ class TaskRepository(BaseRepository):
     def __init__(self, db):
         super().__init__(db, Task)
 
-    def commit_task_to_ong(self, task_id: int, ong_id: int):
+    def insert_tasks(self, tasks_data: list[dict]) -> list[int]:
+        """INSERT ... RETURNING en bloque, sin commit; devuelve los ids"""
+        if not tasks_data:
+            return []
+        return self.db.scalars(insert(Task).returning(Task.id), tasks_data).all()
+
+    def create_multiple_tasks(self, tasks_data: list[dict]) -> list[int]:
+        task_ids = self.insert_tasks(tasks_data)
+        self.db.commit()
+        return task_ids
+
+
+class AsyncTaskRepository(AsyncBaseRepository):
+    def __init__(self, db):
+        super().__init__(db, Task)
+
+    async def _get_association(self, task_id: int, ong_id: int) -> TaskOngAssociation | None:
+        return await self.db.get(TaskOngAssociation, (task_id, ong_id))
+
+    async def commit_task_to_ong(self, task_id: int, ong_id: int):
         """
         Guarda la relación entre una Task y una ONG en la tabla intermedia
         """
-        existing = self.db.query(TaskOngAssociation).filter(
-            TaskOngAssociation.task_id == task_id,
-            TaskOngAssociation.ong_id == ong_id
-        ).first()
+        existing = await self._get_association(task_id, ong_id)
         if existing:
             raise Exception("Esta ONG ya se ha comprometido con esta tarea")
         association = TaskOngAssociation(task_id=task_id, ong_id=ong_id, status="interested")
         try:
             self.db.add(association)
-            self.db.commit()
+            await self.db.commit()
             return {"message": "Compromiso guardado exitosamente"}
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
 
-    def select_ong_for_task(self, task_id: int, selected_ong_id: int):
+    async def select_ong_for_task(self, task_id: int, selected_ong_id: int):
         """
         Selecciona una ONG como ganadora para ayudar con la Task.
         Marca su status como 'selected' y rechaza a las demás.
         """
         try:
-            task = self.db.query(Task).filter(Task.id == task_id).first()
-            associations = self.db.query(TaskOngAssociation).filter(TaskOngAssociation.task_id == task_id).all()
+            task = await self.db.get(Task, task_id)
+            associations = await self.db.scalars(select(TaskOngAssociation).where(TaskOngAssociation.task_id == task_id))
             for assoc in associations:
                 if assoc.ong_id == selected_ong_id:
                     assoc.status = "selected"
@@ -42,38 +59,20 @@ class TaskRepository(BaseRepository):
                 else:
                     assoc.status = "rejected"
             task.status = "resolved"
-            self.db.commit()
+            await self.db.commit()
             return {"message": "ONG seleccionada exitosamente"}
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
 
-    def has_ong_applied_for_task(self, task_id: int, ong_id: int) -> bool:
-        assoc = (self.db.query(TaskOngAssociation).filter(
-                TaskOngAssociation.task_id == task_id,
-                TaskOngAssociation.ong_id == ong_id
-            ).first())
+    async def has_ong_applied_for_task(self, task_id: int, ong_id: int) -> bool:
+        assoc = await self._get_association(task_id, ong_id)
         return assoc is not None and assoc.status == "interested"
 
-    def create_multiple_tasks(self, tasks_data):
-        tasks = [Task(**data) for data in tasks_data]
-        self.db.add_all(tasks)
-        self.db.commit()
-        for task in tasks:
-            self.db.refresh(task)
-        return tasks
-
-    def has_ong_association(self, task_id: int) -> bool:
-        return (
-            self.db.query(TaskOngAssociation)
-            .filter(TaskOngAssociation.task_id == task_id)
-            .first()
-            is not None
-        )
+    async def has_ong_association(self, task_id: int) -> bool:
+        return await self.get_ong_association(task_id) is not None
 
-    def get_ong_association(self, task_id: int):
-        return (
-            self.db.query(TaskOngAssociation)
-            .filter(TaskOngAssociation.task_id == task_id)
-            .first()
+    async def get_ong_association(self, task_id: int):
+        return await self.db.scalar(
+            select(TaskOngAssociation).where(TaskOngAssociation.task_id == task_id).limit(1)
         )
@@ -1,12 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user_ong import user_ongs
 
-class UserOngRepository:
-    def __init__(self, db: Session):
+class AsyncUserOngRepository:
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_association(self, user_id: int, ong_id: int):
-        query = self.db.execute(
+    async def get_association(self, user_id: int, ong_id: int):
+        query = await self.db.execute(
             user_ongs.select().where(
                 (user_ongs.c.user_id == user_id) &
                 (user_ongs.c.ong_id == ong_id)
@@ -14,15 +14,15 @@ class UserOngRepository:
         )
         return query.fetchone()
 
-    def create_association(self, user_id: int, ong_id: int):
-        self.db.execute(user_ongs.insert().values(user_id=user_id, ong_id=ong_id))
-        self.db.commit()
+    async def create_association(self, user_id: int, ong_id: int):
+        await self.db.execute(user_ongs.insert().values(user_id=user_id, ong_id=ong_id))
+        await self.db.commit()
 
-    def delete_association(self, user_id: int, ong_id: int):
-        self.db.execute(
+    async def delete_association(self, user_id: int, ong_id: int):
+        await self.db.execute(
             user_ongs.delete().where(
                 (user_ongs.c.user_id == user_id) &
                 (user_ongs.c.ong_id == ong_id)
             )
         )
-        self.db.commit()
\ No newline at end of file
+        await self.db.commit()
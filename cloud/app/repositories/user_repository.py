@@ -1,15 +1,35 @@
 from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.core.pagination import Page
 from app.models.user import User 
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import AsyncBaseRepository
 from app.models.ong import Ong
 
 
-class UserRepository(BaseRepository):
+class AsyncUserRepository(AsyncBaseRepository):
     def __init__(self, db):
         super().__init__(db, User)
 
-    def get_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(User.email == email).first()
+    @staticmethod
+    def _with_ongs():
+        # UserResponse incluye las ONGs y con AsyncSession no hay carga perezosa
+        return select(User).options(selectinload(User.ongs))
 
-    def get_by_username(self, username: str) -> Optional[User]:
-        return self.db.query(User).filter(User.username == username).first()
\ No newline at end of file
+    async def create(self, obj_data: dict) -> User:
+        user = await super().create(obj_data)
+        # refresh deja las ONGs sin cargar
+        await self.db.refresh(user, ["ongs"])
+        return user
+
+    async def get_by_id(self, id: int) -> Optional[User]:
+        return await super().get_by_id(id, selectinload(User.ongs))
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self.db.scalar(self._with_ongs().where(User.email == email).limit(1))
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        return await self.db.scalar(self._with_ongs().where(User.username == username).limit(1))
+
+    async def get_page(self, limit: int, after: Optional[tuple] = None) -> Page[User]:
+        return await self.paginate(self._with_ongs(), limit, after)
@@ -2,6 +2,9 @@ from app.schemas.task_schema import TaskResponse, TaskCreate
 from pydantic import BaseModel, field_validator, model_validator
 from typing import List, Optional
 from datetime import date
+import os
+
+MAX_PROJECTS_BATCH = int(os.getenv("MAX_PROJECTS_BATCH", "500"))
 
 
 class ProjectBase(BaseModel):
@@ -56,6 +59,22 @@ class ProjectCreate(ProjectBase):
         return v
 
 
+class ProjectBatchCreate(BaseModel):
+    projects: List[ProjectCreate]
+
+    @field_validator("projects")
+    def validate_projects(cls, v):
+        if len(v) == 0:
+            raise ValueError("Debe incluir al menos un proyecto.")
+        if len(v) > MAX_PROJECTS_BATCH:
+            raise ValueError(f"No se pueden guardar más de {MAX_PROJECTS_BATCH} proyectos por lote.")
+        return v
+
+
+class ProjectBatchResponse(BaseModel):
+    project_ids: List[int]
+
+
 class ProjectResponse(ProjectBase):
     id: int
     tasks: List[TaskResponse]
@@ -32,17 +32,19 @@ def seed_users(db: Session):
     from passlib.context import CryptContext
     PASSWORD = os.getenv("USERS_PASSWORD")
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    print("Hash pass:", pwd_context.hash(PASSWORD))
+    # Todos comparten contraseña: se hashea una sola vez
+    hashed_password = pwd_context.hash(PASSWORD)
+    print("Hash pass:", hashed_password)
     users_data = [
         {
             "username": "ayudante",
             "email": "ayudante@gmail.com",
-            "hashed_password": pwd_context.hash(PASSWORD)
+            "hashed_password": hashed_password
         },
         {
             "username": "user",
             "email": "user@gmail.com",
-            "hashed_password": pwd_context.hash(PASSWORD)
+            "hashed_password": hashed_password
         }
     ]
     for user_data in users_data:
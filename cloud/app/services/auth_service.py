@@ -2,10 +2,12 @@ from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.services.user_service import UserService
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.user_service import UserService, current_user_cache
+from app.schemas.user_schema import UserResponse
+from app.core.database import get_async_db
 import os
+import time
 
 
 
@@ -22,25 +24,39 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str, credentials_exception):
+def decode_token(token: str, credentials_exception) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        return username
     except JWTError:
         raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+def verify_token(token: str, credentials_exception):
+    return decode_token(token, credentials_exception)["sub"]
+
+async def _get_user_from_token(token: str, db: AsyncSession, credentials_exception) -> UserResponse:
+    """Evita las consultas de usuario y ONGs mientras el token siga en el cache"""
+    payload = decode_token(token, credentials_exception)
+    key = (payload["sub"], payload.get("exp"))
+    user = current_user_cache.get(key)
+    if user is None:
+        user = await UserService(db).get_user_by_username(payload["sub"])
+        if user is None:
+            raise credentials_exception
+        # No se cachea más allá del vencimiento del token
+        ttl = current_user_cache.ttl
+        if payload.get("exp"):
+            ttl = min(ttl, payload["exp"] - time.time())
+        current_user_cache.set(key, user, ttl=ttl)
+    return user
     
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    username = verify_token(token, credentials_exception)
-    user_service = UserService(db)
-    user = user_service.get_user_by_username(username)
-    if user is None:
-        raise credentials_exception
+    user = await _get_user_from_token(token, db, credentials_exception)
     return user 
\ No newline at end of file
@@ -1,30 +1,35 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, status
+from app.core.pagination import Page
 from app.schemas.user_schema import UserResponse
-from app.repositories.observation_repository import ObservationRepository
+from app.repositories.observation_repository import AsyncObservationRepository
+from app.repositories.project_repository import AsyncProjectRepository
 from app.schemas.observation_schema import ObservationBase, ObservationResponse
-from app.services.project_service import ProjectService
 
 
 class ObservationService:
-    def __init__(self, db: Session):
-        self.observation_repo = ObservationRepository(db)
-        self.project_service = ProjectService(db)
+    def __init__(self, db: AsyncSession):
+        self.observation_repo = AsyncObservationRepository(db)
+        self.project_repo = AsyncProjectRepository(db)
 
-    def save_observation_to_db(self, observation: ObservationBase) -> dict:
-        project = self.project_service.get_project_by_name(observation.project_name)
+    async def save_observation_to_db(self, observation: ObservationBase) -> dict:
+        project = await self.project_repo.get_project_by_name(observation.project_name)
+        if not project:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No existe un proyecto con nombre={observation.project_name}.")
         obs_dic = {
             **observation.model_dump(exclude={"project_name"}),
             "project_id": project.id
         }
-        new_observation = self.observation_repo.create(obs_dic)
+        new_observation = await self.observation_repo.create(obs_dic)
         return {"message": "Observation saved successfully", "observation_id": new_observation.id}
 
-    def get_my_observations(self, user: UserResponse) -> list[dict]:
+    async def get_my_observations(self, user: UserResponse, limit: int, after: Optional[tuple] = None) -> Page[dict]:
         user_ong_ids = [ong.id for ong in user.ongs]
-        observations = self.observation_repo.get_by_ong_ids(user_ong_ids)
+        page = await self.observation_repo.get_by_ong_ids(user_ong_ids, limit, after)
         result = []
-        for obs in observations:
+        for obs in page.items:
             result.append({
                 "id": obs.id,
                 "content": obs.content,
@@ -35,21 +40,21 @@ class ObservationService:
                 "project_name": obs.project.name if obs.project else "Desconocido",
                 "username": obs.user.username if obs.user else "Usuario Desconocido"
             })
-        return result
+        return Page(items=result, next_after=page.next_after)
 
-    def accept_observation(self, observation_id: int) -> dict:
-        obs = self.observation_repo.get_by_id(observation_id)
+    async def accept_observation(self, observation_id: int) -> dict:
+        obs = await self.observation_repo.get_by_id(observation_id)
         update_data = {
             "status": "accepted",
             "accepted_at": datetime.now()
         }
-        self.observation_repo.update(obs, update_data)
+        await self.observation_repo.update(obs, update_data)
         return {"message": "Observation accepted successfully", "observation_id": obs.id}
 
-    def get_user_sent_observations(self, user_id: int) -> list[dict]:
-        observations = self.observation_repo.get_by_user_id(user_id)
+    async def get_user_sent_observations(self, user_id: int, limit: int, after: Optional[tuple] = None) -> Page[dict]:
+        page = await self.observation_repo.get_by_user_id(user_id, limit, after)
         result = []
-        for obs in observations:
+        for obs in page.items:
             result.append({
                 "id": obs.id,
                 "content": obs.content,
@@ -60,4 +65,4 @@ class ObservationService:
                 "project_name": obs.project.name if obs.project else "Desconocido",
                 "username": obs.user.username if obs.user else "Usuario Desconocido"
             })
-        return result
+        return Page(items=result, next_after=page.next_after)
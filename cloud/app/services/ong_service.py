@@ -1,4 +1,6 @@
+from typing import Optional
 from sqlalchemy.orm import Session
+from app.core.pagination import Page
 from app.repositories.ong_repository import OngRepository
 from app.schemas.ong_schema import OngCreate, OngResponse
 from fastapi import HTTPException, status
@@ -8,8 +10,8 @@ class OngService:
     def __init__(self, db: Session):
         self.ong_repo = OngRepository(db)
 
-    def get_ongs(self) -> list[OngResponse]:
-        return self.ong_repo.get_all()
+    def get_ongs(self, limit: int, after: Optional[tuple] = None) -> Page:
+        return self.ong_repo.get_page(limit, after)
 
     def create_ong(self, ong_data: OngCreate) -> OngResponse:
         ong_dict = ong_data.model_dump()
@@ -28,6 +30,12 @@ class OngService:
         if not ong_by_id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No existe una ONG con id={ong_id}.")
 
+    def verify_ong_ids_exist(self, ong_ids: set[int]) -> None:
+        """Como verify_ong_id_exists pero con una sola consulta para todo el lote"""
+        missing = sorted(ong_ids - self.ong_repo.get_existing_ids(ong_ids))
+        if missing:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No existe una ONG con id={missing[0]}.")
+
     def get_user_emails_for_ong(self, ong_id: int) -> list[str]:
         ong = self.ong_repo.get_by_id(ong_id)
         if not ong:
@@ -1,18 +1,21 @@
+from typing import Optional
 from urllib.parse import unquote_plus
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from app.services.task_service import TaskService
+from app.core.pagination import Page
 from app.services.ong_service import OngService
 from app.repositories.project_repository import ProjectRepository
 from app.repositories.ong_repository import OngRepository
+from app.repositories.task_repository import TaskRepository
 from app.schemas.user_schema import UserResponse
 from app.schemas.project_schema import ProjectCreate, ProjectResponse
+from app.schemas.task_schema import TaskCreate
 
 
 class ProjectService:
     def __init__(self, db: Session):
         self.project_repo = ProjectRepository(db)
-        self.task_service = TaskService(db)
+        self.task_repo = TaskRepository(db)
         self.ong_repo = OngRepository(db)
         self.ong_service = OngService(db)
 
@@ -22,9 +25,9 @@ class ProjectService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No existe un proyecto con id={project_id}.")
         return project
 
-    def get_projects_not_owned_by_and_active(self, user: UserResponse) -> list[ProjectResponse]:
+    def get_projects_not_owned_by_and_active(self, user: UserResponse, limit: int, after: Optional[tuple] = None) -> Page:
         user_ong_ids = [ong.id for ong in user.ongs]
-        return self.project_repo.get_projects_not_owned_by_and_active(user_ong_ids)
+        return self.project_repo.get_projects_not_owned_by_and_active(user_ong_ids, limit, after)
 
     def get_project_by_name(self, name: str) -> ProjectResponse | None:
         project = self.project_repo.get_project_by_name(name)
@@ -38,45 +41,78 @@ class ProjectService:
             project_dict = project_data.model_dump(exclude={"tasks"})
             project_dict["owner_id"] = int(project_data.owner_id)
             project = self.project_repo.create(project_dict)
-            self.task_service.process_and_save_tasks(project_data.tasks, project.id)
+            self.process_and_save_tasks(project_data.tasks, project.id)
             return project
         except Exception as e:
             self.project_repo.db.rollback()
             raise e
 
-    def get_projects_with_status(self, status: str) -> list[ProjectResponse]:
-        return self.project_repo.get_by_status(status)
+    def store_projects_batch(self, projects_data: list[ProjectCreate]) -> list[int]:
+        """
+        Guarda todos los proyectos con sus tareas en una sola transacción:
+        si alguno falla no queda ninguno. Devuelve los ids en el orden recibido.
+        """
+        try:
+            self.ong_service.verify_ong_ids_exist({int(project.owner_id) for project in projects_data})
+            project_ids = self.project_repo.insert_many([
+                {**project.model_dump(exclude={"tasks"}), "owner_id": int(project.owner_id)}
+                for project in projects_data
+            ])
+            self.task_repo.insert_tasks([
+                task
+                for project, project_id in zip(projects_data, project_ids)
+                for task in self._prepare_tasks_data(project.tasks, project_id)
+            ])
+            self.project_repo.db.commit()
+            return project_ids
+        except Exception as e:
+            self.project_repo.db.rollback()
+            raise e
+
+    def process_and_save_tasks(self, tasks: list[TaskCreate], project_id: int) -> list[int]:
+        tasks_data = self._prepare_tasks_data(tasks, project_id)
+        return self.task_repo.create_multiple_tasks(tasks_data)
+
+    def _prepare_tasks_data(self, tasks: list[TaskCreate], project_id: int) -> list[dict]:
+        """Convierte las tareas a dict y agrega el project_id"""
+        return [
+            {**task.model_dump(), "project_id": project_id}
+            for task in tasks
+        ]
+
+    def get_projects_with_status(self, status: str, limit: int, after: Optional[tuple] = None) -> Page:
+        return self.project_repo.get_by_status(status, limit, after)
 
     def all_tasks_have_ong(self, name: str) -> bool:
         decoded_name = unquote_plus(name)
-        tasks = self.get_project_by_name(decoded_name).tasks
-        for task in tasks:
-            if not self.task_service.has_ong_association(task.id):
-                return False
-        return True
+        return self.all_tasks_have_ong_by_id(self.get_project_by_name(decoded_name).id)
+
+    def all_tasks_have_ong_by_id(self, project_id: int) -> bool:
+        return self.project_repo.all_tasks_have_ong(project_id)
 
     def all_tasks_are_covers(self, name: str) -> bool:
         decoded_name = unquote_plus(name)
-        project = self.get_project_by_name(decoded_name)
-        all_selected = all(
-            any(assoc.status == "selected" for assoc in task.ong_associations)
-            for task in project.tasks
-        )
-        if all_selected:
-            self.project_repo.update(project, {"status": "execution"})
+        summary = self.project_repo.get_cover_summary(decoded_name)
+        if not summary:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No existe un proyecto con nombre={decoded_name}.")
+        project_id, project_status, total_tasks, covered_tasks = summary
+        all_selected = covered_tasks == total_tasks
+        if all_selected and project_status != "execution":
+            # Si otro poll ya lo pasó a execution el UPDATE no afecta filas
+            self.project_repo.mark_execution_if_covered(project_id)
         return all_selected
 
     def update_status(self, project, new_status: str):
         project.status = new_status
         return self.project_repo.update(project, {"status": new_status})
 
-    def get_projects_with_requests(self, owner_id: int) -> list[ProjectResponse]:
+    def get_projects_with_requests(self, owner_id: int, limit: int, after: Optional[tuple] = None) -> Page:
         self.ong_service.verify_ong_id_exists(owner_id)
-        return self.project_repo.get_projects_with_requests(owner_id)
+        return self.project_repo.get_projects_with_requests(owner_id, limit, after)
 
-    def get_my_projects(self, user: UserResponse) -> list[ProjectResponse]:
+    def get_my_projects(self, user: UserResponse, limit: int, after: Optional[tuple] = None) -> Page[ProjectResponse]:
         user_ong_ids = [ong.id for ong in user.ongs]
         if not user_ong_ids:
-            return []         
-        projects = self.project_repo.get_projects_by_owner_ids(user_ong_ids)
-        return [ProjectResponse.model_validate(p) for p in projects]
\ No newline at end of file
+            return Page(items=[])
+        page = self.project_repo.get_projects_by_owner_ids(user_ong_ids, limit, after)
+        return Page(items=[ProjectResponse.model_validate(p) for p in page.items], next_after=page.next_after)
\ No newline at end of file
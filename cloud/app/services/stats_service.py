@@ -0,0 +1,23 @@
+import asyncio
+import os
+from app.core.database import SessionLocal
+from app.core.scheduler import KpiScheduler
+from app.services.ong_service import OngService
+
+ONGS_AND_COLLABORATIONS = "ongs_and_collaborations"
+
+# Indicadores del dashboard: se calculan en segundo plano (ver main.lifespan) y
+# el endpoint los sirve desde memoria. Cada cálculo abre su propia sesión.
+stats_kpis = KpiScheduler(max_age=float(os.getenv("KPI_MAX_AGE", "600")))
+
+
+def _ongs_and_collaborations() -> list:
+    db = SessionLocal()
+    try:
+        return OngService(db).get_ongs_and_collaborations()
+    finally:
+        db.close()
+
+
+# Solo consulta la base: corre en un thread para no frenar el event loop
+stats_kpis.register(ONGS_AND_COLLABORATIONS, lambda: asyncio.to_thread(_ongs_and_collaborations))
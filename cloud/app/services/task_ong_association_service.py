@@ -1,10 +1,12 @@
-from app.repositories.task_ong_association_repository import TaskOngAssociationRepository
-from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.pagination import Page
+from app.repositories.task_ong_association_repository import AsyncTaskOngAssociationRepository
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class TaskOngAssociationService:
-    def __init__(self, db: Session):
-        self.repo = TaskOngAssociationRepository(db)
+    def __init__(self, db: AsyncSession):
+        self.repo = AsyncTaskOngAssociationRepository(db)
 
-    def get_all(self):
-        return self.repo.get_all()
+    async def get_page(self, limit: int, after: Optional[tuple] = None) -> Page:
+        return await self.repo.get_page(limit, after)
@@ -1,53 +1,46 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from app.schemas.task_schema import TaskCreate
-from app.services.ong_service import OngService
-from app.repositories.task_repository import TaskRepository
+from app.repositories.ong_repository import AsyncOngRepository
+from app.repositories.project_repository import AsyncProjectRepository
+from app.repositories.task_repository import AsyncTaskRepository
 
 
 class TaskService:
-    def __init__(self, db: Session):
-        self.task_repo = TaskRepository(db)
-        self.ong_service = OngService(db)
+    def __init__(self, db: AsyncSession):
+        self.task_repo = AsyncTaskRepository(db)
+        self.ong_repo = AsyncOngRepository(db)
+        self.project_repo = AsyncProjectRepository(db)
 
-    def verify_task_id_exists(self, task_id: int) -> None:
-        id_task = self.task_repo.get_by_id(task_id)
+    async def verify_ong_id_exists(self, ong_id: int) -> None:
+        if not await self.ong_repo.get_by_id(ong_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No existe una ONG con id={ong_id}.")
+
+    async def verify_task_id_exists(self, task_id: int) -> None:
+        id_task = await self.task_repo.get_by_id(task_id)
         if not id_task:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No existe una tarea con id={task_id}.",)
 
-    def commit_task_to_ong(self, task_id: int, ong_id: int):
-        from app.services.project_service import ProjectService
-        self.project_service = ProjectService(self.task_repo.db)
-
-        self.ong_service.verify_ong_id_exists(ong_id)
-        self.verify_task_id_exists(task_id)
-        task = self.task_repo.get_by_id(task_id)
-        data = self.task_repo.commit_task_to_ong(task_id, ong_id)
-        if self.project_service.all_tasks_have_ong(task.project.name):
-            project = task.project
-            self.project_service.update_status(project, "waiting")
+    async def commit_task_to_ong(self, task_id: int, ong_id: int):
+        await self.verify_ong_id_exists(ong_id)
+        task = await self.task_repo.get_by_id(task_id)
+        if not task:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No existe una tarea con id={task_id}.",)
+        project_id = task.project_id
+        data = await self.task_repo.commit_task_to_ong(task_id, ong_id)
+        if await self.project_repo.all_tasks_have_ong(project_id):
+            project = await self.project_repo.get_by_id(project_id)
+            await self.project_repo.update(project, {"status": "waiting"})
         return data
 
-    def select_ong_for_task(self, task_id: int, ong_id: int):
-        self.ong_service.verify_ong_id_exists(ong_id)
-        self.verify_task_id_exists(task_id)
-        if not self.task_repo.has_ong_applied_for_task(task_id, ong_id):
+    async def select_ong_for_task(self, task_id: int, ong_id: int):
+        await self.verify_ong_id_exists(ong_id)
+        await self.verify_task_id_exists(task_id)
+        if not await self.task_repo.has_ong_applied_for_task(task_id, ong_id):
             raise ValueError("La ONG no se ha postulado para esta tarea.")
-        return self.task_repo.select_ong_for_task(task_id, ong_id)
-
-    def process_and_save_tasks(self, tasks: list[TaskCreate], project_id: int) -> list[dict]:
-        tasks_data = self._prepare_tasks_data(tasks, project_id)
-        return self.task_repo.create_multiple_tasks(tasks_data)
-
-    def _prepare_tasks_data(self, tasks: list[TaskCreate], project_id: int) -> list[dict]:
-        """Convierte las tareas a dict y agrega el project_id"""
-        return [
-            {**task.model_dump(), "project_id": project_id}
-            for task in tasks
-        ]
+        return await self.task_repo.select_ong_for_task(task_id, ong_id)
 
-    def has_ong_association(self, task_id: int) -> bool:
-        return self.task_repo.has_ong_association(task_id)
+    async def has_ong_association(self, task_id: int) -> bool:
+        return await self.task_repo.has_ong_association(task_id)
 
-    def get_ong_association(self, task_id: int):
-        return self.task_repo.get_ong_association(task_id)
+    async def get_ong_association(self, task_id: int):
+        return await self.task_repo.get_ong_association(task_id)
@@ -1,6 +1,20 @@
 const BASE_CLOUD_URL = 'http://localhost:10000';
 const BASE_LOCAL_URL = 'http://localhost:8000';
 
+// Los listados vienen paginados: el cursor de la página siguiente llega en el header X-Next-Cursor
+const fetchAllPages = async (url: string, init: RequestInit, errorMessage: string) => {
+    const items: any[] = [];
+    let cursor: string | null = null;
+    do {
+        const pageUrl: string = cursor ? `${url}${url.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(cursor)}` : url;
+        const response = await fetch(pageUrl, init);
+        if (!response.ok) throw new Error(errorMessage);
+        items.push(...await response.json());
+        cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor);
+    return items;
+};
+
 export const api = {
 
   getCurrentUser: async () => {
@@ -68,67 +82,51 @@ export const api = {
   // GET: Obtener todos los proyectos que se puede colaborar
   getCollaborationRequests: async () => {
     const token = localStorage.getItem('cloud_token');
-     const response = await fetch(`${BASE_CLOUD_URL}/api/projects/get_projects_not_owned_by_and_active`, {
+    return fetchAllPages(`${BASE_CLOUD_URL}/api/projects/get_projects_not_owned_by_and_active`, {
         headers: {
             "Authorization": `Bearer ${token}`,
         },
-    });
-    const res = await response.json();
-    if (!response.ok) throw new Error('Error al cargar proyectos');
-    return res
+    }, 'Error al cargar proyectos');
   },
 
   getMyCloudProjects: async () => {
     const token = localStorage.getItem('cloud_token');
-     const response = await fetch(`${BASE_CLOUD_URL}/api/projects/my_projects`, {
+    return fetchAllPages(`${BASE_CLOUD_URL}/api/projects/my_projects`, {
         headers: {
             "Authorization": `Bearer ${token}`,
         },
-    });
-    const res = await response.json();
-    if (!response.ok) throw new Error('Error al cargar proyectos');
-    return res
+    }, 'Error al cargar proyectos');
   },
 
   getOngs: async () => {
-    const response = await fetch(`${BASE_CLOUD_URL}/api/ongs/`);
-    if (!response.ok) throw new Error('Error al cargar ONGs');
-    return response.json();
+    return fetchAllPages(`${BASE_CLOUD_URL}/api/ongs/`, {}, 'Error al cargar ONGs');
   },
 
   getMyProjects: async () => {
     const token = localStorage.getItem('local_token');
-      const response = await fetch(`${BASE_LOCAL_URL}/projects/my-projects/`, {
+      return fetchAllPages(`${BASE_LOCAL_URL}/projects/my-projects/`, {
           headers: {
               "Authorization": `Bearer ${token}`,
           },
-      });
-      if (!response.ok) throw new Error('Error al cargar proyectos');
-      return response.json();
+      }, 'Error al cargar proyectos');
     },
   
   //GET: Obtener todos los proyectos en ejecucion
   getExecutionProjects: async () => {
     const cloud_token = localStorage.getItem('cloud_token');
     const local_token = localStorage.getItem('local_token');
-    const [cloud_response, local_response] = await Promise.all([
-        fetch(`${BASE_CLOUD_URL}/api/projects/projects_status/execution`, {
+    const errorMessage = 'Error al cargar proyectos de una o ambas fuentes';
+    const [cloud_projects, local_projects] = await Promise.all([
+        fetchAllPages(`${BASE_CLOUD_URL}/api/projects/projects_status/execution`, {
             headers: {
                 "Authorization": `Bearer ${cloud_token}`,
             },
-        }),
-        fetch(`${BASE_LOCAL_URL}/projects/projects_status/execution`, {
+        }, errorMessage),
+        fetchAllPages(`${BASE_LOCAL_URL}/projects/projects_status/execution`, {
             headers: {
                 "Authorization": `Bearer ${local_token}`,
             },
-        })
-    ]);
-    if (!cloud_response.ok || !local_response.ok) {
-        throw new Error('Error al cargar proyectos de una o ambas fuentes');
-    }
-    const [cloud_projects, local_projects] = await Promise.all([
-        cloud_response.json(),
-        local_response.json()
+        }, errorMessage)
     ]);
     return [...cloud_projects, ...local_projects];
   },
@@ -224,24 +222,20 @@ export const api = {
     // GET: Obtener todos los compromisos (Cloud)
     viewCompromises: async () => {
         const cloud_token = localStorage.getItem('cloud_token');
-        const response = await fetch(`${BASE_CLOUD_URL}/api/tasks/view_compromises`, {
+        return fetchAllPages(`${BASE_CLOUD_URL}/api/tasks/view_compromises`, {
             headers: {
                 "Authorization": `Bearer ${cloud_token}`,
             },
-        });
-        if (!response.ok) throw new Error('Error al obtener compromisos');
-        return response.json();
+        }, 'Error al obtener compromisos');
     },
 
     getProjectsWithRequests: async (ownerId: number) => {
       const cloud_token = localStorage.getItem('cloud_token');
-      const response = await fetch(`${BASE_CLOUD_URL}/api/projects/projects_with_requests/${ownerId}`, {
+      return fetchAllPages(`${BASE_CLOUD_URL}/api/projects/projects_with_requests/${ownerId}`, {
           headers: {
               "Authorization": `Bearer ${cloud_token}`,
           },
-      });
-      if (!response.ok) throw new Error('Error al obtener proyectos con solicitudes');
-      return response.json();
+      }, 'Error al obtener proyectos con solicitudes');
     },
 
     // POST: Seleccionar una ONG para una tarea (Backend Local -> Bonita)
@@ -289,13 +283,11 @@ export const api = {
     //GET: Obtener observaciones de mis ONGs
     getMyObservations: async () => {
       const cloud_token = localStorage.getItem('cloud_token');
-      const response = await fetch(`${BASE_CLOUD_URL}/api/observations/my_observations_ong`, {
+      return fetchAllPages(`${BASE_CLOUD_URL}/api/observations/my_observations_ong`, {
           headers: {
               "Authorization": `Bearer ${cloud_token}`,
           },
-      });
-      if (!response.ok) throw new Error('Error al obtener proyectos con solicitudes');
-      return response.json();
+      }, 'Error al obtener proyectos con solicitudes');
     },
 
     //POST: Aceptar una observación (Backend Local -> Bonita)
@@ -318,13 +310,11 @@ export const api = {
     //GET: Obtener observaciones que realize como manager
     getMyObservationsManager: async () => {
       const cloud_token = localStorage.getItem('cloud_token');
-      const response = await fetch(`${BASE_CLOUD_URL}/api/observations/my_observations_manager`, {
+      return fetchAllPages(`${BASE_CLOUD_URL}/api/observations/my_observations_manager`, {
           headers: {
               "Authorization": `Bearer ${cloud_token}`,
           },
-      });
-      if (!response.ok) throw new Error('Error al obtener proyectos con solicitudes');
-      return response.json();
+      }, 'Error al obtener proyectos con solicitudes');
     },
 
     // METRICAS